@@ -4,6 +4,7 @@ from typing import Optional
 
 from .client import DatabaseClient
 from .models import Base
+from .pragmas import PROFILE_QUERY_KEY, PROFILES, get_profile
 from .schema import (
     Document,
     DocumentCreate,
@@ -15,18 +16,25 @@ from .schema import (
     DocumentImageCreate,
     DocumentTable,
     DocumentTableCreate,
+    FileFingerprint,
+    ScanManifestEntry,
 )
 
 
-def create_sqlite_url(db_path: Optional[str] = None) -> str:
+def create_sqlite_url(db_path: Optional[str] = None, profile: Optional[str] = None) -> str:
     """Create SQLite database URL.
     
     Args:
         db_path: Optional path to SQLite database file. If not provided,
                 creates a database in the user's home directory.
+        profile: Optional tuning profile ("ingest", "serve" or "safe") that
+                 DatabaseClient applies to every connection
     
     Returns:
         Database URL string
+    
+    Raises:
+        ValueError: If the profile is unknown
     """
     if not db_path:
         db_path = str(Path.home() / ".ragnostic" / "ragnostic.db")
@@ -34,7 +42,11 @@ def create_sqlite_url(db_path: Optional[str] = None) -> str:
     # Ensure directory exists
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
     
-    return f"sqlite:///{db_path}"
+    url = f"sqlite:///{db_path}"
+    if profile is not None:
+        get_profile(profile)
+        url = f"{url}?{PROFILE_QUERY_KEY}={profile}"
+    return url
 
 
 __all__ = [
@@ -50,5 +62,8 @@ __all__ = [
     "DocumentImageCreate",
     "DocumentTable",
     "DocumentTableCreate",
+    "FileFingerprint",
+    "ScanManifestEntry",
+    "PROFILES",
     "create_sqlite_url",
 ]
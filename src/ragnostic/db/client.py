@@ -1,22 +1,76 @@
 """Database client for handling all database operations."""
-from typing import Optional, List
-from sqlalchemy import create_engine, update
-from sqlalchemy.orm import Session, sessionmaker
+from collections import Counter
+from typing import Dict, Iterable, Optional, List, Set, Tuple
+from pydantic import BaseModel
+from sqlalchemy import and_, bindparam, create_engine, func, insert, inspect, make_url, or_, select, text, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, selectinload, sessionmaker
 from sqlalchemy.exc import IntegrityError
 
 from . import models, schema
+from .pragmas import PRAGMA_NAMES, PROFILE_QUERY_KEY, install_profile, read_pragmas
 
 
 class DatabaseClient:
     """Client for handling database operations using SQLAlchemy and Pydantic models."""
 
-    def __init__(self, database_url: str):
-        """Initialize database client with connection URL."""
-        self.engine = create_engine(database_url)
+    def __init__(self, database_url: str, profile: Optional[str] = None):
+        """Initialize database client with connection URL.
+        
+        Args:
+            database_url: SQLAlchemy URL. SQLite URLs may select a tuning
+                          profile with a ``pragma_profile`` query parameter,
+                          as added by ``create_sqlite_url``.
+            profile: SQLite tuning profile, "ingest", "serve" or "safe",
+                     applied to every connection. Overrides the URL's profile.
+                     Without one, SQLite's defaults are kept.
+        
+        Raises:
+            ValueError: If the profile is unknown or the database is not SQLite
+        """
+        url = make_url(database_url)
+        url_profile = url.query.get(PROFILE_QUERY_KEY)
+        if url_profile is not None:
+            url = url.difference_update_query([PROFILE_QUERY_KEY])
+        self.profile = profile or url_profile
+        if self.profile is not None and url.get_backend_name() != "sqlite":
+            raise ValueError("Tuning profiles are only supported for SQLite databases")
+        self.engine = create_engine(url)
+        self.pragmas = install_profile(self.engine, self.profile)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
         
         # Create all tables
         models.Base.metadata.create_all(bind=self.engine)
+        self._upgrade_schema()
+
+    def _upgrade_schema(self) -> None:
+        """Add nullable columns and indexes introduced after the database was created.
+        
+        ``create_all`` only creates missing tables, so additions to existing
+        tables are applied here.
+        """
+        inspector = inspect(self.engine)
+        with self.engine.begin() as connection:
+            for table in models.Base.metadata.sorted_tables:
+                existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in existing_columns or not column.nullable:
+                        continue
+                    column_type = column.type.compile(dialect=self.engine.dialect)
+                    connection.execute(text(
+                        f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'
+                    ))
+                for index in table.indexes:
+                    index.create(connection, checkfirst=True)
+
+    def get_pragmas(self) -> Dict[str, object]:
+        """Report the tuning pragmas in effect on a pooled connection, for diagnostics.
+        
+        Values are as SQLite reports them, e.g. ``synchronous`` is 1 for NORMAL
+        and 2 for FULL.
+        """
+        with self.engine.connect() as connection:
+            return read_pragmas(connection.connection.dbapi_connection, PRAGMA_NAMES)
 
     def get_session(self) -> Session:
         """Get a new database session."""
@@ -35,6 +89,42 @@ class DatabaseClient:
                 session.rollback()
                 raise ValueError(f"Document with hash {document.file_hash} already exists")
     
+    def create_documents_bulk(
+        self,
+        documents: List[schema.DocumentCreate],
+        return_rows: bool = True
+    ) -> Optional[List[schema.Document]]:
+        """Create many documents in a single transaction.
+        
+        Rows are written with one multi-row INSERT per batch rather than a
+        commit per document. The batch is all or nothing.
+        
+        Args:
+            documents: Documents to create
+            return_rows: Read the created rows back. Pass False to skip the
+                         RETURNING clause and model validation when the
+                         caller does not need them.
+        
+        Returns:
+            Created documents in input order, or None if return_rows is False
+        
+        Raises:
+            ValueError: If any document's ID or hash already exists
+        """
+        if not documents:
+            return [] if return_rows else None
+        rows = [document.model_dump() for document in documents]
+        with self.get_session() as session:
+            try:
+                created = self._bulk_insert(session, models.Document, rows, return_rows)
+                session.commit()
+            except IntegrityError:
+                session.rollback()
+                raise ValueError("One or more documents in the batch already exist")
+            if created is None:
+                return None
+            return [schema.Document.model_validate(d) for d in created]
+
     def get_documents(self, skip: int = 0, limit: int = 10) -> List[schema.Document]:
         """Get all documents with pagination."""
         with self.get_session() as session:
@@ -57,6 +147,81 @@ class DatabaseClient:
             ).first()
             return schema.Document.model_validate(result) if result else None
 
+    def get_documents_by_hashes(
+        self,
+        file_hashes: Iterable[str],
+        chunk_size: int = 500
+    ) -> Dict[str, schema.Document]:
+        """Resolve many hashes to documents using chunked ``IN (...)`` queries.
+        
+        Args:
+            file_hashes: Hashes to look up, duplicates are ignored
+            chunk_size: Maximum hashes per query, kept below SQLite's bound parameter limit
+        
+        Returns:
+            Mapping of hash to document for every hash that already exists
+        """
+        unique_hashes = list(dict.fromkeys(file_hashes))
+        found: Dict[str, schema.Document] = {}
+        if not unique_hashes:
+            return found
+        
+        with self.get_session() as session:
+            for start in range(0, len(unique_hashes), chunk_size):
+                chunk = unique_hashes[start:start + chunk_size]
+                documents = session.query(models.Document).filter(
+                    models.Document.file_hash.in_(chunk)
+                ).all()
+                for document in documents:
+                    found[document.file_hash] = schema.Document.model_validate(document)
+        return found
+
+    def get_prefilter_collisions(
+        self,
+        prefilters: Iterable[Tuple[str, int]],
+        chunk_size: int = 250
+    ) -> Set[str]:
+        """Find quick hashes that may belong to an existing document.
+        
+        A quick hash collides if a document has the same quick hash, or if a
+        document stored before quick hashes existed has the same file size.
+        
+        Args:
+            prefilters: (quick_hash, file_size_bytes) pairs to check
+            chunk_size: Maximum pairs per query
+        
+        Returns:
+            The subset of input quick hashes that need a full hash comparison
+        """
+        unique_prefilters = list(dict.fromkeys(prefilters))
+        collisions: Set[str] = set()
+        if not unique_prefilters:
+            return collisions
+        
+        with self.get_session() as session:
+            for start in range(0, len(unique_prefilters), chunk_size):
+                chunk = unique_prefilters[start:start + chunk_size]
+                quick_hashes = [quick_hash for quick_hash, _ in chunk]
+                sizes = [file_size for _, file_size in chunk]
+                rows = session.query(
+                    models.Document.quick_hash,
+                    models.Document.file_size_bytes,
+                ).filter(or_(
+                    models.Document.quick_hash.in_(quick_hashes),
+                    and_(
+                        models.Document.quick_hash.is_(None),
+                        models.Document.file_size_bytes.in_(sizes),
+                    ),
+                )).all()
+                
+                matched_hashes = {row.quick_hash for row in rows if row.quick_hash}
+                legacy_sizes = {row.file_size_bytes for row in rows if row.quick_hash is None}
+                collisions.update(
+                    quick_hash for quick_hash, file_size in chunk
+                    if quick_hash in matched_hashes or file_size in legacy_sizes
+                )
+        return collisions
+
     def create_metadata(self, metadata: schema.DocumentMetadataCreate) -> schema.DocumentMetadata:
         """Create document metadata."""
         with self.get_session() as session:
@@ -78,95 +243,519 @@ class DatabaseClient:
             ).first()
             return schema.DocumentMetadata.model_validate(result) if result else None
 
-    def create_section(self, 
-                      section: schema.DocumentSectionCreate, 
-                      content: schema.SectionContentCreate) -> schema.DocumentSection:
-        """Create document section with its content."""
+    def create_section(
+        self,
+        section: schema.DocumentSectionCreate,
+        content: schema.SectionContentCreate,
+        update_counters: bool = True
+    ) -> schema.DocumentSection:
+        """Create document section with its content.
+        
+        The section, its content and the document's ``total_sections``
+        increment are written in one transaction. The counter is updated with
+        ``total_sections = total_sections + 1`` in SQL, so concurrent writers
+        cannot lose increments.
+        
+        Args:
+            section: Section to create
+            content: Content of the section
+            update_counters: Increment the document's counter. Pass False when
+                             loading many rows and call ``recompute_counters``
+                             afterwards.
+        """
         with self.get_session() as session:
-            # Create section
-            db_section = models.DocumentSection(**section.model_dump())
-            session.add(db_section)
-            
-            # Create section content
-            db_content = models.SectionContent(**content.model_dump())
-            session.add(db_content)
-            
+            session.add(models.DocumentSection(**section.model_dump()))
+            session.add(models.SectionContent(**content.model_dump()))
             try:
+                session.flush()
+                if update_counters:
+                    self._increment_counters(
+                        session, models.Document, "id", "total_sections", {section.doc_id: 1}
+                    )
                 session.commit()
-                session.refresh(db_section)
-                
-                # Update document metrics
-                doc = session.query(models.Document).filter(
-                    models.Document.id == section.doc_id
-                ).first()
-                doc.total_sections += 1
-                session.commit()
-                
-                # Get the complete section with content
-                result = (
-                    session.query(models.DocumentSection)
-                    .filter(models.DocumentSection.section_id == section.section_id)
-                    .first()
-                )
-                return schema.DocumentSection.model_validate(result)
             except IntegrityError:
                 session.rollback()
                 raise ValueError(f"Section {section.section_id} already exists")
+        # A new section has no children yet, so the result is built from the input
+        return schema.DocumentSection(
+            **section.model_dump(),
+            content=schema.SectionContent(**content.model_dump()),
+        )
+
+    def create_sections_bulk(
+        self,
+        sections: List[schema.DocumentSectionCreate],
+        contents: List[schema.SectionContentCreate],
+        return_rows: bool = True,
+        update_counters: bool = True,
+        chunk_size: int = 500
+    ) -> Optional[List[schema.DocumentSection]]:
+        """Create many sections and their content in a single transaction.
+        
+        Each document's ``total_sections`` is incremented once by the number
+        of its sections in the batch. Parents may be created in the same batch
+        as their children.
+        
+        Args:
+            sections: Sections to create
+            contents: Content of each section, aligned with ``sections``
+            return_rows: Read the created sections back with their content
+            update_counters: Increment document counters. Pass False during a
+                             bulk load and call ``recompute_counters`` once at the end.
+            chunk_size: Maximum section IDs per query when reading back
+        
+        Returns:
+            Created sections in input order, or None if return_rows is False
+        
+        Raises:
+            ValueError: If the lists differ in length or a section already exists
+        """
+        if len(sections) != len(contents):
+            raise ValueError(f"Got {len(sections)} sections but {len(contents)} contents")
+        if not sections:
+            return [] if return_rows else None
+        with self.get_session() as session:
+            try:
+                self._bulk_insert(session, models.DocumentSection, [s.model_dump() for s in sections])
+                self._bulk_insert(session, models.SectionContent, [c.model_dump() for c in contents])
+                if update_counters:
+                    self._increment_counters(
+                        session, models.Document, "id", "total_sections",
+                        Counter(section.doc_id for section in sections),
+                    )
+                session.commit()
+            except IntegrityError:
+                session.rollback()
+                raise ValueError("One or more sections in the batch already exist")
+            if not return_rows:
+                return None
+            
+            # Load every chunk before validating, so child collections of
+            # sections in the batch are populated from the identity map
+            section_ids = [section.section_id for section in sections]
+            loaded = {}
+            for start in range(0, len(section_ids), chunk_size):
+                statement = (
+                    select(models.DocumentSection)
+                    .where(models.DocumentSection.section_id.in_(section_ids[start:start + chunk_size]))
+                    .options(
+                        selectinload(models.DocumentSection.content),
+                        selectinload(models.DocumentSection.child_sections),
+                    )
+                )
+                loaded.update((s.section_id, s) for s in session.scalars(statement))
+            return [schema.DocumentSection.model_validate(loaded[section_id]) for section_id in section_ids]
+
+    def get_document_sections(
+        self,
+        doc_id: str,
+        section_id: Optional[str] = None
+    ) -> List[schema.DocumentSection]:
+        """Get sections for a document ordered by sequence, with content and children.
+        
+        The sections and their content are loaded with two queries however
+        many there are, and ``child_sections`` are assembled in memory.
+        
+        Args:
+            doc_id: Document whose sections to get
+            section_id: Only get this section and its descendants
+        
+        Returns:
+            Flat list of the sections in sequence order. Each section's
+            ``child_sections`` holds the same objects as the list.
+        """
+        with self.get_session() as session:
+            return self._load_sections(session, doc_id, section_id)
 
-    def get_document_sections(self, doc_id: str) -> List[schema.DocumentSection]:
-        """Get all sections for a document ordered by sequence."""
+    def get_section_tree(
+        self,
+        doc_id: str,
+        section_id: Optional[str] = None
+    ) -> List[schema.DocumentSection]:
+        """Get a document's section hierarchy.
+        
+        Args:
+            doc_id: Document whose sections to get
+            section_id: Only get the subtree rooted at this section
+        
+        Returns:
+            The top-level sections in sequence order with their descendants
+            nested in ``child_sections``, or the single subtree root
+        """
         with self.get_session() as session:
-            sections = (
-                session.query(models.DocumentSection)
-                .filter(models.DocumentSection.doc_id == doc_id)
-                .order_by(models.DocumentSection.sequence_order)
-                .all()
+            sections = self._load_sections(session, doc_id, section_id)
+        loaded = {section.section_id for section in sections}
+        return [section for section in sections if section.parent_section_id not in loaded]
+
+    @staticmethod
+    def _load_sections(
+        session: Session,
+        doc_id: str,
+        section_id: Optional[str] = None
+    ) -> List[schema.DocumentSection]:
+        """Load sections and their content eagerly and link children to parents."""
+        sections_table = models.DocumentSection
+        statement = select(sections_table).where(sections_table.doc_id == doc_id)
+        if section_id is not None:
+            # Walk down from the subtree root with a recursive CTE
+            subtree = (
+                select(sections_table.section_id)
+                .where(sections_table.section_id == section_id, sections_table.doc_id == doc_id)
+                .cte("subtree", recursive=True)
             )
-            return [schema.DocumentSection.model_validate(s) for s in sections]
+            subtree = subtree.union_all(
+                select(sections_table.section_id)
+                .where(sections_table.parent_section_id == subtree.c.section_id)
+            )
+            statement = statement.where(sections_table.section_id.in_(select(subtree.c.section_id)))
+        statement = statement.order_by(sections_table.sequence_order).options(
+            selectinload(sections_table.content)
+        )
+        
+        nodes: Dict[str, schema.DocumentSection] = {}
+        for db_section in session.scalars(statement):
+            nodes[db_section.section_id] = schema.DocumentSection(
+                **{field: getattr(db_section, field) for field in schema.DocumentSectionBase.model_fields},
+                content=(
+                    schema.SectionContent.model_validate(db_section.content)
+                    if db_section.content is not None else None
+                ),
+            )
+        for node in nodes.values():
+            parent = nodes.get(node.parent_section_id)
+            if parent is not None:
+                parent.child_sections.append(node)
+        return list(nodes.values())
+
+    def create_image(
+        self,
+        image: schema.DocumentImageCreate,
+        update_counters: bool = True
+    ) -> schema.DocumentImage:
+        """Create document image and update metrics in one transaction."""
+        return self._create_section_item(
+            models.DocumentImage, schema.DocumentImage, image,
+            "total_images", "image_count", update_counters,
+        )
 
-    def create_image(self, image: schema.DocumentImageCreate) -> schema.DocumentImage:
-        """Create document image and update metrics."""
+    def create_table(
+        self,
+        table: schema.DocumentTableCreate,
+        update_counters: bool = True
+    ) -> schema.DocumentTable:
+        """Create document table and update metrics in one transaction."""
+        return self._create_section_item(
+            models.DocumentTable, schema.DocumentTable, table,
+            "total_tables", "table_count", update_counters,
+        )
+
+    def _create_section_item(
+        self,
+        model: type,
+        read_schema: type,
+        item: BaseModel,
+        document_counter: str,
+        section_counter: str,
+        update_counters: bool
+    ) -> BaseModel:
+        """Insert an image or table and increment its document and section counters."""
         with self.get_session() as session:
-            db_image = models.DocumentImage(**image.model_dump())
-            session.add(db_image)
+            db_item = model(**item.model_dump())
+            session.add(db_item)
+            session.flush()
+            if update_counters:
+                self._increment_counters(session, models.Document, "id", document_counter, {item.doc_id: 1})
+                self._increment_counters(
+                    session, models.DocumentSection, "section_id", section_counter, {item.section_id: 1}
+                )
+            result = read_schema.model_validate(db_item)
             session.commit()
-            
-            # Update metrics
-            doc = session.query(models.Document).filter(
-                models.Document.id == image.doc_id
-            ).first()
-            doc.total_images += 1
-            
-            section = session.query(models.DocumentSection).filter(
-                models.DocumentSection.section_id == image.section_id
-            ).first()
-            section.image_count += 1
+            return result
+
+    def create_images_bulk(
+        self,
+        images: List[schema.DocumentImageCreate],
+        return_rows: bool = True,
+        update_counters: bool = True
+    ) -> Optional[List[schema.DocumentImage]]:
+        """Create many document images in a single transaction and update metrics.
+        
+        Args:
+            images: Images to create
+            return_rows: Read the created rows back, including their IDs
+            update_counters: Increment document and section counters
+        
+        Returns:
+            Created images in input order, or None if return_rows is False
+        """
+        return self._create_section_items_bulk(
+            models.DocumentImage, schema.DocumentImage, images,
+            "total_images", "image_count", return_rows, update_counters,
+        )
+
+    def create_tables_bulk(
+        self,
+        tables: List[schema.DocumentTableCreate],
+        return_rows: bool = True,
+        update_counters: bool = True
+    ) -> Optional[List[schema.DocumentTable]]:
+        """Create many document tables in a single transaction and update metrics.
+        
+        Args:
+            tables: Tables to create
+            return_rows: Read the created rows back, including their IDs
+            update_counters: Increment document and section counters
+        
+        Returns:
+            Created tables in input order, or None if return_rows is False
+        """
+        return self._create_section_items_bulk(
+            models.DocumentTable, schema.DocumentTable, tables,
+            "total_tables", "table_count", return_rows, update_counters,
+        )
+
+    def _create_section_items_bulk(
+        self,
+        model: type,
+        read_schema: type,
+        items: list,
+        document_counter: str,
+        section_counter: str,
+        return_rows: bool,
+        update_counters: bool
+    ) -> Optional[list]:
+        """Insert images or tables and increment their document and section counters.
+        
+        Raises:
+            ValueError: If a row violates a constraint, e.g. references a missing section
+        """
+        if not items:
+            return [] if return_rows else None
+        with self.get_session() as session:
+            try:
+                created = self._bulk_insert(session, model, [item.model_dump() for item in items], return_rows)
+                if update_counters:
+                    self._increment_counters(
+                        session, models.Document, "id", document_counter,
+                        Counter(item.doc_id for item in items),
+                    )
+                    self._increment_counters(
+                        session, models.DocumentSection, "section_id", section_counter,
+                        Counter(item.section_id for item in items),
+                    )
+                session.commit()
+            except IntegrityError:
+                session.rollback()
+                raise ValueError(f"Could not insert the batch into {model.__tablename__}")
+            if created is None:
+                return None
+            return [read_schema.model_validate(row) for row in created]
+
+    @staticmethod
+    def _bulk_insert(session: Session, model: type, rows: List[dict], return_rows: bool = False) -> Optional[list]:
+        """Insert rows with executemany, optionally returning ORM objects in input order.
+        
+        SQLAlchemy batches the rows into multi-row INSERT statements
+        ("insertmanyvalues"), so a batch costs a handful of round trips.
+        """
+        statement = insert(model)
+        if not return_rows:
+            session.execute(statement, rows)
+            return None
+        statement = statement.returning(model, sort_by_parameter_order=True)
+        return session.scalars(statement, rows).all()
+
+    @staticmethod
+    def _increment_counters(
+        session: Session,
+        model: type,
+        key_column: str,
+        counter_column: str,
+        counts: Dict[str, int]
+    ) -> None:
+        """Add ``counts[key]`` to a counter column of each keyed row with one executemany UPDATE."""
+        if not counts:
+            return
+        table = model.__table__
+        counter = table.c[counter_column]
+        statement = update(table).where(
+            table.c[key_column] == bindparam("row_key")
+        ).values({counter_column: counter + bindparam("row_increment")})
+        session.execute(
+            statement,
+            [{"row_key": key, "row_increment": n} for key, n in counts.items()],
+        )
+
+    def recompute_counters(self, doc_ids: Optional[Iterable[str]] = None, chunk_size: int = 500) -> None:
+        """Recompute document and section counters from the rows that exist.
+        
+        Each counter is set from one ``GROUP BY`` aggregate joined into an
+        ``UPDATE``, so this costs a handful of statements regardless of the
+        number of rows. Use after loading with ``update_counters=False``.
+        
+        Args:
+            doc_ids: Documents to recompute, along with their sections. All
+                     documents by default.
+            chunk_size: Maximum document IDs per statement
+        """
+        if doc_ids is None:
+            doc_id_chunks = [None]
+        else:
+            doc_ids = list(dict.fromkeys(doc_ids))
+            doc_id_chunks = [doc_ids[start:start + chunk_size] for start in range(0, len(doc_ids), chunk_size)]
+        counters = [
+            (models.Document, models.Document.id, models.DocumentSection, "doc_id", "total_sections"),
+            (models.Document, models.Document.id, models.DocumentImage, "doc_id", "total_images"),
+            (models.Document, models.Document.id, models.DocumentTable, "doc_id", "total_tables"),
+            (models.DocumentSection, models.DocumentSection.doc_id, models.DocumentImage, "section_id", "image_count"),
+            (models.DocumentSection, models.DocumentSection.doc_id, models.DocumentTable, "section_id", "table_count"),
+        ]
+        with self.get_session() as session:
+            for chunk in doc_id_chunks:
+                for target, doc_column, source, group_column, counter_column in counters:
+                    table = target.__table__
+                    key_column = table.primary_key.columns.values()[0]
+                    reset = update(table).values({counter_column: 0})
+                    grouped = select(
+                        source.__table__.c[group_column].label("row_key"),
+                        func.count().label("row_count"),
+                    ).group_by(source.__table__.c[group_column])
+                    if chunk is not None:
+                        reset = reset.where(doc_column.in_(chunk))
+                        grouped = grouped.where(source.__table__.c.doc_id.in_(chunk))
+                    grouped = grouped.subquery()
+                    session.execute(reset)
+                    session.execute(
+                        update(table)
+                        .values({counter_column: grouped.c.row_count})
+                        .where(key_column == grouped.c.row_key)
+                    )
             session.commit()
-            session.refresh(db_image)
-            
-            return schema.DocumentImage.model_validate(db_image)
 
-    def create_table(self, table: schema.DocumentTableCreate) -> schema.DocumentTable:
-        """Create document table and update metrics."""
+    def get_fingerprint(
+        self,
+        device: int,
+        inode: int,
+        size_bytes: int,
+        mtime_ns: int
+    ) -> Optional[schema.FileFingerprint]:
+        """Get the cached fingerprint for a file identity, if any."""
+        with self.get_session() as session:
+            result = session.get(models.FileFingerprint, (device, inode, size_bytes, mtime_ns))
+            return schema.FileFingerprint.model_validate(result) if result else None
+
+    def get_fingerprints(
+        self,
+        keys: Iterable[Tuple[int, int, int, int]],
+        chunk_size: int = 200
+    ) -> Dict[Tuple[int, int, int, int], schema.FileFingerprint]:
+        """Get cached fingerprints for many file identities using chunked primary key lookups.
+        
+        Args:
+            keys: (device, inode, size_bytes, mtime_ns) identities, duplicates are ignored
+            chunk_size: Maximum identities per query, kept below SQLite's bound parameter limit
+        
+        Returns:
+            Mapping of identity to fingerprint for every identity that is cached
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        found: Dict[Tuple[int, int, int, int], schema.FileFingerprint] = {}
+        if not unique_keys:
+            return found
+        
+        # SQLite scans the table for a row-value IN, but serves each ORed
+        # primary key match with an index search
+        with self.get_session() as session:
+            for start in range(0, len(unique_keys), chunk_size):
+                chunk = unique_keys[start:start + chunk_size]
+                rows = session.query(models.FileFingerprint).filter(or_(*(
+                    and_(
+                        models.FileFingerprint.device == device,
+                        models.FileFingerprint.inode == inode,
+                        models.FileFingerprint.size_bytes == size_bytes,
+                        models.FileFingerprint.mtime_ns == mtime_ns,
+                    )
+                    for device, inode, size_bytes, mtime_ns in chunk
+                ))).all()
+                for row in rows:
+                    fingerprint = schema.FileFingerprint.model_validate(row)
+                    key = (fingerprint.device, fingerprint.inode, fingerprint.size_bytes, fingerprint.mtime_ns)
+                    found[key] = fingerprint
+        return found
+
+    def upsert_fingerprints(self, fingerprints: List[schema.FileFingerprint]) -> None:
+        """Insert or replace many cached fingerprints in a single transaction."""
+        if not fingerprints:
+            return
+        statement = sqlite_insert(models.FileFingerprint)
+        statement = statement.on_conflict_do_update(
+            index_elements=["device", "inode", "size_bytes", "mtime_ns"],
+            set_={
+                "file_hash": statement.excluded.file_hash,
+                "mime_type": statement.excluded.mime_type,
+                "pdf_encrypted": statement.excluded.pdf_encrypted,
+            },
+        )
         with self.get_session() as session:
-            db_table = models.DocumentTable(**table.model_dump())
-            session.add(db_table)
+            session.execute(statement, [f.model_dump() for f in fingerprints])
             session.commit()
-            
-            # Update metrics
-            doc = session.query(models.Document).filter(
-                models.Document.id == table.doc_id
-            ).first()
-            doc.total_tables += 1
-            
-            section = session.query(models.DocumentSection).filter(
-                models.DocumentSection.section_id == table.section_id
-            ).first()
-            section.table_count += 1
+
+    def get_manifest_entries(self, root: str) -> Dict[str, schema.ScanManifestEntry]:
+        """Get all scan manifest entries recorded for a scan root, keyed by path."""
+        with self.get_session() as session:
+            results = session.query(models.ScanManifestEntry).filter(
+                models.ScanManifestEntry.root == root
+            )
+            return {
+                result.path: schema.ScanManifestEntry.model_validate(result)
+                for result in results
+            }
+
+    def upsert_manifest_entries(self, entries: List[schema.ScanManifestEntry]) -> None:
+        """Insert or replace many scan manifest entries in a single transaction."""
+        if not entries:
+            return
+        statement = sqlite_insert(models.ScanManifestEntry)
+        statement = statement.on_conflict_do_update(
+            index_elements=["path"],
+            set_={
+                "root": statement.excluded.root,
+                "size_bytes": statement.excluded.size_bytes,
+                "mtime_ns": statement.excluded.mtime_ns,
+                "outcome": statement.excluded.outcome,
+            },
+        )
+        with self.get_session() as session:
+            session.execute(statement, [entry.model_dump() for entry in entries])
+            session.commit()
+
+    def update_manifest_outcomes(self, outcomes: Dict[str, str]) -> None:
+        """Set the ingestion outcome of many scan manifest entries by path.
+        
+        Paths without a manifest entry are ignored.
+        """
+        if not outcomes:
+            return
+        table = models.ScanManifestEntry.__table__
+        statement = update(table).where(
+            table.c.path == bindparam("entry_path")
+        ).values(outcome=bindparam("entry_outcome"))
+        with self.get_session() as session:
+            session.execute(
+                statement,
+                [{"entry_path": path, "entry_outcome": outcome} for path, outcome in outcomes.items()],
+            )
+            session.commit()
+
+    def delete_manifest_entries(self, paths: Iterable[str], chunk_size: int = 500) -> None:
+        """Delete scan manifest entries by path."""
+        paths = list(paths)
+        with self.get_session() as session:
+            for start in range(0, len(paths), chunk_size):
+                session.query(models.ScanManifestEntry).filter(
+                    models.ScanManifestEntry.path.in_(paths[start:start + chunk_size])
+                ).delete(synchronize_session=False)
             session.commit()
-            session.refresh(db_table)
-            
-            return schema.DocumentTable.model_validate(db_table)
 
     def delete_document(self, doc_id: str) -> bool:
         """Delete a document and all its related data."""
@@ -1,6 +1,6 @@
 """SQLAlchemy models for the document database."""
 import datetime
-from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Text, JSON
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, DateTime, Text, JSON
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -12,6 +12,7 @@ class Document(Base):
     id = Column(String, primary_key=True)
     raw_file_path = Column(String, nullable=False)
     file_hash = Column(String, nullable=False, unique=True)
+    quick_hash = Column(String, index=True)  # Size + head/tail prefilter for duplicate checks
     file_size_bytes = Column(Integer, nullable=False)
     mime_type = Column(String, nullable=False)
     ingestion_date = Column(DateTime, nullable=False, default=datetime.datetime.now(datetime.timezone.utc))
@@ -39,10 +40,14 @@ class DocumentMetadata(Base):
 class DocumentSection(Base):
     """Document's physical section structure."""
     __tablename__ = "document_sections"
+    __table_args__ = (
+        # Backs the ordered section fetch; its doc_id prefix serves doc_id lookups
+        Index("ix_document_sections_doc_id_sequence_order", "doc_id", "sequence_order"),
+    )
 
     section_id = Column(String, primary_key=True)
     doc_id = Column(String, ForeignKey("documents.id"), nullable=False)
-    parent_section_id = Column(String, ForeignKey("document_sections.section_id"))
+    parent_section_id = Column(String, ForeignKey("document_sections.section_id"), index=True)
     level = Column(Integer, nullable=False)  # Header level (1=H1, etc)
     sequence_order = Column(Integer, nullable=False)  # Order in document
     
@@ -75,9 +80,9 @@ class DocumentImage(Base):
     __tablename__ = "document_images"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    doc_id = Column(String, ForeignKey("documents.id"), nullable=False)
+    doc_id = Column(String, ForeignKey("documents.id"), nullable=False, index=True)
     section_id = Column(String, ForeignKey("document_sections.section_id"), 
-                       nullable=False)
+                       nullable=False, index=True)
     page_number = Column(Integer, nullable=False)
     image_data = Column(Text, nullable=False)  # Base64 encoded
     caption = Column(Text)
@@ -88,9 +93,42 @@ class DocumentTable(Base):
     __tablename__ = "document_tables"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    doc_id = Column(String, ForeignKey("documents.id"), nullable=False)
+    doc_id = Column(String, ForeignKey("documents.id"), nullable=False, index=True)
     section_id = Column(String, ForeignKey("document_sections.section_id"), 
-                       nullable=False)
+                       nullable=False, index=True)
     page_number = Column(Integer, nullable=False)
     table_data = Column(JSON, nullable=False)  # JSON structured data
     caption = Column(Text)
+
+
+class FileFingerprint(Base):
+    """Cache of file content fingerprints keyed by filesystem identity.
+    
+    A row is valid for as long as the file keeps the same device, inode, size
+    and modification time, which lets re-scans skip hashing unchanged files.
+    """
+    __tablename__ = "file_fingerprints"
+
+    device = Column(Integer, primary_key=True, autoincrement=False)
+    inode = Column(Integer, primary_key=True, autoincrement=False)
+    size_bytes = Column(Integer, primary_key=True, autoincrement=False)
+    mtime_ns = Column(Integer, primary_key=True, autoincrement=False)
+    file_hash = Column(String, nullable=False)
+    mime_type = Column(String, nullable=False)
+    # Whether a structurally valid PDF is encrypted; NULL if its structure was never checked
+    pdf_encrypted = Column(Boolean, nullable=True)
+
+
+class ScanManifestEntry(Base):
+    """Last seen state and ingestion outcome of a file under a scanned directory.
+    
+    Directory scans compare against these rows to report only new, modified
+    and deleted files.
+    """
+    __tablename__ = "scan_manifest"
+
+    path = Column(String, primary_key=True)
+    root = Column(String, nullable=False, index=True)
+    size_bytes = Column(Integer, nullable=False)
+    mtime_ns = Column(Integer, nullable=False)
+    outcome = Column(String)  # None until the file has been through the pipeline
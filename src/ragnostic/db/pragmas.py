@@ -0,0 +1,100 @@
+"""SQLite tuning profiles applied to every new connection."""
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# URL query parameter that selects a profile, see ``create_sqlite_url``
+PROFILE_QUERY_KEY = "pragma_profile"
+
+# Pragmas set by the profiles, reported by ``DatabaseClient.get_pragmas``
+PRAGMA_NAMES = ("journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout")
+
+# Pragmas are applied in order; journal_mode comes first because it cannot
+# change once the connection has started a transaction.
+PROFILES: Dict[str, Dict[str, Any]] = {
+    # Bulk loading: WAL lets readers continue during ingestion, commits only
+    # sync at checkpoints, and a large cache and mmap keep index pages hot
+    "ingest": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -262144,  # 256 MiB
+        "mmap_size": 1 << 30,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+    },
+    # Read-heavy serving alongside an occasional writer
+    "serve": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,  # 64 MiB
+        "mmap_size": 1 << 30,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # Every commit synced before it returns
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16384,  # 16 MiB
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 30000,
+    },
+}
+
+
+def get_profile(name: str) -> Dict[str, Any]:
+    """Look up a profile by name.
+
+    Raises:
+        ValueError: If there is no profile of that name
+    """
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown SQLite profile {name!r}, expected one of {sorted(PROFILES)}")
+
+
+def apply_pragmas(dbapi_connection: Any, pragmas: Dict[str, Any]) -> None:
+    """Set pragmas on a raw DB-API connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def install_profile(engine: Engine, profile: Optional[str]) -> Dict[str, Any]:
+    """Apply a profile to every connection the engine opens.
+
+    Args:
+        engine: SQLite engine, before any connection has been made
+        profile: Profile name, or None to keep SQLite's defaults
+
+    Returns:
+        The pragmas that will be applied
+    """
+    if profile is None:
+        return {}
+    pragmas = get_profile(profile)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, pragmas)
+
+    return pragmas
+
+
+def read_pragmas(dbapi_connection: Any, names: Iterable[str]) -> Dict[str, Any]:
+    """Read the current value of pragmas from a raw DB-API connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        values = {}
+        for name in names:
+            row = cursor.execute(f"PRAGMA {name}").fetchone()
+            values[name] = row[0] if row else None
+        return values
+    finally:
+        cursor.close()
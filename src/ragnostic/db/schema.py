@@ -11,6 +11,7 @@ class DocumentBase(BaseModel):
     file_hash: str
     file_size_bytes: int
     mime_type: str
+    quick_hash: Optional[str] = Field(default=None, description="Size + head/tail prefilter hash")
 
 
 class DocumentCreate(DocumentBase):
@@ -135,5 +136,29 @@ class DocumentTable(DocumentTableBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class FileFingerprint(BaseModel):
+    """Schema for a cached file fingerprint."""
+    device: int
+    inode: int
+    size_bytes: int
+    mtime_ns: int
+    file_hash: str
+    mime_type: str
+    pdf_encrypted: Optional[bool] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ScanManifestEntry(BaseModel):
+    """Schema for a scan manifest entry."""
+    path: str
+    root: str
+    size_bytes: int
+    mtime_ns: int
+    outcome: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 # Update forward references for nested models
 DocumentSection.model_rebuild()
\ No newline at end of file
@@ -5,4 +5,5 @@ from .monitor import *
 from .validation import *
 from .processor import *
 from .indexing import *
+from .iopolicy import IOPolicy
 from .utils import create_doc_id
@@ -4,8 +4,10 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Tuple
 
+import pymupdf
 import pymupdf4llm
 
+from ragnostic.ingestion.processor.compression import is_compressed, open_document, stored_path
 from .schema import DocumentMetadataExtracted
 
 logger = logging.getLogger(__name__)
@@ -26,8 +28,11 @@ class PDFExtractor:
     def extract_metadata(self, filepath: Path) -> Tuple[Optional[DocumentMetadataExtracted], Optional[str]]:
         """Extract metadata and optional text preview from PDF.
         
+        Documents in the compressed cold tier are decompressed in memory, as
+        the PDF parser needs random access.
+        
         Args:
-            filepath: Path to PDF file
+            filepath: Path to PDF file, or the original path of a compressed document
             
         Returns:
             Tuple of (metadata, error_message)
@@ -35,7 +40,13 @@ class PDFExtractor:
         """
         try:
             # Open PDF with pymupdf4llm
-            page_chunks  = pymupdf4llm.to_markdown(str(filepath), page_chunks=True)
+            filepath = stored_path(filepath)
+            if is_compressed(filepath):
+                with open_document(filepath) as reader:
+                    with pymupdf.open(stream=reader.read(), filetype="pdf") as doc:
+                        page_chunks = pymupdf4llm.to_markdown(doc, page_chunks=True)
+            else:
+                page_chunks  = pymupdf4llm.to_markdown(str(filepath), page_chunks=True)
             
             # Extract basic metadata
             metadata = self._parse_page_chunks(page_chunks)
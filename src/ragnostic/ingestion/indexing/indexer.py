@@ -5,8 +5,8 @@ from typing import List, Optional, Set
 
 from ragnostic.db.client import DatabaseClient
 from ragnostic.db.schema import Document, DocumentCreate, DocumentMetadata, DocumentMetadataCreate
-from ragnostic.ingestion.validation.checks import compute_file_hash
-import magic
+from ragnostic.ingestion.validation.cache import FingerprintCache
+from ragnostic.ingestion.validation.checks import FileProbe
 
 from .extraction import PDFExtractor
 from .schema import IndexingResult, BatchIndexingResult, IndexingStatus
@@ -21,56 +21,80 @@ class DocumentIndexer:
 
     def __init__(self, 
                  db_client: DatabaseClient,
-                 text_preview_chars: int = 1000):
+                 text_preview_chars: int = 1000,
+                 fingerprint_cache: Optional[FingerprintCache] = None):
         """Initialize document indexer.
         
         Args:
             db_client: Database client instance
             extract_text: Whether to extract text preview
             text_preview_chars: Number of characters for text preview
+            fingerprint_cache: Optional cache consulted before hashing stored files
         """
         self.db_client = db_client
+        self.fingerprint_cache = fingerprint_cache
         self.extractor = PDFExtractor(
             text_preview_chars=text_preview_chars
         )
     
-    def index_document(self, filepath: Path) -> IndexingResult:
+    def index_document(
+        self,
+        filepath: Path,
+        doc_id: Optional[str] = None,
+        file_hash: Optional[str] = None,
+        raw_file_path: Optional[str] = None
+    ) -> IndexingResult:
         """Index a single document with metadata.
         
         Args:
             filepath: Path to document to index
+            doc_id: Document ID, defaults to the file name without suffix
+            file_hash: SHA-256 of the stored file if already known, e.g. recorded
+                       by the processor while copying. Skips re-reading the file.
+            raw_file_path: Location recorded for the document, defaults to
+                           ``filepath``. Set when the stored copy lives elsewhere,
+                           e.g. in object storage, and ``filepath`` is the source.
             
         Returns:
             IndexingResult with status and details
         """
+        doc_id = doc_id or filepath.stem
         try:
-            # Validate mime type first
-            mime_type = magic.from_file(str(filepath), mime=True)
-            if mime_type not in self.SUPPORTED_MIME_TYPES:
-                return IndexingResult(
-                    doc_id=filepath.stem,
-                    filepath=filepath,
-                    status=IndexingStatus.METADATA_ERROR,
-                    error_message=f"Unsupported file type: {mime_type}"
-                )
-            
-            # Get certain metadata
-            file_hash = compute_file_hash(filepath)
-            if not file_hash:
-                return IndexingResult(
-                    doc_id="ERROR",
-                    filepath=filepath,
-                    status=IndexingStatus.METADATA_ERROR,
-                    error_message="Failed to compute file hash"
-                )
-            
-            file_size = filepath.stat().st_size
+            # Open the stored file once; mime type, hash and size share one read
+            with FileProbe(filepath, cache=self.fingerprint_cache) as probe:
+                # Validate mime type first
+                mime_type = probe.mime_type
+                if mime_type not in self.SUPPORTED_MIME_TYPES:
+                    return IndexingResult(
+                        doc_id=doc_id,
+                        filepath=filepath,
+                        status=IndexingStatus.METADATA_ERROR,
+                        error_message=f"Unsupported file type: {mime_type}"
+                    )
+                
+                # Get certain metadata
+                if file_hash is None:
+                    try:
+                        file_hash = probe.file_hash
+                    except OSError:
+                        file_hash = None
+                if not file_hash:
+                    return IndexingResult(
+                        doc_id="ERROR",
+                        filepath=filepath,
+                        status=IndexingStatus.METADATA_ERROR,
+                        error_message="Failed to compute file hash"
+                    )
+                
+                file_size = probe.size
+                quick_hash = probe.quick_hash
             
             # Create document record
             doc = DocumentCreate(
-                id=filepath.stem,  # Using filename as ID for now
-                raw_file_path=str(filepath),
+                id=doc_id,
+                raw_file_path=raw_file_path or str(filepath),
                 file_hash=file_hash,
+                quick_hash=quick_hash,
                 file_size_bytes=file_size,
                 mime_type=mime_type
             )
@@ -121,22 +145,40 @@ class DocumentIndexer:
                 error_message=error_msg
             )
     
-    def index_batch(self, filepaths: List[Path]) -> BatchIndexingResult:
+    def index_batch(
+        self,
+        filepaths: List[Path],
+        doc_ids: Optional[List[str]] = None,
+        file_hashes: Optional[List[Optional[str]]] = None,
+        raw_file_paths: Optional[List[Optional[str]]] = None
+    ) -> BatchIndexingResult:
         """Index multiple documents.
         
         Args:
             filepaths: List of paths to documents to index
+            doc_ids: Optional document IDs aligned with ``filepaths``. Required
+                     when stored file names are not document IDs, as in the
+                     content-addressed layout.
+            file_hashes: Optional SHA-256 per file aligned with ``filepaths``
+            raw_file_paths: Optional recorded locations aligned with ``filepaths``
             
         Returns:
             BatchIndexingResult with combined results
         """
         results = BatchIndexingResult()
+        doc_ids = doc_ids or [None] * len(filepaths)
+        file_hashes = file_hashes or [None] * len(filepaths)
+        raw_file_paths = raw_file_paths or [None] * len(filepaths)
         
-        for filepath in filepaths:
-            result = self.index_document(filepath)
+        for filepath, doc_id, file_hash, raw_file_path in zip(filepaths, doc_ids, file_hashes, raw_file_paths):
+            result = self.index_document(
+                filepath, doc_id=doc_id, file_hash=file_hash, raw_file_path=raw_file_path
+            )
             if result.status == IndexingStatus.SUCCESS:
                 results.successful_docs.append(result)
             else:
                 results.failed_docs.append(result)
         
+        if self.fingerprint_cache is not None:
+            self.fingerprint_cache.flush()
         return results
\ No newline at end of file
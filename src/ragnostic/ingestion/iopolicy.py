@@ -0,0 +1,129 @@
+"""Page-cache policies for the bulk read and write paths of ingestion."""
+import errno
+import mmap
+import os
+from enum import Enum
+from typing import BinaryIO, Generator, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# O_DIRECT needs buffers, offsets and lengths aligned to the logical block
+# size; a page covers every common device.
+DIRECT_ALIGNMENT = mmap.PAGESIZE
+
+
+class IOPolicy(str, Enum):
+    """How bulk ingestion I/O uses the page cache.
+
+    Ingesting large batches otherwise fills the cache with document bytes
+    that are read once, evicting the database pages and model files that
+    other services on the host rely on.
+    """
+    DEFAULT = "default"  # Plain buffered I/O
+    STREAMING = "streaming"  # Sequential read-ahead, each file's pages dropped once done
+    DIRECT = "direct"  # O_DIRECT reads that bypass the cache; streaming where unsupported
+
+
+def advise(fd: int, advice: int) -> None:
+    """Give the kernel a ``posix_fadvise`` hint for a whole file, where supported."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError:
+        pass
+
+
+def begin_stream(fd: int, policy: IOPolicy) -> None:
+    """Prepare a file for one sequential pass."""
+    if policy != IOPolicy.DEFAULT and hasattr(os, "POSIX_FADV_SEQUENTIAL"):
+        advise(fd, os.POSIX_FADV_SEQUENTIAL)
+
+
+def end_stream(fd: int, policy: IOPolicy) -> None:
+    """Drop a file's cached pages after a pass.
+
+    Clean pages are dropped at once; for written files this also starts
+    writeback, and their pages become droppable once written.
+    """
+    if policy != IOPolicy.DEFAULT and hasattr(os, "POSIX_FADV_DONTNEED"):
+        advise(fd, os.POSIX_FADV_DONTNEED)
+
+
+def _set_direct(fd: int, enabled: bool) -> bool:
+    """Toggle O_DIRECT on an open descriptor, returning whether it took effect."""
+    if fcntl is None or not hasattr(os, "O_DIRECT") or not hasattr(os, "preadv"):
+        return False
+    try:
+        flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+        flags = flags | os.O_DIRECT if enabled else flags & ~os.O_DIRECT
+        fcntl.fcntl(fd, fcntl.F_SETFL, flags)
+    except OSError as e:
+        if e.errno != errno.EINVAL:
+            raise
+        return False
+    return True
+
+
+def _read_direct(fd: int, block_size: int, offset: int) -> Generator[memoryview, None, bool]:
+    """Read with O_DIRECT, returning False if the filesystem rejects the first read."""
+    # An anonymous mapping is page-aligned; offsets are rounded down to the
+    # alignment and the extra prefix is skipped.
+    block_size = -(-block_size // DIRECT_ALIGNMENT) * DIRECT_ALIGNMENT
+    buffer = mmap.mmap(-1, block_size)
+    view = memoryview(buffer)
+    position = offset - offset % DIRECT_ALIGNMENT
+    skip = offset - position
+    try:
+        n_bytes = os.preadv(fd, [buffer], position)
+    except OSError as e:
+        if e.errno != errno.EINVAL:
+            raise
+        return False
+    while n_bytes:
+        if n_bytes > skip:
+            yield view[skip:n_bytes]
+        position += n_bytes
+        skip = 0
+        n_bytes = os.preadv(fd, [buffer], position)
+    return True
+
+
+def read_blocks(
+    file: BinaryIO,
+    block_size: int,
+    offset: int = 0,
+    policy: IOPolicy = IOPolicy.DEFAULT
+) -> Iterator[memoryview]:
+    """Yield successive blocks of an open file from ``offset`` to its end.
+
+    Blocks are views of a reused buffer and are only valid until the next
+    one is requested. Under a non-default policy the file's pages are dropped
+    from the cache once the pass ends.
+
+    Args:
+        file: File opened for binary reading
+        block_size: Bytes per read
+        offset: Position to start reading at
+        policy: Page-cache policy for the pass
+    """
+    fd = file.fileno()
+    begin_stream(fd, policy)
+    try:
+        if policy == IOPolicy.DIRECT and _set_direct(fd, True):
+            try:
+                completed = yield from _read_direct(fd, block_size, offset)
+            finally:
+                _set_direct(fd, False)
+            if completed:
+                return
+        file.seek(offset)
+        buffer = bytearray(block_size)
+        view = memoryview(buffer)
+        while n_bytes := file.readinto(buffer):
+            yield view[:n_bytes]
+    finally:
+        end_stream(fd, policy)
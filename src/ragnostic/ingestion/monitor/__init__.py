@@ -1,9 +1,13 @@
 """Directory monitoring functionality for document ingestion."""
+from .manifest import ScanManifest
 from .monitor import DirectoryMonitor
-from .schema import MonitorResult, MonitorStatus
+from .schema import MonitorResult, MonitorStatus, ScanDelta, ScanOutcome
 
 __all__ = [
     "DirectoryMonitor",
     "MonitorResult",
     "MonitorStatus",
+    "ScanDelta",
+    "ScanManifest",
+    "ScanOutcome",
 ]
@@ -0,0 +1,111 @@
+"""Minimal ctypes binding to the Linux inotify API."""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+from typing import Iterator, List, NamedTuple, Optional
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+# Linux values, so the module still imports where os lacks the flags
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+IN_NONBLOCK = getattr(os, "O_NONBLOCK", 0o4000)
+
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+class InotifyEvent(NamedTuple):
+    """A decoded inotify event."""
+    wd: int
+    mask: int
+    cookie: int
+    name: str
+
+
+def _load_libc() -> ctypes.CDLL:
+    if not sys.platform.startswith("linux"):
+        raise NotImplementedError("inotify is only available on Linux")
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+
+
+def _raise_errno(path: Optional[str] = None) -> None:
+    errno = ctypes.get_errno()
+    raise OSError(errno, os.strerror(errno), path)
+
+
+class Inotify:
+    """Non-blocking inotify instance.
+
+    Use as a context manager, or call :meth:`close` to release the file descriptor.
+    """
+
+    def __init__(self):
+        self._libc = _load_libc()
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            _raise_errno()
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """Watch a path and return its watch descriptor."""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            _raise_errno(path)
+        return wd
+
+    def remove_watch(self, wd: int) -> None:
+        """Stop watching a watch descriptor, ignoring ones the kernel already removed."""
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self, timeout: float) -> List[InotifyEvent]:
+        """Wait up to ``timeout`` seconds and return all pending events."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        events: List[InotifyEvent] = []
+        while True:
+            try:
+                data = os.read(self.fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            events.extend(self._decode(data))
+        return events
+
+    @staticmethod
+    def _decode(data: bytes) -> Iterator[InotifyEvent]:
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            yield InotifyEvent(wd, mask, cookie, os.fsdecode(name))
+
+    def close(self) -> None:
+        """Close the inotify file descriptor."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def __enter__(self) -> "Inotify":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
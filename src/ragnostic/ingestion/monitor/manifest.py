@@ -0,0 +1,76 @@
+"""Persistent scan manifest for incremental directory scans."""
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from ragnostic.db.client import DatabaseClient
+from ragnostic.db.schema import ScanManifestEntry
+
+from .schema import ScanDelta, ScanOutcome
+
+# Outcomes after which an unchanged file is not returned again
+FINAL_OUTCOMES = frozenset({ScanOutcome.INGESTED.value, ScanOutcome.REJECTED.value})
+
+
+class ScanManifest:
+    """Record of the files seen under each scan root and what became of them.
+
+    Each scan is compared against the stored (path, size, mtime) entries of
+    its root. New and modified files are recorded with no outcome and
+    returned. Deleted files are dropped from the manifest. Unchanged files are
+    skipped once an ``ingested`` or ``rejected`` outcome has been recorded for
+    them; files that failed or were never processed are returned again.
+    Outcomes are reported back with :meth:`record_outcomes`.
+    """
+
+    def __init__(self, db_client: DatabaseClient):
+        """Initialize the manifest.
+
+        Args:
+            db_client: Database client holding the ``scan_manifest`` table
+        """
+        self.db_client = db_client
+
+    def apply_scan(self, root: Path, files: Iterable[Tuple[Path, int, int]]) -> ScanDelta:
+        """Compare a scan with the manifest and store the scanned state.
+
+        Args:
+            root: Scanned directory
+            files: (path, size in bytes, mtime in ns) of every file found by the scan
+
+        Returns:
+            ScanDelta with the new, modified, pending and deleted files
+        """
+        root_key = str(root)
+        previous = self.db_client.get_manifest_entries(root_key)
+        delta = ScanDelta()
+        changed: List[ScanManifestEntry] = []
+        for path, size_bytes, mtime_ns in files:
+            path_key = str(path)
+            entry = previous.pop(path_key, None)
+            if entry is None:
+                delta.new_files.append(path)
+            elif entry.size_bytes != size_bytes or entry.mtime_ns != mtime_ns:
+                delta.modified_files.append(path)
+            else:
+                if entry.outcome in FINAL_OUTCOMES:
+                    delta.unchanged_count += 1
+                else:
+                    delta.pending_files.append(path)
+                continue
+            changed.append(ScanManifestEntry(
+                path=path_key,
+                root=root_key,
+                size_bytes=size_bytes,
+                mtime_ns=mtime_ns,
+            ))
+
+        delta.deleted_files = [Path(path) for path in previous]
+        self.db_client.upsert_manifest_entries(changed)
+        self.db_client.delete_manifest_entries(previous)
+        return delta
+
+    def record_outcomes(self, outcomes: Dict[Path, ScanOutcome]) -> None:
+        """Record the ingestion outcome of scanned files."""
+        self.db_client.update_manifest_outcomes({
+            str(path): ScanOutcome(outcome).value for path, outcome in outcomes.items()
+        })
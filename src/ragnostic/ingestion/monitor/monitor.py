@@ -1,59 +1,499 @@
-
-
 """Directory monitoring implementation."""
+import logging
+import os
+import queue as queue_module
+import stat
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
 from pathlib import Path
-from typing import List, Set
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+from .inotify import (
+    IN_CLOSE_WRITE,
+    IN_CREATE,
+    IN_DELETE,
+    IN_IGNORED,
+    IN_ISDIR,
+    IN_MODIFY,
+    IN_MOVED_FROM,
+    IN_MOVED_TO,
+    IN_ONLYDIR,
+    IN_Q_OVERFLOW,
+    Inotify,
+)
+from .manifest import ScanManifest
+from .schema import MonitorResult, MonitorStatus, ScanDelta
+
+logger = logging.getLogger(__name__)
+
+PathLike = str | Path
+
+# Largest number of file entries a directory listing hands over at once
+LISTING_CHUNK_SIZE = 1024
+
+# Arrival (CLOSE_WRITE, MOVED_TO), ongoing writes (CREATE, MODIFY) and removals
+WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+    | IN_DELETE | IN_MOVED_FROM | IN_ONLYDIR
+)
 
-from .schema import MonitorResult, MonitorStatus
 
 class DirectoryMonitor:
     """Monitors directory for files to ingest."""
     
-    def __init__(self, supported_extensions: Set[str] | None = None):
+    def __init__(
+        self,
+        supported_extensions: Set[str] | None = None,
+        recursive: bool = False,
+        include: Iterable[str] | None = None,
+        exclude: Iterable[str] | None = None,
+        max_depth: int | None = None,
+        manifest: ScanManifest | None = None,
+        scan_workers: int = 1,
+        max_in_flight: int | None = None,
+    ):
         """Initialize directory monitor.
         
         Args:
             supported_extensions: Set of supported file extensions (e.g., {'.pdf', '.PDF'})
                                 If None, defaults to {'.pdf', '.PDF'}
+            recursive: Descend into subdirectories
+            include: Glob patterns a file must match to be returned, checked against
+                     both its name and its path relative to the scanned directory
+            exclude: Glob patterns for files and subdirectories to skip. Excluded
+                     directories are not descended into.
+            max_depth: Maximum number of directory levels below the scanned directory
+                       to descend into when ``recursive`` is set. None means unlimited.
+            manifest: Optional scan manifest. When set, ``get_ingestible_files``
+                      returns only files that are new, modified or not yet
+                      successfully processed since the previous scan.
+            scan_workers: Number of threads listing directories concurrently. Values
+                          > 1 help on network filesystems, where each listing
+                          mostly waits on a round trip.
+            max_in_flight: Maximum number of directory listings outstanding at
+                           once, defaults to ``2 * scan_workers``
         """
+        if max_depth is not None and max_depth < 0:
+            raise ValueError(f"max_depth must be >= 0, got {max_depth}")
+        if scan_workers < 1:
+            raise ValueError(f"scan_workers must be >= 1, got {scan_workers}")
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be >= 1, got {max_in_flight}")
         self.supported_extensions = supported_extensions or {'.pdf', '.PDF'}
+        self.recursive = recursive
+        self.include = list(include or [])
+        self.exclude = list(exclude or [])
+        self.max_depth = max_depth
+        self.manifest = manifest
+        self.scan_workers = scan_workers
+        self.max_in_flight = max_in_flight or 2 * scan_workers
+    
+    def _matches(self, patterns: List[str], name: str, relative_path: str) -> bool:
+        return any(fnmatch(name, pattern) or fnmatch(relative_path, pattern) for pattern in patterns)
+    
+    def _matches_filters(self, name: str, relative_path: str) -> bool:
+        if os.path.splitext(name)[1] not in self.supported_extensions:
+            return False
+        if self.include and not self._matches(self.include, name, relative_path):
+            return False
+        return not (self.exclude and self._matches(self.exclude, name, relative_path))
+    
+    def _is_ingestible(self, entry: os.DirEntry, relative_path: str) -> bool:
+        return self._matches_filters(entry.name, relative_path) and entry.is_file()
+    
+    def _list_directory(
+        self,
+        directory: str,
+        relative_dir: str,
+        depth: int,
+        with_stat: bool = False
+    ) -> Iterator[Tuple[str, list]]:
+        """List one directory as a stream of events.
+        
+        Yields ``("files", entries)`` chunks of at most ``LISTING_CHUNK_SIZE``
+        ingestible file entries in listing order, then one
+        ``("subdirectories", items)`` event with the (path, relative prefix,
+        depth) of subdirectories to descend into, sorted by name. Only the
+        subdirectories are held in memory, so a flat directory with millions
+        of files is streamed. Files and directories are told apart by the type
+        cached in each DirEntry, so regular layouts need no per-file stat calls
+        unless ``with_stat`` asks for the file stat to be fetched (and cached
+        on the entry) here.
+        """
+        files: List[os.DirEntry] = []
+        subdirectories: List[Tuple[str, str, int]] = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                relative_path = f"{relative_dir}{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    if self._descends_into(entry.name, relative_path, depth):
+                        subdirectories.append((entry.path, f"{relative_path}/", depth + 1))
+                elif self._is_ingestible(entry, relative_path):
+                    if with_stat:
+                        try:
+                            entry.stat()
+                        except FileNotFoundError:
+                            continue
+                    files.append(entry)
+                    if len(files) >= LISTING_CHUNK_SIZE:
+                        yield "files", files
+                        files = []
+        if files:
+            yield "files", files
+        subdirectories.sort()
+        yield "subdirectories", subdirectories
+    
+    def _walk(
+        self,
+        roots: Sequence[Tuple[str, str, int]],
+        on_directory: Callable[[str, str, int], None] | None = None,
+        workers: int | None = None,
+        with_stat: bool = False
+    ) -> Iterator[Tuple[str, os.DirEntry]]:
+        """Yield (root, DirEntry) pairs for ingestible files below the given roots.
+        
+        Directories are visited breadth first, root by root, in name order,
+        with the files of each directory in listing order, so the output order
+        only depends on the tree. With more than one worker, the next queued
+        directories are listed ahead on a thread pool, with at most
+        ``max_in_flight`` listings outstanding, and consumed in queue order.
+        A listing read ahead is handed over in chunks and waits once one chunk
+        is ready, so memory stays bounded however large a directory is.
+        Symlinked directories are not followed, and a directory reachable from
+        several roots (nested roots) is only listed once, under its own root.
+        Subdirectories that cannot be listed are logged and skipped; an
+        unreadable root raises.
+        
+        Args:
+            roots: (path, relative prefix, depth) of each directory to start from
+            on_directory: Called with (path, relative prefix, depth) just before
+                          each directory is listed
+            workers: Listing threads, defaults to ``scan_workers``
+            with_stat: Fetch the stat of every returned file during listing
+        """
+        workers = workers or self.scan_workers
+        max_in_flight = self.max_in_flight if workers > 1 else 1
+        root_paths = {root[0] for root in roots}
+        queue: Deque[Tuple[str, str, int, str]] = deque()
+        for directory, relative_dir, depth in roots:
+            if all(directory != queued[0] for queued in queue):
+                queue.append((directory, relative_dir, depth, directory))
+        stop = threading.Event()
+        
+        def list_directory(item: Tuple[str, str, int, str]) -> Iterator[Tuple[str, list]]:
+            directory, relative_dir, depth, _ = item
+            if on_directory is not None:
+                on_directory(directory, relative_dir, depth)
+            yield from self._list_directory(directory, relative_dir, depth, with_stat)
+        
+        def read_ahead(item: Tuple[str, str, int, str], channel: "queue_module.Queue") -> None:
+            # Hand the listing over one chunk at a time, until the walk ends
+            def put(event: Tuple[str, object]) -> bool:
+                while not stop.is_set():
+                    try:
+                        channel.put(event, timeout=0.1)
+                        return True
+                    except queue_module.Full:
+                        pass
+                return False
+            
+            try:
+                for event in list_directory(item):
+                    if not put(event):
+                        return
+            except OSError as e:
+                put(("error", e))
+        
+        def received(channel: "queue_module.Queue") -> Iterator[Tuple[str, list]]:
+            while True:
+                kind, payload = channel.get()
+                if kind == "error":
+                    raise payload
+                yield kind, payload
+                if kind == "subdirectories":
+                    return
+        
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ragnostic-scan") if workers > 1 else None
+        in_flight: Deque[Tuple[Tuple[str, str, int, str], Iterator[Tuple[str, list]]]] = deque()
+        try:
+            while queue or in_flight:
+                while queue and len(in_flight) < max_in_flight:
+                    item = queue.popleft()
+                    if executor is None:
+                        in_flight.append((item, list_directory(item)))
+                    else:
+                        channel: queue_module.Queue = queue_module.Queue(maxsize=1)
+                        executor.submit(read_ahead, item, channel)
+                        in_flight.append((item, received(channel)))
+                
+                item, events = in_flight.popleft()
+                directory, _, _, root = item
+                subdirectories: List[Tuple[str, str, int]] = []
+                try:
+                    for kind, payload in events:
+                        if kind == "subdirectories":
+                            subdirectories = payload
+                            continue
+                        for entry in payload:
+                            yield root, entry
+                except OSError:
+                    if directory == root:
+                        raise
+                    logger.warning(f"Skipping unreadable directory: {directory}")
+                    continue
+                
+                for subdirectory in subdirectories:
+                    # Nested roots are walked from their own entry
+                    if subdirectory[0] not in root_paths:
+                        queue.append((*subdirectory, root))
+        finally:
+            stop.set()
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _descends_into(self, name: str, relative_path: str, parent_depth: int) -> bool:
+        max_depth = self.max_depth if self.recursive else 0
+        if max_depth is not None and parent_depth >= max_depth:
+            return False
+        return not (self.exclude and self._matches(self.exclude, name, relative_path))
+    
+    @staticmethod
+    def _resolve_roots(directory: PathLike | Sequence[PathLike]) -> List[Tuple[str, str, int]]:
+        directories = [directory] if isinstance(directory, (str, Path)) else directory
+        return [(str(Path(path).resolve()), "", 0) for path in directories]
+    
+    def iter_ingestible_files(
+        self,
+        directory: PathLike | Sequence[PathLike],
+        batch_size: int = 1000
+    ) -> Iterator[List[Path]]:
+        """Stream ingestible files in batches of at most ``batch_size`` paths.
+        
+        Memory use depends on the batch size and directory fan-out, not on the
+        total number of files in the tree. Paths are absolute: each directory
+        is resolved once and file paths are joined onto it, without resolving
+        individual files. Several directories can be scanned as one
+        deduplicated stream; see :meth:`_walk` for the ordering.
+        
+        Args:
+            directory: Path to directory to scan, or a sequence of them
+            batch_size: Maximum number of paths per yielded batch
+        
+        Raises:
+            FileNotFoundError: If a directory does not exist
+            NotADirectoryError: If a path is not a directory
+            PermissionError: If a directory itself cannot be listed
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+        
+        batch: List[Path] = []
+        for _, entry in self._walk(self._resolve_roots(directory)):
+            batch.append(Path(entry.path))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def watch(
+        self,
+        directory: str | Path,
+        settle_time: float = 0.5,
+        poll_interval: float = 0.1,
+        stop_event: threading.Event | None = None,
+        max_tracked: int = 100_000
+    ) -> Iterator[List[Path]]:
+        """Watch a directory with inotify and yield batches of newly arrived files.
+        
+        Linux only. Each directory (and, with ``recursive``, each subdirectory)
+        is watched before it is listed, and the files found by that initial
+        scan are reconciled into the stream, so nothing that arrives while the
+        watch starts up is missed. After that there are no rescans: files are
+        picked up from CLOSE_WRITE and MOVED_TO events, and new subdirectories
+        are watched and scanned as they appear. If the kernel event queue
+        overflows, the tree is rescanned once.
+        
+        A file is emitted once no event has been seen for it, and its mtime is
+        at least ``settle_time`` seconds old, so files still being written are
+        held back until the writer goes quiet. A file that changes after it was
+        emitted is emitted again. Emitted files are forgotten when they, or a
+        directory above them, are deleted or moved away, and beyond
+        ``max_tracked`` files the least recently emitted are forgotten first.
+        
+        Args:
+            directory: Directory to watch
+            settle_time: Seconds a file must stay unchanged before it is emitted
+            poll_interval: Maximum seconds to wait for events between checks
+            stop_event: Optional event that ends the watch when set. Closing the
+                        generator also ends the watch.
+            max_tracked: Maximum number of emitted files remembered to tell
+                         changed files from unchanged ones
+        
+        Raises:
+            NotImplementedError: If inotify is not available on this platform
+            FileNotFoundError: If the directory does not exist
+            NotADirectoryError: If the path is not a directory
+            PermissionError: If the directory itself cannot be listed
+        """
+        if max_tracked < 1:
+            raise ValueError(f"max_tracked must be >= 1, got {max_tracked}")
+        root = Path(directory).resolve()
+        watched: Dict[int, Tuple[str, str, int]] = {}
+        # Last activity time (monotonic) of candidate files, 0.0 for scanned files
+        pending: Dict[str, float] = {}
+        # (size, mtime_ns) of files already emitted
+        emitted: Dict[str, Tuple[int, int]] = {}
+        
+        with Inotify() as inotify:
+            def add_watch(path: str, relative_dir: str, depth: int) -> None:
+                watched[inotify.add_watch(path, WATCH_MASK)] = (path, relative_dir, depth)
+            
+            def scan(path: str, relative_dir: str, depth: int) -> None:
+                for _, entry in self._walk([(path, relative_dir, depth)], on_directory=add_watch, workers=1):
+                    pending.setdefault(entry.path, 0.0)
+            
+            scan(str(root), "", 0)
+            while stop_event is None or not stop_event.is_set():
+                ready = self._settled_files(pending, emitted, settle_time, max_tracked)
+                if ready:
+                    yield ready
+                
+                for event in inotify.read_events(poll_interval):
+                    if event.mask & IN_Q_OVERFLOW:
+                        logger.warning(f"Event queue overflowed, rescanning: {root}")
+                        scan(str(root), "", 0)
+                        continue
+                    if event.mask & IN_IGNORED:
+                        watched.pop(event.wd, None)
+                        continue
+                    if event.wd not in watched:
+                        continue
+                    
+                    parent, relative_dir, depth = watched[event.wd]
+                    path = os.path.join(parent, event.name)
+                    relative_path = f"{relative_dir}{event.name}"
+                    if event.mask & IN_ISDIR:
+                        if event.mask & (IN_CREATE | IN_MOVED_TO) and self._descends_into(event.name, relative_path, depth):
+                            try:
+                                scan(path, f"{relative_path}/", depth + 1)
+                            except OSError:
+                                logger.warning(f"Skipping unreadable directory: {path}")
+                        elif event.mask & (IN_DELETE | IN_MOVED_FROM):
+                            prefix = path + os.sep
+                            for tracked in (pending, emitted):
+                                for stale in [tracked_path for tracked_path in tracked if tracked_path.startswith(prefix)]:
+                                    del tracked[stale]
+                    elif event.mask & (IN_DELETE | IN_MOVED_FROM):
+                        pending.pop(path, None)
+                        emitted.pop(path, None)
+                    elif self._matches_filters(event.name, relative_path):
+                        pending[path] = time.monotonic()
+    
+    @staticmethod
+    def _settled_files(
+        pending: Dict[str, float],
+        emitted: Dict[str, Tuple[int, int]],
+        settle_time: float,
+        max_tracked: int
+    ) -> List[Path]:
+        """Move files that have been quiet for ``settle_time`` out of ``pending``.
+        
+        ``emitted`` is kept in emission order and trimmed to ``max_tracked`` entries.
+        """
+        now = time.monotonic()
+        wall_now = time.time()
+        ready: List[Path] = []
+        for path, last_event in list(pending.items()):
+            if now - last_event < settle_time:
+                continue
+            try:
+                stat_result = os.stat(path)
+            except OSError:
+                del pending[path]
+                continue
+            if not stat.S_ISREG(stat_result.st_mode):
+                del pending[path]
+                continue
+            if wall_now - stat_result.st_mtime < settle_time:
+                continue
+            
+            del pending[path]
+            fingerprint = (stat_result.st_size, stat_result.st_mtime_ns)
+            if emitted.pop(path, None) != fingerprint:
+                ready.append(Path(path))
+            emitted[path] = fingerprint
+        while len(emitted) > max_tracked:
+            del emitted[next(iter(emitted))]
+        return sorted(ready)
     
-    def get_ingestible_files(self, directory: str | Path) -> MonitorResult:
+    def _scan_delta(self, roots: List[Tuple[str, str, int]]) -> MonitorResult:
+        """Walk the roots and compare each one's files with the scan manifest."""
+        file_states: Dict[str, List[Tuple[Path, int, int]]] = {root: [] for root, _, _ in roots}
+        for root, entry in self._walk(roots, with_stat=True):
+            stat_result = entry.stat()
+            file_states[root].append((Path(entry.path), stat_result.st_size, stat_result.st_mtime_ns))
+        
+        delta = ScanDelta()
+        for root, files in file_states.items():
+            root_delta = self.manifest.apply_scan(Path(root), files)
+            delta.new_files += root_delta.new_files
+            delta.modified_files += root_delta.modified_files
+            delta.pending_files += root_delta.pending_files
+            delta.deleted_files += root_delta.deleted_files
+            delta.unchanged_count += root_delta.unchanged_count
+        return MonitorResult(
+            status=MonitorStatus.MONITORING,
+            files=delta.changed_files,
+            delta=delta,
+        )
+    
+    def get_ingestible_files(self, directory: PathLike | Sequence[PathLike]) -> MonitorResult:
         """Check directory for files that can be ingested.
         
+        With a scan manifest only the files that changed since the last scan
+        are returned, see :class:`ScanManifest`.
+        
         Args:
-            directory: Path to directory to monitor
+            directory: Path to directory to monitor, or a sequence of directories
+                       to scan as one deduplicated, deterministically ordered set
         
         Returns:
             MonitorResult containing status and any found files
         """
-        path = Path(directory)
-        
-        # Validate directory exists
-        if not path.exists():
-            return MonitorResult(
-                status=MonitorStatus.ERROR,
-                error_message=f"Directory does not exist: {directory}"
-            )
-        
-        # Validate it's actually a directory
-        if not path.is_dir():
-            return MonitorResult(
-                status=MonitorStatus.ERROR,
-                error_message=f"Path is not a directory: {directory}"
-            )
+        directories = [directory] if isinstance(directory, (str, Path)) else list(directory)
+        for directory in directories:
+            path = Path(directory)
+            
+            # Validate directory exists
+            if not path.exists():
+                return MonitorResult(
+                    status=MonitorStatus.ERROR,
+                    error_message=f"Directory does not exist: {directory}"
+                )
+            
+            # Validate it's actually a directory
+            if not path.is_dir():
+                return MonitorResult(
+                    status=MonitorStatus.ERROR,
+                    error_message=f"Path is not a directory: {directory}"
+                )
         
         # Get all files with supported extensions
         found_files: List[Path] = []
         
         try:
-            for file_path in path.iterdir():
-                if file_path.suffix in self.supported_extensions:
-                    found_files.append(file_path.resolve())
-        except PermissionError:
+            if self.manifest is not None:
+                return self._scan_delta(self._resolve_roots(directories))
+            for batch in self.iter_ingestible_files(directories):
+                found_files.extend(batch)
+        except PermissionError as e:
             return MonitorResult(
                 status=MonitorStatus.ERROR,
-                error_message=f"Permission denied accessing directory: {directory}"
+                error_message=f"Permission denied accessing directory: {e.filename or directory}"
             )
         except Exception as e:
             return MonitorResult(
@@ -65,4 +505,4 @@ class DirectoryMonitor:
         return MonitorResult(
             status=MonitorStatus.MONITORING,
             files=found_files
-        )
\ No newline at end of file
+        )
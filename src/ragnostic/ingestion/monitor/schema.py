@@ -10,6 +10,27 @@ class MonitorStatus(str, Enum):
     MONITORING = "monitoring"
     ERROR = "error"
 
+class ScanOutcome(str, Enum):
+    """Outcome of ingesting a scanned file, recorded in the scan manifest."""
+    INGESTED = "ingested"
+    REJECTED = "rejected"
+    FAILED = "failed"
+
+class ScanDelta(BaseModel):
+    """Changes found by comparing a directory scan with the scan manifest."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    
+    new_files: List[Path] = Field(default_factory=list)
+    modified_files: List[Path] = Field(default_factory=list)
+    pending_files: List[Path] = Field(default_factory=list, description="Unchanged files without a final outcome")
+    deleted_files: List[Path] = Field(default_factory=list)
+    unchanged_count: int = 0
+
+    @property
+    def changed_files(self) -> List[Path]:
+        """Files that need to go through ingestion."""
+        return self.new_files + self.modified_files + self.pending_files
+
 class MonitorResult(BaseModel):
     """Result of monitoring a directory for files to ingest."""
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -17,6 +38,7 @@ class MonitorResult(BaseModel):
     status: MonitorStatus
     files: List[Path] = Field(default_factory=list)
     error_message: str | None = None
+    delta: ScanDelta | None = Field(default=None, description="Scan delta when a manifest is used")
 
     @property
     def has_files(self) -> bool:
@@ -1,10 +1,24 @@
 """Document processor package."""
+from .backends import LocalBackend, S3Backend, StorageBackend
+from .cas import ContentAddressedStore
+from .compression import ColdStorageMigrator, open_document
+from .durability import GroupCommitter
 from .processor import DocumentProcessor
-from .schema import ProcessingResult, BatchProcessingResult, ProcessingStatus
+from .schema import ProcessingResult, BatchProcessingResult, ProcessingStatus, StorageLayout, StorageStrategy, StoredObject
 
 __all__ = [
+    "ColdStorageMigrator",
+    "ContentAddressedStore",
     "DocumentProcessor",
+    "GroupCommitter",
+    "LocalBackend",
     "ProcessingResult", 
     "BatchProcessingResult",
-    "ProcessingStatus"
+    "ProcessingStatus",
+    "S3Backend",
+    "StorageBackend",
+    "StorageLayout",
+    "StorageStrategy",
+    "StoredObject",
+    "open_document",
 ]
\ No newline at end of file
@@ -0,0 +1,339 @@
+"""Pluggable storage backends for processed documents."""
+import hashlib
+import os
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Deque, Dict, List, Optional
+
+from ragnostic.ingestion.iopolicy import IOPolicy
+
+from .compression import open_document, stored_path
+from .durability import DirectorySyncError, publish
+from .schema import StorageStrategy, StoredObject
+from .storage import ContentMismatchError, discard_staged, place_file, temp_path_for
+
+try:
+    import boto3
+    from botocore.config import Config
+    from botocore.exceptions import ClientError
+except ImportError:  # pragma: no cover - optional dependency
+    boto3 = None
+
+# S3 rejects multipart parts smaller than 5 MiB, except the last
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_UPLOAD_CONCURRENCY = 8
+
+
+class StorageBackend(ABC):
+    """Where processed documents are stored.
+
+    Documents are addressed by key, a relative path such as ``DOC_x1y2.pdf``.
+    Implementations hash the bytes they write, so ``put`` can verify content
+    against the hash computed during validation without a second read.
+    """
+
+    @abstractmethod
+    def put(self, source_path: Path, key: str, expected_hash: Optional[str] = None) -> StoredObject:
+        """Store a local file under ``key``.
+
+        Raises:
+            ContentMismatchError: If the written bytes do not match ``expected_hash``;
+                                  nothing is stored in that case
+            OSError: If the source cannot be read or the write fails
+        """
+
+    @abstractmethod
+    def open(self, key: str) -> BinaryIO:
+        """Open a stored document as a sequential stream."""
+
+    @abstractmethod
+    def read_range(self, key: str, offset: int, length: int) -> bytes:
+        """Read ``length`` bytes of a stored document starting at ``offset``."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Whether a document is stored under ``key``."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Delete a stored document, ignoring keys that do not exist."""
+
+    @abstractmethod
+    def uri(self, key: str) -> str:
+        """Location of a stored document, as recorded in the database."""
+
+    def close(self) -> None:
+        """Release pooled resources."""
+
+    def __enter__(self) -> "StorageBackend":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class LocalBackend(StorageBackend):
+    """Backend on a local directory, using the placement strategies of ``store_document``."""
+
+    def __init__(
+        self,
+        root: Path,
+        strategy: StorageStrategy = StorageStrategy.COPY,
+        io_policy: IOPolicy = IOPolicy.DEFAULT,
+        durable: bool = False
+    ):
+        """Initialize the backend.
+
+        Args:
+            root: Directory documents are stored in
+            strategy: How documents are placed, see ``store_document``
+            io_policy: Page-cache policy for copies
+            durable: Sync each stored document before ``put`` returns
+        """
+        self.root = Path(root)
+        self.strategy = StorageStrategy(strategy)
+        self.io_policy = IOPolicy(io_policy)
+        self.durable = durable
+
+    def path(self, key: str) -> Path:
+        """Local path of a key."""
+        return self.root / key
+
+    def put(self, source_path: Path, key: str, expected_hash: Optional[str] = None) -> StoredObject:
+        dest_path = self.path(key)
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = temp_path_for(dest_path)
+        strategy = self.strategy
+        try:
+            strategy, file_hash = place_file(
+                source_path, temp_path, strategy,
+                hash_known=expected_hash is not None, io_policy=self.io_policy
+            )
+            if file_hash is not None and expected_hash is not None and file_hash != expected_hash:
+                raise ContentMismatchError(expected_hash, file_hash)
+            if self.durable:
+                try:
+                    publish(temp_path, dest_path)
+                except DirectorySyncError:
+                    # The document is in place, only the rename may not survive a crash
+                    pass
+            else:
+                os.replace(temp_path, dest_path)
+        except BaseException:
+            discard_staged(temp_path, source_path, strategy)
+            raise
+        return StoredObject(
+            key=key,
+            uri=self.uri(key),
+            size_bytes=dest_path.stat().st_size,
+            file_hash=file_hash or expected_hash,
+            storage_path=dest_path,
+            storage_strategy=strategy,
+        )
+
+    def open(self, key: str) -> BinaryIO:
+        return open_document(self.path(key))
+
+    def read_range(self, key: str, offset: int, length: int) -> bytes:
+        with self.open(key) as reader:
+            if reader.seekable():
+                reader.seek(offset)
+            else:
+                reader.read(offset)
+            return reader.read(length)
+
+    def exists(self, key: str) -> bool:
+        return stored_path(self.path(key)).exists()
+
+    def delete(self, key: str) -> None:
+        stored_path(self.path(key)).unlink(missing_ok=True)
+
+    def uri(self, key: str) -> str:
+        return str(self.path(key))
+
+
+class S3Backend(StorageBackend):
+    """Backend on an S3-compatible object store.
+
+    Documents are streamed straight from their source file: files up to
+    ``part_size`` go up in one request, larger ones as a multipart upload
+    whose parts are sent in parallel while later parts are still being read
+    and hashed. At most ``max_concurrency`` parts are in flight per document,
+    which bounds memory to ``part_size * max_concurrency``. Parts of all
+    documents share one thread pool and the client's connection pool, so
+    concurrent processor workers reuse connections.
+
+    A multipart upload is only completed once the document's hash has been
+    checked, and is aborted on any failure, so no partial object is ever
+    visible. Objects carry their SHA-256 as ``sha256`` metadata when it is
+    known before the upload starts: always for single-request uploads, and for
+    multipart uploads given ``expected_hash``. Without one, the hash of a
+    multipart upload is only known after its last part, while S3 metadata is
+    fixed when the upload is created. Such objects get no metadata unless
+    ``record_hash_metadata`` is set, which copies each one onto itself on the
+    server and so rewrites the whole object.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        client: Optional[Any] = None,
+        endpoint_url: Optional[str] = None,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+        record_hash_metadata: bool = False
+    ):
+        """Initialize the backend.
+
+        Args:
+            bucket: Bucket documents are stored in
+            prefix: Key prefix, e.g. ``"documents/"``
+            client: boto3 S3 client to use. By default one is created with a
+                    connection pool sized to ``max_concurrency``.
+            endpoint_url: Endpoint of an S3-compatible service such as MinIO
+            part_size: Bytes per multipart part
+            max_concurrency: Parts uploaded in parallel
+            record_hash_metadata: Add ``sha256`` metadata to multipart uploads
+                                  without ``expected_hash`` with a server-side
+                                  self-copy of the completed object
+
+        Raises:
+            ImportError: If boto3 is not installed
+            ValueError: If part_size is below the S3 minimum or max_concurrency < 1
+        """
+        if boto3 is None:
+            raise ImportError("The S3 storage backend requires the 'boto3' package")
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"part_size must be >= {MIN_PART_SIZE}, got {part_size}")
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+        self.bucket = bucket
+        self.prefix = prefix
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
+        self.record_hash_metadata = record_hash_metadata
+        self.client = client or boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            config=Config(max_pool_connections=max_concurrency, retries={"mode": "adaptive"}),
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="ragnostic-upload")
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def put(self, source_path: Path, key: str, expected_hash: Optional[str] = None) -> StoredObject:
+        sha256_hash = hashlib.sha256()
+        with open(source_path, "rb") as source:
+            size = os.fstat(source.fileno()).st_size
+            if size <= self.part_size:
+                data = source.read()
+                sha256_hash.update(data)
+                file_hash = self._verify(sha256_hash, expected_hash)
+                self.client.put_object(
+                    Bucket=self.bucket,
+                    Key=self._key(key),
+                    Body=data,
+                    Metadata={"sha256": file_hash},
+                )
+            else:
+                file_hash = self._multipart_upload(source, key, sha256_hash, expected_hash)
+        return StoredObject(key=key, uri=self.uri(key), size_bytes=size, file_hash=file_hash)
+
+    @staticmethod
+    def _verify(sha256_hash: "hashlib._Hash", expected_hash: Optional[str]) -> str:
+        file_hash = sha256_hash.hexdigest()
+        if expected_hash is not None and file_hash != expected_hash:
+            raise ContentMismatchError(expected_hash, file_hash)
+        return file_hash
+
+    def _multipart_upload(
+        self,
+        source: BinaryIO,
+        key: str,
+        sha256_hash: "hashlib._Hash",
+        expected_hash: Optional[str]
+    ) -> str:
+        metadata = {"sha256": expected_hash} if expected_hash else {}
+        upload_id = self.client.create_multipart_upload(
+            Bucket=self.bucket, Key=self._key(key), Metadata=metadata
+        )["UploadId"]
+        in_flight: Deque[Future] = deque()
+        parts: List[Dict[str, Any]] = []
+        try:
+            part_number = 0
+            while data := source.read(self.part_size):
+                sha256_hash.update(data)
+                part_number += 1
+                in_flight.append(self._executor.submit(self._upload_part, key, upload_id, part_number, data))
+                if len(in_flight) >= self.max_concurrency:
+                    parts.append(in_flight.popleft().result())
+            while in_flight:
+                parts.append(in_flight.popleft().result())
+            file_hash = self._verify(sha256_hash, expected_hash)
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self._key(key),
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            for future in in_flight:
+                future.cancel()
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=self._key(key), UploadId=upload_id)
+            raise
+        if not expected_hash and self.record_hash_metadata:
+            # The hash was only known once every part was read; object metadata
+            # is immutable, so copy the object onto itself to record it
+            self.client.copy(
+                {"Bucket": self.bucket, "Key": self._key(key)},
+                self.bucket,
+                self._key(key),
+                ExtraArgs={"Metadata": {"sha256": file_hash}, "MetadataDirective": "REPLACE"},
+            )
+        return file_hash
+
+    def _upload_part(self, key: str, upload_id: str, part_number: int, data: bytes) -> Dict[str, Any]:
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=self._key(key),
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+
+    def open(self, key: str) -> BinaryIO:
+        return self.client.get_object(Bucket=self.bucket, Key=self._key(key))["Body"]
+
+    def read_range(self, key: str, offset: int, length: int) -> bytes:
+        if length <= 0:
+            return b""
+        response = self.client.get_object(
+            Bucket=self.bucket,
+            Key=self._key(key),
+            Range=f"bytes={offset}-{offset + length - 1}",
+        )
+        return response["Body"].read()
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+    def uri(self, key: str) -> str:
+        return f"s3://{self.bucket}/{self._key(key)}"
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
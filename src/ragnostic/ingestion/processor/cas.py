@@ -0,0 +1,291 @@
+"""Content-addressed document storage."""
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from ragnostic.db.client import DatabaseClient
+from ragnostic.ingestion.iopolicy import IOPolicy
+from ragnostic.ingestion.validation.checks import compute_file_hash
+
+from .schema import ProcessingResult, ProcessingStatus, StorageStrategy
+from .compression import compressed_path, is_compressed, stored_path
+from .durability import DirectorySyncError, publish
+from .storage import (
+    check_storage_locations,
+    discard_staged,
+    hash_mismatch,
+    place_file,
+    storage_error,
+    temp_path_for,
+)
+
+# Blobs live at <root>/ab/cd/<sha256><suffix>: two levels of 256-way fan-out
+SHARD_LEVELS = 2
+SHARD_WIDTH = 2
+
+
+class ContentAddressedStore:
+    """Blob store that keeps each distinct document once, addressed by its SHA-256.
+
+    Blobs are sharded two levels deep on the leading hex digits of the hash, so
+    no directory grows past a few thousand entries even at millions of
+    documents. Document IDs map to blobs through the ``documents`` table: a
+    document's ``file_hash`` names its blob, which makes lookups and deletes a
+    primary-key query plus one path computation.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        strategy: StorageStrategy = StorageStrategy.COPY,
+        db_client: Optional[DatabaseClient] = None,
+        io_policy: IOPolicy = IOPolicy.DEFAULT
+    ):
+        """Initialize the store.
+
+        Args:
+            root: Directory holding the blob shards
+            strategy: How new blobs are placed, see ``store_document``
+            db_client: Database client used to map document IDs to blobs
+            io_policy: Page-cache policy for copying and hashing blobs
+        """
+        self.root = Path(root)
+        self.strategy = StorageStrategy(strategy)
+        self.db_client = db_client
+        self.io_policy = IOPolicy(io_policy)
+
+    def blob_path(self, file_hash: str, suffix: str = ".pdf") -> Path:
+        """Path of the blob for a content hash."""
+        shards = [file_hash[i * SHARD_WIDTH:(i + 1) * SHARD_WIDTH] for i in range(SHARD_LEVELS)]
+        return self.root.joinpath(*shards, f"{file_hash}{suffix.lower()}")
+
+    def blob_directories(self, blob_path: Path) -> List[Path]:
+        """Directories whose entries must be synced for a new blob to survive a crash."""
+        return list(blob_path.parents)[:SHARD_LEVELS] + [self.root]
+
+    def stage(
+        self,
+        source_path: Path,
+        doc_id: str,
+        file_hash: Optional[str] = None
+    ) -> Tuple[ProcessingResult, Optional[Path]]:
+        """Write a document's content under a temporary name, ready to publish as its blob.
+
+        When the hash is not known up front the source is hashed while it is
+        copied, rather than read twice. A copy that does not match
+        ``file_hash`` is rejected. When the blob already exists nothing is
+        written, and with the ``move`` strategy the source is removed. A blob
+        found only in the compressed cold tier is written again uncompressed,
+        since it is in use again; the next migration pass replaces the cold copy.
+
+        Args:
+            source_path: Path to source document
+            doc_id: Generated document ID
+            file_hash: SHA-256 of the source if already known, e.g. from validation
+
+        Returns:
+            The result, whose storage_path is the blob, and the temporary path
+            holding the content. The temporary path is None when there is
+            nothing to publish: on failure, or when the blob already existed.
+        """
+        result = ProcessingResult(
+            doc_id=doc_id,
+            original_path=source_path,
+            status=ProcessingStatus.SUCCESS
+        )
+        invalid = check_storage_locations(result, self.root)
+        if invalid is not None:
+            return invalid, None
+
+        try:
+            if file_hash is not None:
+                blob_path = self.blob_path(file_hash, source_path.suffix)
+                if blob_path.exists():
+                    return self._reuse_blob(result, source_path, blob_path, file_hash), None
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = temp_path_for(blob_path)
+            else:
+                temp_path = self.root / f".incoming.{uuid.uuid4().hex}.tmp"
+
+            try:
+                strategy, written_hash = place_file(
+                    source_path, temp_path, self.strategy,
+                    hash_known=file_hash is not None, io_policy=self.io_policy
+                )
+                if file_hash is None:
+                    file_hash = written_hash or compute_file_hash(temp_path, io_policy=self.io_policy)
+                    if file_hash is None:
+                        discard_staged(temp_path, source_path, self.strategy)
+                        return result.model_copy(update={
+                            "status": ProcessingStatus.STORAGE_ERROR,
+                            "error_message": f"Unable to hash source file: {source_path}",
+                            "error_code": "HASH_FAILED"
+                        }), None
+                    blob_path = self.blob_path(file_hash, source_path.suffix)
+                    if blob_path.exists():
+                        temp_path.unlink()
+                        return self._reuse_blob(result, source_path, blob_path, file_hash), None
+                    blob_path.parent.mkdir(parents=True, exist_ok=True)
+                elif written_hash is not None and written_hash != file_hash:
+                    temp_path.unlink()
+                    return hash_mismatch(result, file_hash, written_hash), None
+            except BaseException:
+                discard_staged(temp_path, source_path, self.strategy)
+                raise
+        except Exception as e:
+            return storage_error(result, e), None
+
+        return result.model_copy(update={
+            "storage_path": blob_path,
+            "storage_strategy": strategy,
+            "file_hash": file_hash
+        }), temp_path
+
+    def store(
+        self,
+        source_path: Path,
+        doc_id: str,
+        file_hash: Optional[str] = None,
+        durable: bool = False
+    ) -> ProcessingResult:
+        """Store a document's content, reusing the existing blob for identical content.
+
+        The blob is staged with :meth:`stage` and renamed into place, so a blob
+        path only ever holds complete content. With the ``move`` strategy the
+        source is removed even when the blob already existed.
+
+        Args:
+            source_path: Path to source document
+            doc_id: Generated document ID
+            file_hash: SHA-256 of the source if already known, e.g. from validation
+            durable: Sync a new blob and its shard directories before returning
+
+        Returns:
+            ProcessingResult whose storage_path is the blob
+        """
+        result, temp_path = self.stage(source_path, doc_id, file_hash)
+        if temp_path is None:
+            return result
+
+        blob_path = result.storage_path
+        try:
+            if durable:
+                publish(temp_path, blob_path, self.blob_directories(blob_path))
+            else:
+                os.replace(temp_path, blob_path)
+        except DirectorySyncError:
+            # The blob is in place, only its directory entries may not survive a crash
+            return result
+        except Exception as e:
+            discard_staged(temp_path, source_path, self.strategy)
+            return storage_error(result.model_copy(update={"storage_path": None}), e)
+        return result.model_copy(update={"durable": durable})
+
+    def _reuse_blob(
+        self,
+        result: ProcessingResult,
+        source_path: Path,
+        blob_path: Path,
+        file_hash: str
+    ) -> ProcessingResult:
+        """Point a result at an existing blob, removing a moved source."""
+        if self.strategy == StorageStrategy.MOVE:
+            source_path.unlink(missing_ok=True)
+        return result.model_copy(update={"storage_path": blob_path, "file_hash": file_hash})
+
+    def _require_db(self) -> DatabaseClient:
+        if self.db_client is None:
+            raise ValueError("A database client is required to map documents to blobs")
+        return self.db_client
+
+    def get_blob_path(self, doc_id: str) -> Optional[Path]:
+        """Path of a document's blob, or None if the document is unknown.
+
+        Resolves to the compressed blob once the document is in the cold tier.
+        """
+        document = self._require_db().get_document_by_id(doc_id)
+        if document is None:
+            return None
+        return stored_path(self.blob_path(document.file_hash, Path(document.raw_file_path).suffix))
+
+    def iter_blobs(self) -> Iterator[Path]:
+        """Yield the path of every blob in the store."""
+        directories = [(str(self.root), 0)]
+        while directories:
+            directory, level = directories.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    if level < SHARD_LEVELS and entry.is_dir(follow_symlinks=False):
+                        directories.append((entry.path, level + 1))
+                    elif level == SHARD_LEVELS and entry.is_file(follow_symlinks=False):
+                        yield Path(entry.path)
+
+    @staticmethod
+    def _blob_hash(blob_path: Path) -> str:
+        """Content hash named by a blob path, in either storage tier."""
+        return blob_path.name.split(".", 1)[0]
+
+    def _remove_blob(self, blob_path: Path) -> None:
+        """Delete a blob, in both tiers, and any shard directories left empty."""
+        hot_path = blob_path.with_suffix("") if is_compressed(blob_path) else blob_path
+        hot_path.unlink(missing_ok=True)
+        compressed_path(hot_path).unlink(missing_ok=True)
+        for shard in list(blob_path.parents)[:SHARD_LEVELS]:
+            try:
+                shard.rmdir()
+            except OSError:
+                break
+
+    def delete_document(self, doc_id: str) -> bool:
+        """Delete a document record and its blob.
+
+        Returns:
+            True if the document existed
+        """
+        blob_path = self.get_blob_path(doc_id)
+        if blob_path is None:
+            return False
+        self.db_client.delete_document(doc_id)
+        self._remove_blob(blob_path)
+        return True
+
+    def remove_orphans(self, min_age: float = 3600.0, batch_size: int = 500) -> List[Path]:
+        """Delete blobs that no document references.
+
+        Blobs are checked against the ``documents`` table in batches. Blobs
+        younger than ``min_age`` seconds are kept, since they may belong to a
+        document that is still being indexed.
+
+        Returns:
+            Paths of the removed blobs
+        """
+        db_client = self._require_db()
+        cutoff = time.time() - min_age
+        removed: List[Path] = []
+
+        def sweep(batch: List[Path]) -> None:
+            referenced = db_client.get_documents_by_hashes([self._blob_hash(path) for path in batch])
+            for path in batch:
+                if self._blob_hash(path) not in referenced:
+                    self._remove_blob(path)
+                    removed.append(path)
+
+        batch: List[Path] = []
+        for blob_path in self.iter_blobs():
+            try:
+                # ctime, since copies keep the source's mtime
+                if blob_path.stat().st_ctime > cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+            batch.append(blob_path)
+            if len(batch) >= batch_size:
+                sweep(batch)
+                batch = []
+        if batch:
+            sweep(batch)
+        return removed
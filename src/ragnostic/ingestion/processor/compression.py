@@ -0,0 +1,201 @@
+"""Compressed cold storage tier for stored documents."""
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from shutil import copystat
+from typing import BinaryIO, Iterator, List, Optional
+
+from .durability import publish
+from .storage import temp_path_for
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSED_SUFFIX = ".zst"
+# Cold documents are written once and read rarely, so favour ratio over speed
+DEFAULT_COMPRESSION_LEVEL = 12
+# Keep the original when compression saves less than this fraction
+DEFAULT_MIN_SAVINGS = 0.05
+# Documents stored longer ago than this are considered cold
+DEFAULT_MIN_AGE = 30 * 24 * 3600.0
+
+
+def _require_zstandard():
+    if zstandard is None:
+        raise ImportError("The compressed storage tier requires the 'zstandard' package")
+    return zstandard
+
+
+def is_compressed(path: Path) -> bool:
+    """Whether a path names a compressed blob."""
+    return Path(path).suffix == COMPRESSED_SUFFIX
+
+
+def compressed_path(path: Path) -> Path:
+    """Path of the compressed blob for a stored document, e.g. ``DOC.pdf.zst``."""
+    path = Path(path)
+    return path.with_name(f"{path.name}{COMPRESSED_SUFFIX}")
+
+
+def stored_path(path: Path) -> Path:
+    """Path that currently holds a stored document.
+
+    Documents keep their original storage path in the database after moving
+    to the cold tier; this resolves it to the compressed blob when only that
+    exists.
+    """
+    path = Path(path)
+    if not is_compressed(path) and not path.exists():
+        compressed = compressed_path(path)
+        if compressed.exists():
+            return compressed
+    return path
+
+
+def open_document(path: Path) -> BinaryIO:
+    """Open a stored document for reading, decompressing cold blobs on the fly.
+
+    Accepts the document's original storage path or its compressed blob. The
+    returned reader is sequential: consumers that need random access, such as
+    PDF parsers, read it fully.
+
+    Raises:
+        FileNotFoundError: If the document is in neither tier
+        ImportError: If the document is compressed and zstandard is missing
+    """
+    path = stored_path(path)
+    if not is_compressed(path):
+        return open(path, "rb")
+    zstd = _require_zstandard()
+    return zstd.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+
+
+def compress_document(
+    path: Path,
+    level: int = DEFAULT_COMPRESSION_LEVEL,
+    min_savings: float = DEFAULT_MIN_SAVINGS
+) -> Optional[Path]:
+    """Move a stored document to the cold tier.
+
+    The compressed blob is written under a temporary name, synced and renamed
+    into place before the original is removed, so a crash leaves the
+    document in at least one tier.
+
+    Args:
+        path: Stored document
+        level: zstd compression level
+        min_savings: Minimum fraction of space saved for the compressed blob to be kept
+
+    Returns:
+        Path of the compressed blob, or None if compression did not save
+        enough and the original was kept
+    """
+    zstd = _require_zstandard()
+    path = Path(path)
+    dest_path = compressed_path(path)
+    temp_path = temp_path_for(dest_path)
+    size = path.stat().st_size
+    try:
+        with open(path, "rb") as source, open(temp_path, "wb") as dest:
+            compressor = zstd.ZstdCompressor(level=level, write_checksum=True)
+            _, written = compressor.copy_stream(source, dest, size=size)
+        if written > size * (1 - min_savings):
+            temp_path.unlink()
+            return None
+        copystat(path, temp_path)
+        publish(temp_path, dest_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    path.unlink()
+    return dest_path
+
+
+class ColdStorageMigrator:
+    """Background job that moves documents older than ``min_age`` to the cold tier.
+
+    Works on both storage layouts. Age is measured from when a document was
+    stored (its ctime), since copies keep the source's mtime. Call
+    :meth:`migrate` for a single pass or :meth:`run` to repeat passes until
+    stopped.
+    """
+
+    def __init__(
+        self,
+        storage_dir: Path,
+        min_age: float = DEFAULT_MIN_AGE,
+        level: int = DEFAULT_COMPRESSION_LEVEL,
+        min_savings: float = DEFAULT_MIN_SAVINGS
+    ):
+        """Initialize the migrator.
+
+        Args:
+            storage_dir: Directory holding stored documents
+            min_age: Seconds since storage after which a document is migrated
+            level: zstd compression level
+            min_savings: Minimum fraction of space saved for a blob to be kept
+        """
+        _require_zstandard()
+        self.storage_dir = Path(storage_dir)
+        self.min_age = min_age
+        self.level = level
+        self.min_savings = min_savings
+        # Documents that did not compress well are not retried by later passes
+        self._incompressible: set = set()
+
+    def iter_candidates(self) -> Iterator[Path]:
+        """Yield uncompressed documents old enough to migrate."""
+        cutoff = time.time() - self.min_age
+        directories = [str(self.storage_dir)]
+        while directories:
+            with os.scandir(directories.pop()) as entries:
+                for entry in entries:
+                    # Temporary and staged files are hidden
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        directories.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False) and not entry.name.endswith(COMPRESSED_SUFFIX):
+                        try:
+                            if entry.stat(follow_symlinks=False).st_ctime > cutoff:
+                                continue
+                        except FileNotFoundError:
+                            continue
+                        if entry.path not in self._incompressible:
+                            yield Path(entry.path)
+
+    def migrate(self) -> List[Path]:
+        """Compress every cold document once.
+
+        Returns:
+            Paths of the compressed blobs written
+        """
+        migrated: List[Path] = []
+        for path in self.iter_candidates():
+            try:
+                blob_path = compress_document(path, level=self.level, min_savings=self.min_savings)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.error(f"Failed to compress {path}: {e}")
+                continue
+            if blob_path is None:
+                self._incompressible.add(str(path))
+            else:
+                migrated.append(blob_path)
+        return migrated
+
+    def run(self, interval: float = 3600.0, stop_event: Optional[threading.Event] = None) -> None:
+        """Migrate cold documents every ``interval`` seconds until ``stop_event`` is set."""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            migrated = self.migrate()
+            if migrated:
+                logger.info(f"Moved {len(migrated)} documents to cold storage")
+            stop_event.wait(interval)
@@ -0,0 +1,191 @@
+"""Crash-safe publishing of stored files with group-commit fsync."""
+import os
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Flush a group once this many files are waiting
+DEFAULT_SYNC_BATCH_SIZE = 64
+# ... or once the oldest waiting file is this many milliseconds old
+DEFAULT_SYNC_INTERVAL_MS = 50.0
+
+
+class DirectorySyncError(OSError):
+    """A file was renamed to its final name, but a directory could not be synced.
+
+    The file is complete and in place; only the rename may not survive a crash.
+    """
+
+
+def fsync_file(path: Path) -> None:
+    """Flush a file's data and metadata to stable storage."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fdatasync_file(path: Path) -> None:
+    """Flush a file's data, and the metadata needed to read it back, to stable storage."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        getattr(os, "fdatasync", os.fsync)(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_directory(path: Path) -> None:
+    """Flush a directory so the entries created or renamed in it survive a crash."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def publish(temp_path: Path, dest_path: Path, directories: Iterable[Path] = ()) -> None:
+    """Durably rename a fully written temporary file to its final name.
+
+    The file is synced before the rename, so after a crash its final name
+    holds either nothing or the complete content; the directories are synced
+    after it, so the rename itself survives.
+
+    Raises:
+        DirectorySyncError: If the file was published but a directory sync failed
+        OSError: If the file could not be synced or renamed; it stays at ``temp_path``
+    """
+    fsync_file(temp_path)
+    os.replace(temp_path, dest_path)
+    for directory in {dest_path.parent, *directories}:
+        try:
+            fsync_directory(directory)
+        except OSError as e:
+            raise DirectorySyncError(e.errno, e.strerror, str(directory)) from e
+
+
+class GroupCommitter:
+    """Publishes staged files in groups that share their directory syncs.
+
+    Files are written under temporary names and handed to :meth:`submit`,
+    which syncs the file's data on the calling thread, so workers staging
+    files concurrently also sync them concurrently. Once ``max_batch`` files
+    are waiting, or the oldest has waited ``max_delay_ms``, the group is
+    flushed: every file is renamed to its final name and each affected
+    directory is synced once. The future returned by :meth:`submit` resolves
+    only after that, so callers report a file as stored once it is durable.
+    A crash before the flush leaves only temporary files, never a truncated
+    file under its final name.
+
+    Full groups are flushed by the thread that completes them, timed ones by
+    a timer thread. Call :meth:`flush` or use the committer as a context
+    manager to publish the remainder.
+    """
+
+    def __init__(
+        self,
+        max_batch: int = DEFAULT_SYNC_BATCH_SIZE,
+        max_delay_ms: float = DEFAULT_SYNC_INTERVAL_MS
+    ):
+        """Initialize the committer.
+
+        Args:
+            max_batch: Number of waiting files that triggers a flush
+            max_delay_ms: Longest a file waits for its group to fill
+
+        Raises:
+            ValueError: If max_batch < 1 or max_delay_ms is negative
+        """
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be >= 1, got {max_batch}")
+        if max_delay_ms < 0:
+            raise ValueError(f"max_delay_ms must be >= 0, got {max_delay_ms}")
+        self.max_batch = max_batch
+        self.max_delay_ms = max_delay_ms
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[Path, Path, Tuple[Path, ...], Future]] = []
+        self._timer: Optional[threading.Timer] = None
+
+    def submit(self, temp_path: Path, dest_path: Path, directories: Iterable[Path] = ()) -> Future:
+        """Queue a staged file for publishing.
+
+        Args:
+            temp_path: Fully written temporary file
+            dest_path: Final path, on the same filesystem
+            directories: Extra directories to sync besides ``dest_path.parent``,
+                         e.g. parents of newly created subdirectories
+
+        Returns:
+            Future that resolves to ``dest_path`` once the file is durable, or
+            raises the OSError that prevented it. A file that could not be
+            synced or renamed is left at ``temp_path``. If only a directory
+            sync failed the file is already at ``dest_path`` and the future
+            raises DirectorySyncError.
+        """
+        future: Future = Future()
+        try:
+            fdatasync_file(temp_path)
+        except OSError as e:
+            future.set_exception(e)
+            return future
+        with self._lock:
+            self._pending.append((temp_path, dest_path, tuple(directories), future))
+            if len(self._pending) >= self.max_batch:
+                group = self._take()
+            else:
+                group = []
+                if self._timer is None:
+                    self._timer = threading.Timer(self.max_delay_ms / 1000, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+        self._commit(group)
+        return future
+
+    def flush(self) -> None:
+        """Publish every waiting file now."""
+        with self._lock:
+            group = self._take()
+        self._commit(group)
+
+    def _take(self) -> List[Tuple[Path, Path, Tuple[Path, ...], Future]]:
+        group, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return group
+
+    @staticmethod
+    def _commit(group: List[Tuple[Path, Path, Tuple[Path, ...], Future]]) -> None:
+        directories: Dict[Path, List[Future]] = {}
+        for temp_path, dest_path, extra_directories, future in group:
+            try:
+                os.replace(temp_path, dest_path)
+            except OSError as e:
+                future.set_exception(e)
+                continue
+            for directory in {dest_path.parent, *extra_directories}:
+                directories.setdefault(directory, []).append(future)
+
+        failed: Dict[Future, OSError] = {}
+        for directory, futures in directories.items():
+            try:
+                fsync_directory(directory)
+            except OSError as e:
+                error = DirectorySyncError(e.errno, e.strerror, str(directory))
+                for future in futures:
+                    failed.setdefault(future, error)
+
+        for temp_path, dest_path, _, future in group:
+            if future.done():
+                continue
+            if future in failed:
+                future.set_exception(failed[future])
+            else:
+                future.set_result(dest_path)
+
+    def __enter__(self) -> "GroupCommitter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
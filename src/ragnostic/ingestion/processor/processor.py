@@ -1,76 +1,239 @@
 """Document processing functionality."""
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
+from ragnostic.ingestion.iopolicy import IOPolicy
 from ragnostic.ingestion.utils import create_doc_id
-from .schema import BatchProcessingResult, ProcessingResult, ProcessingStatus
-from .storage import store_document
+from .backends import StorageBackend
+from .cas import ContentAddressedStore
+from .durability import DEFAULT_SYNC_BATCH_SIZE, DEFAULT_SYNC_INTERVAL_MS, DirectorySyncError, GroupCommitter
+from .schema import BatchProcessingResult, ProcessingResult, ProcessingStatus, StorageLayout, StorageStrategy
+from .storage import check_storage_locations, discard_staged, stage_document, storage_error, store_document
+from .throttle import ByteRateLimiter
 
 
 logger = logging.getLogger(__name__)
 
+# Staged file and the future of its group commit
+PendingCommit = Tuple[Path, Future]
+
 
 class DocumentProcessor:
     """Handles document processing and storage operations."""
     
-    def __init__(self, doc_id_prefix: str = "DOC"):
+    def __init__(
+        self,
+        doc_id_prefix: str = "DOC",
+        storage_strategy: StorageStrategy = StorageStrategy.COPY,
+        storage_layout: StorageLayout = StorageLayout.FLAT,
+        max_workers: int = 1,
+        max_bytes_per_second: Optional[float] = None,
+        durable: bool = False,
+        sync_batch_size: int = DEFAULT_SYNC_BATCH_SIZE,
+        sync_interval_ms: float = DEFAULT_SYNC_INTERVAL_MS,
+        io_policy: IOPolicy = IOPolicy.DEFAULT,
+        backend: Optional[StorageBackend] = None
+    ):
         """Initialize processor with configuration.
         
         Args:
             doc_id_prefix: Prefix to use for document IDs
+            storage_strategy: How documents are placed in storage, see ``store_document``
+            storage_layout: Store files flat by document ID, or once per distinct
+                            content in a ContentAddressedStore
+            max_workers: Number of documents stored concurrently. Several streams
+                         usually get more throughput out of SSDs and network
+                         storage than one.
+            max_bytes_per_second: Optional cap on the combined copy rate of all
+                                  workers. Moves and links are not throttled.
+            durable: Sync stored documents to disk before reporting them. Syncs
+                     are group-committed, see ``GroupCommitter``.
+            sync_batch_size: Number of stored documents published together
+            sync_interval_ms: Longest a stored document waits for its group
+            io_policy: Page-cache policy for copies, see ``IOPolicy``
+            backend: Optional StorageBackend, e.g. an S3Backend, that documents
+                     are stored in as ``<doc_id><suffix>`` instead of the
+                     ``storage_dir`` given to ``process_documents``. Strategy,
+                     durability and I/O policy are then the backend's own.
+        
+        Raises:
+            ValueError: If max_workers < 1, max_bytes_per_second is not positive,
+                        or a backend is combined with the content-addressed
+                        layout or durable group commits
         """
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be >= 1, got {max_workers}")
+        if backend is not None and (durable or storage_layout == StorageLayout.CONTENT_ADDRESSED):
+            raise ValueError("Storage backends use the flat layout and their own durability settings")
         self.doc_id_prefix = doc_id_prefix
+        self.storage_strategy = StorageStrategy(storage_strategy)
+        self.storage_layout = StorageLayout(storage_layout)
+        self.max_workers = max_workers
+        self.rate_limiter = ByteRateLimiter(max_bytes_per_second) if max_bytes_per_second is not None else None
+        self.durable = durable
+        self.sync_batch_size = sync_batch_size
+        self.sync_interval_ms = sync_interval_ms
+        self.io_policy = IOPolicy(io_policy)
+        self.backend = backend
     
     def process_documents(
         self,
         file_paths: List[Path],
-        storage_dir: Path
+        storage_dir: Optional[Path],
+        file_hashes: Optional[Dict[Path, str]] = None
     ) -> BatchProcessingResult:
         """Process a batch of validated documents.
         
+        Documents are stored concurrently when ``max_workers > 1``; results
+        keep the order of ``file_paths`` either way. With ``durable``, a
+        document is only reported as stored once its group has been synced.
+        
         Args:
             file_paths: List of paths to validated documents
-            storage_dir: Directory to store processed documents
+            storage_dir: Directory to store processed documents. Unused, and
+                         may be None, when the processor has a backend.
+            file_hashes: Optional SHA-256 per path, as computed during validation.
+                         The content-addressed layout hashes files that are missing.
         
         Returns:
             BatchProcessingResult containing results for all documents
         """
         results = BatchProcessingResult()
+        file_hashes = file_hashes or {}
         
-        for file_path in file_paths:
-            try:
-                result = self._process_single_document(file_path, storage_dir)
-                
-                if result.status == ProcessingStatus.SUCCESS:
-                    results.successful_docs.append(result)
-                else:
-                    results.failed_docs.append(result)
-                    
-            except Exception as e:
-                logger.exception(f"Unexpected error processing {file_path}")
-                results.failed_docs.append(
-                    ProcessingResult(
-                        doc_id="ERROR",
-                        original_path=file_path,
-                        status=ProcessingStatus.UNKNOWN_ERROR,
-                        error_message=str(e),
-                        error_code="UNEXPECTED_ERROR"
-                    )
-                )
+        committer = GroupCommitter(self.sync_batch_size, self.sync_interval_ms) if self.durable else None
+        
+        def process(file_path: Path) -> Tuple[ProcessingResult, Optional[PendingCommit]]:
+            return self._process_guarded(file_path, storage_dir, file_hashes.get(file_path), committer)
+        
+        if self.max_workers == 1 or len(file_paths) < 2:
+            processed = [process(file_path) for file_path in file_paths]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(file_paths)),
+                thread_name_prefix="ragnostic-store"
+            ) as executor:
+                # Executor.map yields in submission order
+                processed = list(executor.map(process, file_paths))
+        
+        if committer is not None:
+            committer.flush()
+        for result, pending in processed:
+            if pending is not None:
+                result = self._await_commit(result, *pending)
+            self._collect(results, result)
         
         return results
     
+    @staticmethod
+    def _collect(results: BatchProcessingResult, result: ProcessingResult) -> None:
+        if result.status == ProcessingStatus.SUCCESS:
+            results.successful_docs.append(result)
+        else:
+            results.failed_docs.append(result)
+    
+    def _process_guarded(
+        self,
+        file_path: Path,
+        storage_dir: Path,
+        file_hash: Optional[str] = None,
+        committer: Optional[GroupCommitter] = None
+    ) -> Tuple[ProcessingResult, Optional[PendingCommit]]:
+        """Process a single document, turning unexpected errors into a failed result.
+        
+        With a committer the document is only staged, and handed to the
+        committer to be published with its group.
+        """
+        try:
+            self._throttle(file_path)
+            if committer is None:
+                return self._process_single_document(file_path, storage_dir, file_hash), None
+            
+            result, temp_path = self._stage_single_document(file_path, storage_dir, file_hash)
+            if temp_path is None:
+                return result, None
+            directories = []
+            if self.storage_layout == StorageLayout.CONTENT_ADDRESSED:
+                directories = ContentAddressedStore(storage_dir).blob_directories(result.storage_path)
+            return result, (temp_path, committer.submit(temp_path, result.storage_path, directories))
+        except Exception as e:
+            logger.exception(f"Unexpected error processing {file_path}")
+            return ProcessingResult(
+                doc_id="ERROR",
+                original_path=file_path,
+                status=ProcessingStatus.UNKNOWN_ERROR,
+                error_message=str(e),
+                error_code="UNEXPECTED_ERROR"
+            ), None
+    
+    @staticmethod
+    def _await_commit(result: ProcessingResult, temp_path: Path, commit: Future) -> ProcessingResult:
+        """Wait for a staged document's group commit and report its outcome.
+        
+        A document whose directory could not be synced is already published,
+        so it is reported as stored but not durable.
+        """
+        try:
+            commit.result()
+        except DirectorySyncError as e:
+            logger.warning(f"Stored {result.storage_path}, but could not sync its directory: {e}")
+            return result
+        except OSError as e:
+            logger.error(f"Failed to sync {result.storage_path}: {e}")
+            discard_staged(temp_path, result.original_path, result.storage_strategy)
+            return storage_error(result.model_copy(update={"storage_path": None}), e)
+        return result.model_copy(update={"durable": True})
+    
+    def _stage_single_document(
+        self,
+        file_path: Path,
+        storage_dir: Path,
+        file_hash: Optional[str] = None
+    ) -> Tuple[ProcessingResult, Optional[Path]]:
+        """Stage a single document under a temporary name, see ``stage_document``."""
+        doc_id = create_doc_id(prefix=self.doc_id_prefix)
+        
+        if self.storage_layout == StorageLayout.CONTENT_ADDRESSED:
+            store = ContentAddressedStore(storage_dir, strategy=self.storage_strategy, io_policy=self.io_policy)
+            return store.stage(file_path, doc_id, file_hash=file_hash)
+        
+        return stage_document(
+            source_path=file_path,
+            storage_dir=storage_dir,
+            doc_id=doc_id,
+            strategy=self.storage_strategy,
+            expected_hash=file_hash,
+            io_policy=self.io_policy
+        )
+    
+    def _throttle(self, file_path: Path) -> None:
+        """Wait for bandwidth before a document's bytes are copied."""
+        if self.rate_limiter is None:
+            return
+        # Backends always transfer the bytes; locally only copies do
+        if self.backend is None and self.storage_strategy not in (StorageStrategy.COPY, StorageStrategy.AUTO):
+            return
+        try:
+            size = file_path.stat().st_size
+        except OSError:
+            # Storage reports the missing or unreadable source
+            return
+        self.rate_limiter.acquire(size)
+    
     def _process_single_document(
         self,
         file_path: Path,
-        storage_dir: Path
+        storage_dir: Path,
+        file_hash: Optional[str] = None
     ) -> ProcessingResult:
         """Process a single document.
         
         Args:
             file_path: Path to document to process
             storage_dir: Directory to store processed document
+            file_hash: SHA-256 of the document, if already known
         
         Returns:
             ProcessingResult with status and details
@@ -78,11 +241,44 @@ class DocumentProcessor:
         # Generate document ID
         doc_id = create_doc_id(prefix=self.doc_id_prefix)
         
+        if self.backend is not None:
+            return self._store_in_backend(file_path, doc_id, file_hash)
+        
+        if self.storage_layout == StorageLayout.CONTENT_ADDRESSED:
+            store = ContentAddressedStore(storage_dir, strategy=self.storage_strategy, io_policy=self.io_policy)
+            return store.store(file_path, doc_id, file_hash=file_hash)
+        
         # Store document
         result = store_document(
             source_path=file_path,
             storage_dir=storage_dir,
-            doc_id=doc_id
+            doc_id=doc_id,
+            strategy=self.storage_strategy,
+            expected_hash=file_hash,
+            io_policy=self.io_policy
         )
         
-        return result
\ No newline at end of file
+        return result
+    
+    def _store_in_backend(self, file_path: Path, doc_id: str, file_hash: Optional[str] = None) -> ProcessingResult:
+        """Store a single document through the processor's backend."""
+        result = ProcessingResult(
+            doc_id=doc_id,
+            original_path=file_path,
+            status=ProcessingStatus.SUCCESS
+        )
+        invalid = check_storage_locations(result, None)
+        if invalid is not None:
+            return invalid
+        
+        try:
+            stored = self.backend.put(file_path, f"{doc_id}{file_path.suffix}", expected_hash=file_hash)
+        except Exception as e:
+            return storage_error(result, e)
+        
+        return result.model_copy(update={
+            "storage_path": stored.storage_path,
+            "storage_uri": stored.uri,
+            "storage_strategy": stored.storage_strategy,
+            "file_hash": stored.file_hash
+        })
@@ -14,11 +14,40 @@ class ProcessingStatus(str, Enum):
     UNKNOWN_ERROR = "unknown_error"
 
 
+class StorageStrategy(str, Enum):
+    """How a document is placed in storage."""
+    COPY = "copy"
+    MOVE = "move"
+    HARDLINK = "hardlink"
+    REFLINK = "reflink"
+    AUTO = "auto"
+
+
+class StorageLayout(str, Enum):
+    """How stored documents are named and organized."""
+    FLAT = "flat"  # <storage_dir>/<doc_id><suffix>
+    CONTENT_ADDRESSED = "content_addressed"  # <storage_dir>/ab/cd/<sha256><suffix>
+
+
+class StoredObject(BaseModel):
+    """A document written to a storage backend."""
+    key: str
+    uri: str
+    size_bytes: int
+    file_hash: Optional[str] = None
+    storage_path: Optional[Path] = None  # Set by backends on the local filesystem
+    storage_strategy: Optional[StorageStrategy] = None
+
+
 class ProcessingResult(BaseModel):
     """Result of processing a single document."""
     doc_id: str
     original_path: Path
     storage_path: Optional[Path] = None
+    storage_uri: Optional[str] = None
+    storage_strategy: Optional[StorageStrategy] = None
+    file_hash: Optional[str] = None
+    durable: bool = False
     status: ProcessingStatus
     error_message: Optional[str] = None
     error_code: Optional[str] = None
@@ -1,78 +1,397 @@
 """Storage operations for document processing."""
+import errno
+import hashlib
+import os
+import uuid
 from pathlib import Path
-from shutil import copy2
-from typing import Optional
+from shutil import copystat
+from typing import Callable, Dict, Optional, Set, Tuple
 
-from .schema import ProcessingStatus, ProcessingResult
+from ragnostic.ingestion.iopolicy import IOPolicy, begin_stream, end_stream, read_blocks
 
+from .durability import DirectorySyncError, publish
+from .schema import ProcessingStatus, ProcessingResult, StorageStrategy
 
-def store_document(
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# ioctl request number of FICLONE (_IOW(0x94, 9, int)) on Linux
+FICLONE = 0x40049409
+
+# Largest chunk handed to a single copy_file_range call
+COPY_CHUNK_SIZE = 1 << 30
+
+# Buffer size of the hashing copy
+COPY_BLOCK_SIZE = 1024 * 1024
+
+# errno values meaning a strategy cannot work for this pair of locations
+UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.ENOTTY,
+}
+
+# (source device, storage device, strategy) combinations that already failed
+_unsupported: Set[Tuple[int, int, StorageStrategy]] = set()
+
+
+def copy_with_hash(
     source_path: Path,
-    storage_dir: Path,
-    doc_id: str
-) -> ProcessingResult:
-    """Store document in the target location with proper error handling.
+    dest_path: Path,
+    block_size: int = COPY_BLOCK_SIZE,
+    io_policy: IOPolicy = IOPolicy.DEFAULT
+) -> str:
+    """Copy a file with its metadata, hashing the bytes as they are written.
+    
+    Under a non-default ``io_policy`` the pages of both files are dropped
+    from the cache once the copy is done.
+    
+    Returns:
+        SHA-256 hex digest of the written content
+    """
+    sha256_hash = hashlib.sha256()
+    with open(source_path, "rb") as source, open(dest_path, "wb") as dest:
+        for block in read_blocks(source, block_size, policy=io_policy):
+            sha256_hash.update(block)
+            dest.write(block)
+        dest.flush()
+        end_stream(dest.fileno(), io_policy)
+    copystat(source_path, dest_path)
+    return sha256_hash.hexdigest()
+
+
+def _reflink(source_path: Path, dest_path: Path, io_policy: IOPolicy = IOPolicy.DEFAULT) -> None:
+    """Clone the file's extents with FICLONE, sharing data blocks copy-on-write."""
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "reflink is not supported on this platform")
+    with open(source_path, "rb") as source, open(dest_path, "wb") as dest:
+        try:
+            fcntl.ioctl(dest.fileno(), FICLONE, source.fileno())
+        except OSError:
+            dest.close()
+            os.unlink(dest_path)
+            raise
+    copystat(source_path, dest_path)
+
+
+def _copy_file_range(
+    source_path: Path,
+    dest_path: Path,
+    io_policy: IOPolicy = IOPolicy.DEFAULT
+) -> Optional[str]:
+    """Copy with copy_file_range so the data never passes through user space.
+    
+    Falls back to the hashing copy, and returns its digest, when the kernel
+    or filesystem cannot do the copy.
+    """
+    if not hasattr(os, "copy_file_range"):
+        return copy_with_hash(source_path, dest_path, io_policy=io_policy)
+    try:
+        with open(source_path, "rb") as source, open(dest_path, "wb") as dest:
+            begin_stream(source.fileno(), io_policy)
+            remaining = os.fstat(source.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(source.fileno(), dest.fileno(), min(remaining, COPY_CHUNK_SIZE))
+                if copied == 0:
+                    # Some filesystems report no progress instead of an error
+                    # when they cannot copy; never publish a short copy
+                    raise OSError(errno.EOPNOTSUPP, "copy_file_range made no progress")
+                remaining -= copied
+            end_stream(source.fileno(), io_policy)
+            end_stream(dest.fileno(), io_policy)
+    except OSError as e:
+        if e.errno not in UNSUPPORTED_ERRNOS:
+            raise
+        return copy_with_hash(source_path, dest_path, io_policy=io_policy)
+    copystat(source_path, dest_path)
+    return None
+
+
+def _copy(source_path: Path, dest_path: Path, io_policy: IOPolicy = IOPolicy.DEFAULT) -> str:
+    return copy_with_hash(source_path, dest_path, io_policy=io_policy)
+
+
+def _move(source_path: Path, dest_path: Path, io_policy: IOPolicy = IOPolicy.DEFAULT) -> None:
+    os.rename(source_path, dest_path)
+
+
+def _hardlink(source_path: Path, dest_path: Path, io_policy: IOPolicy = IOPolicy.DEFAULT) -> None:
+    os.link(source_path, dest_path)
+
+
+# Each strategy returns the SHA-256 of the bytes it wrote, or None when the
+# data never passed through user space
+_STRATEGIES: Dict[StorageStrategy, Callable[[Path, Path, IOPolicy], Optional[str]]] = {
+    StorageStrategy.COPY: _copy,
+    StorageStrategy.MOVE: _move,
+    StorageStrategy.HARDLINK: _hardlink,
+    StorageStrategy.REFLINK: _reflink,
+}
+
+# Cheapest first. Hardlink and move are never picked automatically because the
+# stored document would share an inode with, or take away, the source file.
+AUTO_ORDER = (StorageStrategy.REFLINK,)
+
+
+def _store_auto(
+    source_path: Path,
+    dest_path: Path,
+    hash_known: bool,
+    io_policy: IOPolicy = IOPolicy.DEFAULT
+) -> Tuple[StorageStrategy, Optional[str]]:
+    """Try the zero-copy strategies in turn, then copy.
+    
+    The copy stays in the kernel with copy_file_range when the content hash
+    is already known, and otherwise goes through the hashing copy so the
+    digest comes for free.
+    """
+    devices = (source_path.stat().st_dev, dest_path.parent.stat().st_dev)
+    for strategy in AUTO_ORDER:
+        if (*devices, strategy) in _unsupported:
+            continue
+        try:
+            return strategy, _STRATEGIES[strategy](source_path, dest_path, io_policy)
+        except OSError as e:
+            if e.errno not in UNSUPPORTED_ERRNOS:
+                raise
+            _unsupported.add((*devices, strategy))
+    if hash_known:
+        return StorageStrategy.COPY, _copy_file_range(source_path, dest_path, io_policy)
+    return StorageStrategy.COPY, copy_with_hash(source_path, dest_path, io_policy=io_policy)
+
+
+def place_file(
+    source_path: Path,
+    dest_path: Path,
+    strategy: StorageStrategy,
+    hash_known: bool = False,
+    io_policy: IOPolicy = IOPolicy.DEFAULT
+) -> Tuple[StorageStrategy, Optional[str]]:
+    """Place a file at ``dest_path``.
     
     Args:
-        source_path: Path to source document
-        storage_dir: Directory to store document in
-        doc_id: Generated document ID
+        source_path: File to place
+        dest_path: Destination path
+        strategy: Storage strategy
+        hash_known: Whether the caller already knows the content hash, which
+                    lets ``auto`` skip hashing in favour of a kernel copy
+        io_policy: Page-cache policy for copies
     
     Returns:
-        ProcessingResult with status and details
+        The strategy that was used, and the SHA-256 of the written bytes if
+        they passed through the hashing copy
+    
+    Raises:
+        OSError: If the strategy fails
     """
-    # Create result with initial values
-    result = ProcessingResult(
-        doc_id=doc_id,
-        original_path=source_path,
-        status=ProcessingStatus.SUCCESS
-    )
+    if strategy == StorageStrategy.AUTO:
+        return _store_auto(source_path, dest_path, hash_known, io_policy)
+    return strategy, _STRATEGIES[strategy](source_path, dest_path, io_policy)
+
+
+class ContentMismatchError(Exception):
+    """Stored content does not match the hash it was validated with."""
+
+    def __init__(self, expected_hash: str, file_hash: str):
+        super().__init__(f"expected {expected_hash}, got {file_hash}")
+        self.expected_hash = expected_hash
+        self.file_hash = file_hash
+
+
+def check_storage_locations(result: ProcessingResult, storage_dir: Optional[Path]) -> Optional[ProcessingResult]:
+    """Return a failed copy of ``result`` if its source or the storage directory is invalid.
     
+    The directory check is skipped when ``storage_dir`` is None, e.g. for
+    storage backends that are not a local directory.
+    """
     # Validate source file
-    if not source_path.is_file():
+    if not result.original_path.is_file():
         return result.model_copy(update={
             "status": ProcessingStatus.STORAGE_ERROR,
-            "error_message": f"Source file not found: {source_path}",
+            "error_message": f"Source file not found: {result.original_path}",
             "error_code": "SOURCE_NOT_FOUND"
         })
     
     # Validate storage directory
-    if not storage_dir.is_dir():
+    if storage_dir is not None and not storage_dir.is_dir():
         return result.model_copy(update={
             "status": ProcessingStatus.STORAGE_ERROR,
             "error_message": f"Storage directory invalid: {storage_dir}",
             "error_code": "INVALID_STORAGE_DIR"
         })
-    
-    try:
-        # Generate destination path with original extension
-        suffix = source_path.suffix
-        dest_filename = f"{doc_id}{suffix}"
-        dest_path = storage_dir / dest_filename
-        
-        # Copy file preserving metadata
-        copy2(source_path, dest_path)
-        
-    except PermissionError as e:
+    return None
+
+
+def storage_error(result: ProcessingResult, error: Exception) -> ProcessingResult:
+    """Return a failed copy of ``result`` describing a storage exception."""
+    if isinstance(error, ContentMismatchError):
+        return hash_mismatch(result, error.expected_hash, error.file_hash)
+    if isinstance(error, PermissionError):
         return result.model_copy(update={
             "status": ProcessingStatus.STORAGE_ERROR,
-            "error_message": str(e),
+            "error_message": str(error),
             "error_code": "PERMISSION_DENIED"
         })
-    except OSError as e:
+    if isinstance(error, OSError):
+        if error.errno == errno.EXDEV:
+            error_code = "CROSS_DEVICE"
+        elif error.errno in (errno.EOPNOTSUPP, errno.ENOTSUP, errno.ENOTTY):
+            error_code = "UNSUPPORTED_STRATEGY"
+        else:
+            error_code = "STORAGE_FAILED"
         return result.model_copy(update={
             "status": ProcessingStatus.STORAGE_ERROR,
-            "error_message": str(e),
-            "error_code": "STORAGE_FAILED"
+            "error_message": str(error),
+            "error_code": error_code
         })
+    return result.model_copy(update={
+        "status": ProcessingStatus.UNKNOWN_ERROR,
+        "error_message": str(error),
+        "error_code": "UNKNOWN"
+    })
+
+
+def hash_mismatch(result: ProcessingResult, expected_hash: str, file_hash: str) -> ProcessingResult:
+    """Build the error result for a copy whose content does not match its validated hash."""
+    return result.model_copy(update={
+        "status": ProcessingStatus.STORAGE_ERROR,
+        "error_message": (
+            f"Stored content of {result.original_path} does not match its hash: "
+            f"expected {expected_hash}, got {file_hash}"
+        ),
+        "error_code": "HASH_MISMATCH"
+    })
+
+
+def temp_path_for(dest_path: Path) -> Path:
+    """Unique hidden temporary name next to ``dest_path``."""
+    return dest_path.with_name(f".{dest_path.name}.{uuid.uuid4().hex}.tmp")
+
+
+def discard_staged(temp_path: Path, source_path: Path, strategy: StorageStrategy) -> None:
+    """Remove a staged file, putting a moved source back."""
+    if temp_path.exists():
+        if strategy == StorageStrategy.MOVE and not source_path.exists():
+            os.rename(temp_path, source_path)
+        else:
+            temp_path.unlink()
+
+
+def stage_document(
+    source_path: Path,
+    storage_dir: Path,
+    doc_id: str,
+    strategy: StorageStrategy = StorageStrategy.COPY,
+    expected_hash: Optional[str] = None,
+    io_policy: IOPolicy = IOPolicy.DEFAULT
+) -> Tuple[ProcessingResult, Optional[Path]]:
+    """Place a document in storage under a temporary name.
+    
+    The first half of ``store_document``, for callers that publish staged
+    files themselves, e.g. through a ``GroupCommitter``.
+    
+    Returns:
+        The result, whose storage_path is the final path, and the temporary
+        path holding the content. The temporary path is None on failure.
+    """
+    # Create result with initial values
+    result = ProcessingResult(
+        doc_id=doc_id,
+        original_path=source_path,
+        status=ProcessingStatus.SUCCESS
+    )
+    
+    invalid = check_storage_locations(result, storage_dir)
+    if invalid is not None:
+        return invalid, None
+    
+    # Generate destination path with original extension
+    suffix = source_path.suffix
+    dest_filename = f"{doc_id}{suffix}"
+    dest_path = storage_dir / dest_filename
+    temp_path = temp_path_for(dest_path)
+    
+    try:
+        strategy, file_hash = place_file(
+            source_path, temp_path, strategy, hash_known=expected_hash is not None, io_policy=io_policy
+        )
     except Exception as e:
-        return result.model_copy(update={
-            "status": ProcessingStatus.UNKNOWN_ERROR,
-            "error_message": str(e),
-            "error_code": "UNKNOWN"
-        })
+        discard_staged(temp_path, source_path, strategy)
+        return storage_error(result, e), None
+    
+    if file_hash is not None and expected_hash is not None and file_hash != expected_hash:
+        temp_path.unlink(missing_ok=True)
+        return hash_mismatch(result, expected_hash, file_hash), None
     
-    # Success
     return result.model_copy(update={
-        "storage_path": dest_path
-    })
\ No newline at end of file
+        "storage_path": dest_path,
+        "storage_strategy": strategy,
+        "file_hash": file_hash or expected_hash
+    }), temp_path
+
+
+def store_document(
+    source_path: Path,
+    storage_dir: Path,
+    doc_id: str,
+    strategy: StorageStrategy = StorageStrategy.COPY,
+    expected_hash: Optional[str] = None,
+    durable: bool = False,
+    io_policy: IOPolicy = IOPolicy.DEFAULT
+) -> ProcessingResult:
+    """Store document in the target location with proper error handling.
+    
+    The document is written under a temporary name and renamed into place,
+    so the stored path never holds a partial file. With ``durable`` the file
+    and directory are also fsynced; batches are better served by a
+    ``GroupCommitter``, which shares those syncs between files. A document
+    whose directory could not be synced is reported as stored but not durable.
+    
+    Copies stream through SHA-256, so the result carries the hash of the
+    bytes actually written and a copy that does not match ``expected_hash``
+    is rejected. Strategies that never read the data record ``expected_hash``.
+    
+    Strategies:
+        copy: Copy the file and its metadata, hashing it on the way
+        move: Rename the file into storage. Atomic, but only within one filesystem.
+        hardlink: Link the stored document to the source inode. Only within one filesystem.
+        reflink: Clone the file copy-on-write (FICLONE on btrfs, XFS and similar)
+        auto: Reflink when the filesystem supports it, otherwise copy. The copy
+              stays in the kernel with ``copy_file_range`` when
+              ``expected_hash`` is given. The source is left untouched.
+    
+    Args:
+        source_path: Path to source document
+        storage_dir: Directory to store document in
+        doc_id: Generated document ID
+        strategy: How the document is placed in storage
+        expected_hash: SHA-256 of the source if already known, e.g. from validation
+        durable: Sync the stored file to disk before returning
+        io_policy: Page-cache policy for copies, see ``IOPolicy``
+    
+    Returns:
+        ProcessingResult with status and details
+    """
+    result, temp_path = stage_document(source_path, storage_dir, doc_id, strategy, expected_hash, io_policy)
+    if temp_path is None:
+        return result
+    
+    try:
+        if durable:
+            publish(temp_path, result.storage_path)
+        else:
+            os.replace(temp_path, result.storage_path)
+    except DirectorySyncError:
+        # The document is in place, only its directory entry may not survive a crash
+        return result
+    except Exception as e:
+        discard_staged(temp_path, source_path, strategy)
+        return storage_error(result.model_copy(update={"storage_path": None}), e)
+    
+    # Success
+    return result.model_copy(update={"durable": durable})
@@ -0,0 +1,43 @@
+"""Aggregate bandwidth limiting for concurrent storage workers."""
+import threading
+import time
+
+
+class ByteRateLimiter:
+    """Thread-safe limiter that caps the combined byte rate of several workers.
+
+    Each call to :meth:`acquire` books its bytes on a shared schedule and
+    sleeps until its slot starts, so the transfers of all workers together
+    average no more than ``bytes_per_second``. The first transfer after an
+    idle period starts immediately.
+    """
+
+    def __init__(self, bytes_per_second: float):
+        """Initialize the limiter.
+
+        Args:
+            bytes_per_second: Aggregate transfer rate to stay under
+
+        Raises:
+            ValueError: If the rate is not positive
+        """
+        if bytes_per_second <= 0:
+            raise ValueError(f"bytes_per_second must be > 0, got {bytes_per_second}")
+        self.bytes_per_second = bytes_per_second
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def acquire(self, n_bytes: int) -> float:
+        """Wait until ``n_bytes`` may be transferred.
+
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + n_bytes / self.bytes_per_second
+        delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
@@ -1,9 +1,15 @@
 """Document processor package."""
 from .validator import DocumentValidator
-from .schema import ValidationResult, BatchValidationResult, ValidationCheckType, ValidationCheckFailure
+from .cache import FingerprintCache
+from .pipeline import ValidationCheck, ValidationPipeline
+from .schema import ValidationResult, BatchValidationResult, ValidationCheckType, ValidationCheckFailure, CheckCost
 
 __all__ = [
     "DocumentValidator",
+    "FingerprintCache",
+    "ValidationCheck",
+    "ValidationPipeline",
+    "CheckCost",
     "ValidationResult", 
     "BatchValidationResult",
     "ValidationCheckType",
@@ -0,0 +1,129 @@
+"""Persistent file fingerprint cache for skipping re-hashes of unchanged files."""
+import os
+import stat
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ragnostic.db.client import DatabaseClient
+from ragnostic.db.schema import FileFingerprint
+
+FingerprintKey = Tuple[int, int, int, int]
+
+
+def _to_signed64(value: int) -> int:
+    """Map an unsigned 64-bit stat field onto SQLite's signed INTEGER range."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def fingerprint_key(stat_result: os.stat_result) -> FingerprintKey:
+    """Build the (device, inode, size, mtime_ns) cache key for a stat result."""
+    return (
+        _to_signed64(stat_result.st_dev),
+        _to_signed64(stat_result.st_ino),
+        stat_result.st_size,
+        stat_result.st_mtime_ns,
+    )
+
+
+class FingerprintCache:
+    """Read-through cache of file hashes and MIME types stored in the document database.
+
+    Entries are keyed by (device, inode, size, mtime_ns), so any write, truncation
+    or replacement of a file produces a new key and the stale entry is ignored.
+    Lookups hit the in-memory map first and then the ``file_fingerprints`` table.
+    :meth:`preload` fetches the entries for a batch of files with a few
+    queries, after which lookups for those files need no query at all, hit or
+    miss. New fingerprints are buffered and written in batches. Call
+    :meth:`flush` when a batch of work completes.
+
+    The cache is safe to share between validation worker threads.
+    """
+
+    def __init__(self, db_client: DatabaseClient, flush_size: int = 256):
+        """Initialize the cache.
+
+        Args:
+            db_client: Database client holding the ``file_fingerprints`` table
+            flush_size: Number of new fingerprints buffered before writing them out
+        """
+        self.db_client = db_client
+        self.flush_size = flush_size
+        self._entries: Dict[FingerprintKey, FileFingerprint] = {}
+        # Keys a preload found no entry for
+        self._missing: Set[FingerprintKey] = set()
+        self._pending: List[FileFingerprint] = []
+        self._lock = threading.Lock()
+
+    def lookup(self, stat_result: os.stat_result) -> Optional[FileFingerprint]:
+        """Return the cached fingerprint for a file's current stat, if any."""
+        key = fingerprint_key(stat_result)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None or key in self._missing:
+                return cached
+
+        cached = self.db_client.get_fingerprint(*key)
+        if cached is not None:
+            with self._lock:
+                self._entries[key] = cached
+        return cached
+
+    def preload(self, filepaths: Iterable[Path]) -> None:
+        """Fetch the cached fingerprints of many files in batched queries.
+
+        Files that cannot be stat'ed or are not regular files are skipped.
+        """
+        keys = []
+        for filepath in filepaths:
+            try:
+                stat_result = os.stat(filepath)
+            except OSError:
+                continue
+            if stat.S_ISREG(stat_result.st_mode):
+                keys.append(fingerprint_key(stat_result))
+        with self._lock:
+            keys = [key for key in keys if key not in self._entries and key not in self._missing]
+        if not keys:
+            return
+        
+        found = self.db_client.get_fingerprints(keys)
+        with self._lock:
+            self._entries.update(found)
+            self._missing.update(key for key in keys if key not in found)
+
+    def store(
+        self,
+        stat_result: os.stat_result,
+        file_hash: str,
+        mime_type: str,
+        pdf_encrypted: Optional[bool] = None
+    ) -> None:
+        """Record a fingerprint computed for a file with the given stat.
+
+        ``pdf_encrypted`` is set only for PDFs whose structure was checked and
+        found valid, so a later lookup can skip the structure check.
+        """
+        device, inode, size_bytes, mtime_ns = fingerprint_key(stat_result)
+        fingerprint = FileFingerprint(
+            device=device,
+            inode=inode,
+            size_bytes=size_bytes,
+            mtime_ns=mtime_ns,
+            file_hash=file_hash,
+            mime_type=mime_type,
+            pdf_encrypted=pdf_encrypted,
+        )
+        with self._lock:
+            self._entries[(device, inode, size_bytes, mtime_ns)] = fingerprint
+            self._missing.discard((device, inode, size_bytes, mtime_ns))
+            self._pending.append(fingerprint)
+            should_flush = len(self._pending) >= self.flush_size
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered fingerprints to the database."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        self.db_client.upsert_fingerprints(pending)
@@ -1,32 +1,262 @@
 """Individual validation checks for document ingestion."""
 import hashlib
+import mmap
+import os
+import re
+import stat
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Tuple, Union
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 import magic
 
 from ragnostic.db.client import DatabaseClient
+from ragnostic.db.schema import Document
+from ragnostic.ingestion.iopolicy import IOPolicy, end_stream, read_blocks
+from .cache import FingerprintCache, fingerprint_key
 from .schema import ValidationCheckType, ValidationCheckFailure
 
 
-def compute_file_hash(filepath: Path) -> Optional[str]:
-    """Compute SHA-256 hash of file."""
+PROBE_BLOCK_SIZE = 1024 * 1024  # 1 MiB reads keep syscall count low on large PDFs
+HEAD_BLOCK_SIZE = 64 * 1024  # head/tail blocks used for sniffing and the quick hash
+PDF_MAGIC = b"%PDF-"
+PDF_MIME_TYPE = "application/pdf"
+PDF_MIME_TYPES = {PDF_MIME_TYPE, "application/x-pdf"}
+PDF_HEADER_WINDOW = 1024  # readers accept the %PDF- header within the first 1 KiB
+PDF_TRAILER_WINDOW = 2048  # %%EOF and startxref must sit in the final 2 KiB
+PDF_TRAILER_SEARCH = 64 * 1024  # fallback search for a trailer before startxref
+PDF_STARTXREF_PATTERN = re.compile(rb"startxref\s+(\d+)")
+PDF_OBJECT_PATTERN = re.compile(rb"\s*\d+\s+\d+\s+obj")
+PDF_PREV_PATTERN = re.compile(rb"/Prev\s+(\d+)")
+PDF_MAX_TRAILERS = 32  # bound on the /Prev chain followed through incremental updates
+
+
+class FileProbe:
+    """Single handle on a file that serves its size, MIME type and hash.
+    
+    The file is stat'ed once and opened at most once: the size comes from that
+    stat, the MIME type is sniffed from the first buffer (files starting with
+    ``%PDF-`` skip libmagic entirely) and the SHA-256 continues from that same
+    buffer through the rest of the file. Each value is computed lazily on first
+    access and cached, so every check in a pipeline can share one probe without
+    re-reading bytes.
+    
+    When a FingerprintCache is given, the hash and MIME type of an unchanged
+    file are served from the cache and the file is never opened.
+    
+    The ``io_policy`` controls how the full hashing pass uses the page cache;
+    under a non-default policy the file's pages are dropped when the probe is
+    closed.
+    
+    Use as a context manager, or call :meth:`close` when done.
+    """
+
+    def __init__(
+        self,
+        filepath: Path,
+        block_size: int = PROBE_BLOCK_SIZE,
+        cache: Optional[FingerprintCache] = None,
+        io_policy: IOPolicy = IOPolicy.DEFAULT
+    ):
+        self.filepath = Path(filepath)
+        self.block_size = block_size
+        self.cache = cache
+        self.io_policy = IOPolicy(io_policy)
+        self._stat = os.stat(self.filepath)
+        self._file: Optional[BinaryIO] = None
+        self._head: Optional[bytes] = None
+        self._mime_type: Optional[str] = None
+        self._file_hash: Optional[str] = None
+        self._quick_hash: Optional[str] = None
+        # Set by ``check_pdf_structure`` for valid PDFs, or from the cache
+        self.pdf_encrypted: Optional[bool] = None
+        
+        if cache is not None and self.is_regular_file:
+            cached = cache.lookup(self._stat)
+            if cached is not None:
+                self._mime_type = cached.mime_type
+                self._file_hash = cached.file_hash
+                self.pdf_encrypted = cached.pdf_encrypted
+
+    def __enter__(self) -> "FileProbe":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the underlying file handle, if one was opened."""
+        if self._file is not None:
+            end_stream(self._file.fileno(), self.io_policy)
+            self._file.close()
+            self._file = None
+
+    def _open(self) -> BinaryIO:
+        if self._file is None:
+            self._file = open(self.filepath, "rb")
+        return self._file
+
+    @contextmanager
+    def memory_map(self) -> Iterator[mmap.mmap]:
+        """Memory-map the file read-only, so checks can touch a few pages without reading it."""
+        mapped = mmap.mmap(self._open().fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+    @property
+    def from_cache(self) -> bool:
+        """Whether the hash was served from the fingerprint cache."""
+        return self._file_hash is not None and self._head is None
+
+    @property
+    def is_regular_file(self) -> bool:
+        """Whether the probed path is a regular file."""
+        return stat.S_ISREG(self._stat.st_mode)
+
+    @property
+    def size(self) -> int:
+        """File size in bytes, taken from the initial stat."""
+        return self._stat.st_size
+
+    @property
+    def head(self) -> bytes:
+        """First block of the file, read once and shared by MIME sniffing and hashing."""
+        if self._head is None:
+            f = self._open()
+            f.seek(0)
+            self._head = f.read(HEAD_BLOCK_SIZE)
+        return self._head
+
+    @property
+    def mime_type(self) -> str:
+        """MIME type sniffed from the first block."""
+        if self._mime_type is None:
+            head = self.head
+            if head.startswith(PDF_MAGIC):
+                self._mime_type = PDF_MIME_TYPE
+            else:
+                self._mime_type = magic.from_buffer(head, mime=True)
+        return self._mime_type
+
+    @property
+    def file_hash(self) -> str:
+        """SHA-256 hex digest of the full file contents."""
+        if self._file_hash is None:
+            sha256_hash = hashlib.sha256(self.head)
+            f = self._open()
+            if len(self._head) == HEAD_BLOCK_SIZE:
+                for block in read_blocks(f, self.block_size, len(self._head), self.io_policy):
+                    sha256_hash.update(block)
+            self._file_hash = sha256_hash.hexdigest()
+            
+            # Only cache the digest if the file did not change while it was read
+            if self.cache is not None:
+                if fingerprint_key(os.fstat(f.fileno())) == fingerprint_key(self._stat):
+                    self.cache.store(self._stat, self._file_hash, self.mime_type, self.pdf_encrypted)
+        return self._file_hash
+
+    @property
+    def quick_hash(self) -> str:
+        """Prefilter fingerprint of the file size plus its head and tail blocks.
+        
+        Reads at most two blocks regardless of file size. Equal files always
+        share a quick hash, so a quick hash that matches nothing rules out a
+        duplicate without computing the full SHA-256.
+        """
+        if self._quick_hash is None:
+            digest = hashlib.blake2b(self.size.to_bytes(8, "little"), digest_size=16)
+            digest.update(self.head)
+            if self.size > HEAD_BLOCK_SIZE:
+                tail_offset = max(self.size - HEAD_BLOCK_SIZE, HEAD_BLOCK_SIZE)
+                digest.update(os.pread(self._open().fileno(), self.size - tail_offset, tail_offset))
+            self._quick_hash = digest.hexdigest()
+        return self._quick_hash
+
+
+def probe_file(
+    filepath: Path,
+    cache: Optional[FingerprintCache] = None,
+    io_policy: IOPolicy = IOPolicy.DEFAULT
+) -> Union[FileProbe, ValidationCheckFailure]:
+    """Create a probe for a file.
+    
+    Args:
+        filepath: Path to the file
+        cache: Optional fingerprint cache consulted before any file content is read
+        io_policy: Page-cache policy for reading the file
+    
+    Returns:
+        A FileProbe (caller must close it), or a ValidationCheckFailure if the
+        path is missing, inaccessible or not a regular file.
+    """
+    try:
+        probe = FileProbe(filepath, cache=cache, io_policy=io_policy)
+    except (FileNotFoundError, NotADirectoryError):
+        return ValidationCheckFailure(
+            filepath=filepath,
+            check_type=ValidationCheckType.OTHER,
+            message="File does not exist or is not a regular file"
+        )
+    except PermissionError as e:
+        return ValidationCheckFailure(
+            filepath=filepath,
+            check_type=ValidationCheckType.PERMISSION_ERROR,
+            message=f"Unable to access file: {str(e)}"
+        )
+    except OSError as e:
+        return ValidationCheckFailure(
+            filepath=filepath,
+            check_type=ValidationCheckType.OTHER,
+            message=f"Unable to access file: {str(e)}"
+        )
+
+    if not probe.is_regular_file:
+        probe.close()
+        return ValidationCheckFailure(
+            filepath=filepath,
+            check_type=ValidationCheckType.OTHER,
+            message="File does not exist or is not a regular file"
+        )
+    return probe
+
+
+def compute_file_hash(
+    filepath: Path,
+    cache: Optional[FingerprintCache] = None,
+    io_policy: IOPolicy = IOPolicy.DEFAULT
+) -> Optional[str]:
+    """Compute SHA-256 hash of file, consulting the fingerprint cache first if given."""
     try:
-        sha256_hash = hashlib.sha256()
-        with open(filepath, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+        with FileProbe(filepath, cache=cache, io_policy=io_policy) as probe:
+            return probe.file_hash
     except Exception:
         return None
 
 
-def check_file_hash(filepath: Path) -> Union[str,ValidationCheckFailure]:
+def check_file_hash(filepath: Path, probe: Optional[FileProbe] = None) -> Union[str,ValidationCheckFailure]:
     """Compute SHA-256 hash of file.
     
+    Args:
+        filepath: Path to the file
+        probe: Optional open probe to reuse instead of re-reading the file
+    
     Returns:
-        Tuple of (hash_value, check_failure). If successful, check_failure will be None.
+        The hex digest, or a CORRUPTED_FILE failure if the file cannot be read.
     """
-    hash_value = compute_file_hash(filepath)
+    if probe is not None:
+        try:
+            hash_value = probe.file_hash
+        except PermissionError as e:
+            return ValidationCheckFailure(
+                filepath=filepath,
+                check_type=ValidationCheckType.PERMISSION_ERROR,
+                message=f"Unable to read file: {str(e)}"
+            )
+        except OSError:
+            hash_value = None
+    else:
+        hash_value = compute_file_hash(filepath)
     if hash_value is None:
         return ValidationCheckFailure(
             filepath=filepath,
@@ -36,6 +266,163 @@ def check_file_hash(filepath: Path) -> Union[str,ValidationCheckFailure]:
     return hash_value
 
 
+def check_quick_hash(filepath: Path, probe: FileProbe) -> Union[str, ValidationCheckFailure]:
+    """Compute the head/tail prefilter hash of a file from its probe."""
+    try:
+        return probe.quick_hash
+    except PermissionError as e:
+        return ValidationCheckFailure(
+            filepath=filepath,
+            check_type=ValidationCheckType.PERMISSION_ERROR,
+            message=f"Unable to read file: {str(e)}"
+        )
+    except OSError:
+        return ValidationCheckFailure(
+            filepath=filepath,
+            check_type=ValidationCheckType.CORRUPTED_FILE,
+            message="Unable to compute file quick hash"
+        )
+
+
+def _pdf_trailer_dictionary(data: mmap.mmap, offset: int, startxref: int) -> Optional[bytes]:
+    """Locate the trailer dictionary of the cross-reference section at ``offset``.
+    
+    Handles classic ``xref`` tables followed by a ``trailer`` dictionary and
+    PDF 1.5 cross-reference streams, whose stream dictionary holds the trailer
+    keys. Offsets that point elsewhere fall back to the last ``trailer`` shortly
+    before ``startxref``, since many writers emit slightly wrong offsets that
+    readers repair transparently.
+    """
+    section = data[offset:offset + 64]
+    if section.lstrip().startswith(b"xref"):
+        trailer = data.find(b"trailer", offset, startxref)
+        if trailer < 0:
+            return None
+        end = data.find(b"startxref", trailer, startxref)
+        return data[trailer:end if end >= 0 else startxref]
+    
+    if PDF_OBJECT_PATTERN.match(section):
+        window = data[offset:min(offset + 4096, startxref)]
+        stream = window.find(b"stream")
+        dictionary = window[:stream] if stream >= 0 else window
+        return dictionary if b"/XRef" in dictionary else None
+    
+    trailer = data.rfind(b"trailer", max(0, startxref - PDF_TRAILER_SEARCH), startxref)
+    return data[trailer:startxref] if trailer >= 0 else None
+
+
+def _pdf_trailer_chain(data: mmap.mmap, offset: int, startxref: int) -> List[bytes]:
+    """Collect the trailer dictionaries a reader consults to find the document catalog.
+    
+    Starts at the section ``startxref`` points to and follows ``/Prev`` back
+    through incremental updates. Linearized files keep ``/Root`` in the
+    first-page trailer, which directly follows the linearization dictionary at
+    the start of the file, so that trailer is added too. Returns an empty list
+    if there is no cross-reference section at ``offset``.
+    """
+    trailers: List[bytes] = []
+    visited = set()
+    while offset not in visited and len(visited) < PDF_MAX_TRAILERS:
+        visited.add(offset)
+        trailer = _pdf_trailer_dictionary(data, offset, startxref)
+        if trailer is None:
+            break
+        trailers.append(trailer)
+        match = PDF_PREV_PATTERN.search(trailer)
+        if match is None or int(match.group(1)) >= startxref:
+            break
+        offset = int(match.group(1))
+    if not trailers:
+        return trailers
+    
+    header = data[:PDF_HEADER_WINDOW]
+    if b"/Linearized" in header:
+        end = header.find(b"endobj", header.find(b"/Linearized"))
+        if end >= 0:
+            first_page = _pdf_trailer_dictionary(data, end + len(b"endobj"), startxref)
+            if first_page is not None:
+                trailers.append(first_page)
+    return trailers
+
+
+def encrypted_pdf(filepath: Path) -> ValidationCheckFailure:
+    """Failure reported for an encrypted PDF when encryption is not allowed."""
+    return ValidationCheckFailure(
+        filepath=filepath,
+        check_type=ValidationCheckType.ENCRYPTED_FILE,
+        message="PDF is encrypted"
+    )
+
+
+def check_pdf_structure(
+    filepath: Path,
+    probe: FileProbe,
+    allow_encrypted: bool = False
+) -> Union[bool, ValidationCheckFailure]:
+    """Check PDF framing without parsing the document.
+    
+    Memory-maps the file and inspects only its first and last pages: the
+    ``%PDF-`` header, the ``%%EOF`` marker, the ``startxref`` offset and the
+    trailer dictionaries it leads to, one of which must name a ``/Root``
+    (see ``_pdf_trailer_chain`` for incrementally updated and linearized
+    files). Truncated files usually lose their ``%%EOF`` and are caught here
+    before any copy or extraction work. Encrypted documents (``/Encrypt`` in a
+    trailer) are rejected unless ``allow_encrypted`` is set. For a valid PDF
+    the encryption verdict is recorded on the probe, and cached with its hash.
+    """
+    def corrupted(reason: str, details: Optional[dict] = None) -> ValidationCheckFailure:
+        return ValidationCheckFailure(
+            filepath=filepath,
+            check_type=ValidationCheckType.CORRUPTED_FILE,
+            message=f"Malformed PDF: {reason}",
+            details=details
+        )
+    
+    size = probe.size
+    if size == 0:
+        return corrupted("file is empty")
+    
+    try:
+        with probe.memory_map() as data:
+            if data.find(PDF_MAGIC, 0, PDF_HEADER_WINDOW) < 0:
+                return corrupted("missing %PDF- header")
+            
+            tail_start = max(0, size - PDF_TRAILER_WINDOW)
+            eof = data.rfind(b"%%EOF", tail_start)
+            if eof < 0:
+                return corrupted("missing %%EOF marker, file may be truncated")
+            
+            startxref = data.rfind(b"startxref", tail_start, eof)
+            match = PDF_STARTXREF_PATTERN.match(data[startxref:eof]) if startxref >= 0 else None
+            if match is None:
+                return corrupted("missing startxref offset")
+            
+            offset = int(match.group(1))
+            if offset >= startxref:
+                return corrupted("startxref offset out of range", {"startxref": offset, "file_size": size})
+            
+            trailers = _pdf_trailer_chain(data, offset, startxref)
+            if not trailers:
+                return corrupted("no cross-reference table at startxref", {"startxref": offset})
+            
+            encrypted = any(b"/Encrypt" in trailer for trailer in trailers)
+            if encrypted and not allow_encrypted:
+                return encrypted_pdf(filepath)
+            if not any(b"/Root" in trailer for trailer in trailers):
+                return corrupted("trailer has no /Root entry")
+            probe.pdf_encrypted = encrypted
+    except PermissionError as e:
+        return ValidationCheckFailure(
+            filepath=filepath,
+            check_type=ValidationCheckType.PERMISSION_ERROR,
+            message=f"Unable to read file: {str(e)}"
+        )
+    except (OSError, ValueError) as e:
+        return corrupted(str(e))
+    
+    return True
+
+
 def check_file_exists(filepath: Path) -> Union[bool, ValidationCheckFailure]:
     """Check if file exists and is a regular file."""
     if not filepath.exists() or not filepath.is_file():
@@ -47,10 +434,14 @@ def check_file_exists(filepath: Path) -> Union[bool, ValidationCheckFailure]:
     return True
 
 
-def check_file_size(filepath: Path, max_size: int) -> Union[int, ValidationCheckFailure]:
-    """Check if file size is within limits."""
+def check_file_size(
+    filepath: Path,
+    max_size: int,
+    probe: Optional[FileProbe] = None
+) -> Union[int, ValidationCheckFailure]:
+    """Check if file size is within limits, reusing the probe's fstat if given."""
     try:
-        file_size = filepath.stat().st_size
+        file_size = probe.size if probe is not None else filepath.stat().st_size
     except Exception as e:
         return ValidationCheckFailure(
             filepath=filepath,
@@ -68,10 +459,17 @@ def check_file_size(filepath: Path, max_size: int) -> Union[int, ValidationCheck
     return file_size
     
 
-def check_mime_type(filepath: Path, supported_types: list[str]) -> Union[str, ValidationCheckFailure]:
-    """Check if file mime type is supported."""
+def check_mime_type(
+    filepath: Path,
+    supported_types: list[str],
+    probe: Optional[FileProbe] = None
+) -> Union[str, ValidationCheckFailure]:
+    """Check if file mime type is supported, sniffing the probe's first block if given."""
     try:
-        mime_type = magic.from_file(str(filepath), mime=True)
+        if probe is not None:
+            mime_type = probe.mime_type
+        else:
+            mime_type = magic.from_file(str(filepath), mime=True)
         if mime_type not in supported_types:
             return ValidationCheckFailure(
                 filepath=filepath,
@@ -99,3 +497,56 @@ def check_hash_unique(filepath: Path, file_hash: str, db_client: DatabaseClient)
             details={"existing_doc_id": existing_doc.id}
         )
     return True
+
+
+def check_hashes_unique(
+    file_hashes: List[Tuple[Path, str]],
+    db_client: DatabaseClient,
+    seen_hashes: Optional[Dict[str, Path]] = None,
+    existing_docs: Optional[Dict[str, Document]] = None
+) -> List[Union[bool, ValidationCheckFailure]]:
+    """Check a batch of file hashes for duplicates with batched database lookups.
+    
+    Files are checked against the database and against each other: the first
+    file (in list order) with a given hash passes and any later file with the
+    same hash fails, since it would otherwise collide on the unique constraint
+    when the documents are indexed.
+    
+    Args:
+        file_hashes: (filepath, hash) pairs to check
+        db_client: Database client used for the batched lookup
+        seen_hashes: Optional hash -> filepath map of files accepted in earlier
+                     batches of the same run. Updated in place.
+        existing_docs: Optional result of a ``get_documents_by_hashes`` lookup
+                       already made for these hashes, which skips the query
+    
+    Returns:
+        A list aligned with ``file_hashes`` holding True or a DUPLICATE_HASH failure
+    """
+    if seen_hashes is None:
+        seen_hashes = {}
+    if existing_docs is None:
+        existing_docs = db_client.get_documents_by_hashes(
+            [file_hash for _, file_hash in file_hashes]
+        )
+    
+    results: List[Union[bool, ValidationCheckFailure]] = []
+    for filepath, file_hash in file_hashes:
+        if file_hash in existing_docs:
+            results.append(ValidationCheckFailure(
+                filepath=filepath,
+                check_type=ValidationCheckType.DUPLICATE_HASH,
+                message="Document with same hash already exists",
+                details={"existing_doc_id": existing_docs[file_hash].id}
+            ))
+        elif file_hash in seen_hashes:
+            results.append(ValidationCheckFailure(
+                filepath=filepath,
+                check_type=ValidationCheckType.DUPLICATE_HASH,
+                message="File has the same hash as another file in this batch",
+                details={"duplicate_of": str(seen_hashes[file_hash])}
+            ))
+        else:
+            seen_hashes[file_hash] = filepath
+            results.append(True)
+    return results
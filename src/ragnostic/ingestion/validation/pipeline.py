@@ -0,0 +1,172 @@
+"""Cost-ordered, pluggable validation check pipeline."""
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from ragnostic.ingestion.iopolicy import IOPolicy
+from .cache import FingerprintCache
+from .checks import FileProbe, probe_file
+from .schema import CheckCost, ValidationCheckFailure, ValidationResult
+
+CheckFunction = Callable[[FileProbe, Dict[str, Any]], Union[Any, ValidationCheckFailure]]
+
+PROBE_CHECK_NAME = "file_exists"
+
+
+class ValidationCheck(BaseModel):
+    """A single registered validation check.
+
+    The check function receives the shared FileProbe and a mapping of values
+    produced by earlier checks, and returns either a value (stored under
+    ``provides`` if set) or a ValidationCheckFailure.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+
+    name: str
+    cost: CheckCost
+    func: CheckFunction
+    requires: FrozenSet[str] = Field(default_factory=frozenset, description="Values this check needs from earlier checks")
+    provides: Optional[str] = Field(default=None, description="Name of the value this check produces")
+
+
+class ValidationPipeline:
+    """Ordered registry of validation checks.
+
+    Checks run cheapest first: among the checks whose data dependencies are
+    satisfied, the one with the lowest cost class runs next, with registration
+    order breaking ties. The pipeline stops at the first failure, so expensive
+    checks such as the full-file hash never run for files that a stat-level
+    check already rejected. Each check's wall time is recorded on the result.
+    """
+
+    def __init__(self, checks: Optional[Iterable[ValidationCheck]] = None):
+        self._checks: List[ValidationCheck] = []
+        self._ordered: Optional[List[ValidationCheck]] = None
+        for check in checks or []:
+            self.register(check)
+
+    def register(self, check: ValidationCheck) -> None:
+        """Add a check to the pipeline.
+
+        Raises:
+            ValueError: If a check with the same name is already registered
+        """
+        if any(existing.name == check.name for existing in self._checks):
+            raise ValueError(f"Validation check already registered: {check.name}")
+        self._checks.append(check)
+        self._ordered = None
+
+    def unregister(self, name: str) -> None:
+        """Remove a check by name."""
+        self._checks = [check for check in self._checks if check.name != name]
+        self._ordered = None
+
+    @property
+    def checks(self) -> List[ValidationCheck]:
+        """Registered checks in execution order.
+
+        Raises:
+            ValueError: If a check depends on a value no other check provides,
+                        or dependencies are circular
+        """
+        if self._ordered is None:
+            self._ordered = self._resolve_order()
+        return list(self._ordered)
+
+    def _resolve_order(self) -> List[ValidationCheck]:
+        provided = {check.provides for check in self._checks if check.provides}
+        for check in self._checks:
+            missing = check.requires - provided
+            if missing:
+                raise ValueError(f"Check {check.name} requires unknown values: {sorted(missing)}")
+
+        remaining = list(self._checks)
+        available: set = set()
+        ordered: List[ValidationCheck] = []
+        while remaining:
+            ready = [check for check in remaining if check.requires <= available]
+            if not ready:
+                raise ValueError(f"Circular check dependencies: {[c.name for c in remaining]}")
+            # min() keeps the first (earliest registered) check among equal costs
+            next_check = min(ready, key=lambda check: check.cost)
+            ordered.append(next_check)
+            remaining.remove(next_check)
+            if next_check.provides:
+                available.add(next_check.provides)
+        return ordered
+
+    def _check_skip(self, skip: FrozenSet[str]) -> None:
+        kept = [check for check in self._checks if check.name not in skip]
+        provided = {check.provides for check in kept if check.provides}
+        for check in kept:
+            missing = check.requires - provided
+            if missing:
+                raise ValueError(f"Cannot skip checks that {check.name} depends on: {sorted(missing)}")
+
+    def run(
+        self,
+        filepath: Path,
+        skip: FrozenSet[str] = frozenset(),
+        cache: Optional[FingerprintCache] = None,
+        io_policy: IOPolicy = IOPolicy.DEFAULT
+    ) -> ValidationResult:
+        """Run all checks against a file, stopping at the first failure.
+
+        Args:
+            filepath: File to validate
+            skip: Names of checks to leave out for this run
+            cache: Optional fingerprint cache handed to the file probe
+            io_policy: Page-cache policy handed to the file probe
+
+        Returns:
+            ValidationResult with the collected values and per-check timings
+
+        Raises:
+            ValueError: If ``skip`` leaves out a check whose value a remaining
+                        check requires
+        """
+        if skip:
+            self._check_skip(skip)
+        timings: Dict[str, float] = {}
+
+        start = time.perf_counter()
+        probe_result = probe_file(filepath, cache=cache, io_policy=io_policy)
+        timings[PROBE_CHECK_NAME] = time.perf_counter() - start
+        if isinstance(probe_result, ValidationCheckFailure):
+            return ValidationResult(
+                filepath=filepath,
+                is_valid=False,
+                check_failures=[probe_result],
+                check_timings=timings,
+            )
+
+        values: Dict[str, Any] = {}
+        with probe_result as probe:
+            for check in self.checks:
+                if check.name in skip:
+                    continue
+                start = time.perf_counter()
+                outcome = check.func(probe, values)
+                timings[check.name] = time.perf_counter() - start
+                if isinstance(outcome, ValidationCheckFailure):
+                    return ValidationResult(
+                        filepath=filepath,
+                        is_valid=False,
+                        check_failures=[outcome],
+                        check_timings=timings,
+                    )
+                if check.provides:
+                    values[check.provides] = outcome
+
+        return ValidationResult(
+            filepath=filepath,
+            is_valid=True,
+            file_hash=values.get("file_hash"),
+            quick_hash=values.get("quick_hash"),
+            mime_type=values.get("mime_type"),
+            file_size_bytes=values.get("file_size"),
+            check_failures=[],
+            check_timings=timings,
+        )
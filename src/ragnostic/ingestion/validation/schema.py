@@ -1,7 +1,7 @@
 """Validation schemas for the ingestion pipeline."""
-from enum import Enum
+from enum import Enum, IntEnum
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 class ValidationCheckType(str, Enum):
@@ -9,10 +9,18 @@ class ValidationCheckType(str, Enum):
     DUPLICATE_HASH = "duplicate_hash"
     INVALID_MIMETYPE = "invalid_mimetype"
     CORRUPTED_FILE = "corrupted_file"
+    ENCRYPTED_FILE = "encrypted_file"
     FILE_TOO_LARGE = "file_too_large"
     PERMISSION_ERROR = "permission_error"
     OTHER = "other"
 
+class CheckCost(IntEnum):
+    """Relative cost class of a validation check, cheapest first."""
+    METADATA = 0  # stat-level information only
+    HEADER = 1  # reads the first block of the file
+    CONTENT = 2  # reads the whole file
+    DATABASE = 3  # needs a database round trip
+
 class ValidationCheckFailure(BaseModel):
     """Represents a validation check failure for a file."""
     filepath: Path
@@ -25,9 +33,11 @@ class ValidationResult(BaseModel):
     filepath: Path
     is_valid: bool
     file_hash: Optional[str] = Field(default=None, description="Hash of the file")
+    quick_hash: Optional[str] = Field(default=None, description="Size + head/tail prefilter hash of the file")
     mime_type: Optional[str] = Field(default=None, description="MIME type of the file")
     file_size_bytes: Optional[int] = Field(default=None, description="Size of the file in bytes")
     check_failures: List[ValidationCheckFailure] = Field(default_factory=list)
+    check_timings: Dict[str, float] = Field(default_factory=dict, description="Wall time in seconds spent in each check")
 
 class BatchValidationResult(BaseModel):
     """Results from validating multiple files."""
@@ -1,110 +1,649 @@
 """High-level document validation logic."""
+import asyncio
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 from ragnostic.db.client import DatabaseClient
-from .schema import ValidationCheckFailure, ValidationCheckType, ValidationResult, BatchValidationResult
+from ragnostic.ingestion.iopolicy import IOPolicy
+from .schema import CheckCost, ValidationCheckFailure, ValidationCheckType, ValidationResult, BatchValidationResult
+from .cache import FingerprintCache
+from .pipeline import ValidationCheck, ValidationPipeline
 from .checks import (
+    FileProbe,
+    compute_file_hash,
     check_file_hash,
-    check_file_exists,
+    check_quick_hash,
+    check_pdf_structure,
+    encrypted_pdf,
+    PDF_MIME_TYPES,
     check_file_size,
     check_mime_type,
     check_hash_unique,
+    check_hashes_unique,
 )
 
+HASH_UNIQUE_CHECK = "hash_unique"
+
+
+class _PendingResolution:
+    """Valid results waiting for their batched duplicate lookup.
+    
+    A result becomes ready once every earlier input has been checked, so
+    batches taken from here resolve duplicates in input order whatever order
+    the checks finish in.
+    """
+    
+    def __init__(self, batch_size: int, max_delay: float):
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        # Valid results with the time each arrived
+        self._pending: List[Tuple[int, ValidationResult, float]] = []
+        # Inputs below ``_checked_up_to`` have all been checked; ``_checked_ahead``
+        # holds the indices checked out of order beyond it
+        self._checked_up_to = 0
+        self._checked_ahead: Set[int] = set()
+    
+    def add(self, index: int, result: ValidationResult, now: float) -> None:
+        """Record a checked input, keeping it if it passed the per-file checks."""
+        self._checked_ahead.add(index)
+        while self._checked_up_to in self._checked_ahead:
+            self._checked_ahead.remove(self._checked_up_to)
+            self._checked_up_to += 1
+        if result.is_valid:
+            self._pending.append((index, result, now))
+    
+    def take(self, idle: bool, now: float) -> List[List[Tuple[int, ValidationResult]]]:
+        """Take the ready results as batches, once a batch is full, the oldest
+        has waited ``max_delay`` seconds, or the checks are ``idle``."""
+        ready = sorted(entry for entry in self._pending if entry[0] < self._checked_up_to)
+        if not ready:
+            return []
+        if not (
+            idle
+            or len(ready) >= self.batch_size
+            or now - min(arrived for _, _, arrived in ready) >= self.max_delay
+        ):
+            return []
+        self._pending = [entry for entry in self._pending if entry[0] >= self._checked_up_to]
+        return self._batches(ready)
+    
+    def take_all(self) -> List[List[Tuple[int, ValidationResult]]]:
+        """Take every remaining result, once all inputs have been checked."""
+        remaining, self._pending = sorted(self._pending), []
+        return self._batches(remaining)
+    
+    def _batches(self, entries: List[Tuple[int, ValidationResult, float]]) -> List[List[Tuple[int, ValidationResult]]]:
+        return [
+            [(index, result) for index, result, _ in entries[start:start + self.batch_size]]
+            for start in range(0, len(entries), self.batch_size)
+        ]
+
+
 class DocumentValidator:
-    """Validates documents before ingestion."""
+    """Validates documents before ingestion.
+    
+    Checks live in ``self.pipeline``; register additional ValidationCheck
+    entries there to extend validation.
+    """
     
     def __init__(
         self,
         db_client: DatabaseClient,
         max_file_size: int = 100 * 1024 * 1024,  # 100MB default
-        supported_mimetypes: Optional[List[str]] = None
+        supported_mimetypes: Optional[List[str]] = None,
+        max_workers: int = 1,
+        dedup_batch_size: int = 256,
+        dedup_max_delay: float = 0.05,
+        fingerprint_cache: Optional[FingerprintCache] = None,
+        defer_full_hash: bool = False,
+        allow_encrypted: bool = False,
+        io_policy: IOPolicy = IOPolicy.DEFAULT,
     ):
+        """Initialize validator.
+        
+        Args:
+            db_client: Database client used for duplicate checks
+            max_file_size: Maximum allowed file size in bytes
+            supported_mimetypes: Accepted mime types, defaults to PDF types
+            max_workers: Number of threads used to validate files concurrently.
+                         Hashing and libmagic release the GIL, so values > 1 overlap
+                         file I/O. A value of 1 validates files sequentially.
+            dedup_batch_size: Number of hashed files resolved per batched duplicate
+                              lookup when validating many files
+            dedup_max_delay: Longest time in seconds :meth:`iter_validate_files`
+                             holds a valid file back to batch its duplicate lookup
+            fingerprint_cache: Optional cache of hashes and mime types for files
+                               that have not changed since they were last probed
+            defer_full_hash: Screen duplicates with a size + head/tail quick hash and
+                             only compute the full SHA-256 when the quick hash collides
+                             with an existing document or another file in the batch.
+                             Valid files that pass the prefilter carry no ``file_hash``;
+                             it is computed when the document is stored and indexed.
+            allow_encrypted: Accept PDFs whose trailer declares encryption
+            io_policy: Page-cache policy for hashing, see ``IOPolicy``
+        """
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be >= 1, got {max_workers}")
         self.db_client = db_client
         self.max_file_size = max_file_size
+        self.max_workers = max_workers
+        self.dedup_batch_size = dedup_batch_size
+        self.dedup_max_delay = dedup_max_delay
+        self.fingerprint_cache = fingerprint_cache
+        self.defer_full_hash = defer_full_hash
+        self.allow_encrypted = allow_encrypted
+        self.io_policy = IOPolicy(io_policy)
         self.supported_mimetypes = supported_mimetypes or [
             'application/pdf',
             'application/x-pdf',
         ]
+        self.pipeline = ValidationPipeline(self._default_checks())
     
-    def _validate_single_file(self, filepath: Path) -> ValidationResult:
-        """Validate a single file against all validation checks.
+    def _default_checks(self) -> List[ValidationCheck]:
+        """Build the standard checks, bound to this validator's configuration."""
+        checks = [
+            ValidationCheck(
+                name="file_size",
+                cost=CheckCost.METADATA,
+                provides="file_size",
+                func=self._check_size,
+            ),
+            ValidationCheck(
+                name="mime_type",
+                cost=CheckCost.HEADER,
+                provides="mime_type",
+                func=self._check_mime_type,
+            ),
+            ValidationCheck(
+                name="pdf_structure",
+                cost=CheckCost.HEADER,
+                requires=frozenset({"mime_type"}),
+                func=self._check_pdf_structure,
+            ),
+        ]
+        if self.defer_full_hash:
+            # Duplicates are resolved in _resolve_duplicates from the quick hash
+            checks.append(ValidationCheck(
+                name="quick_hash",
+                cost=CheckCost.HEADER,
+                provides="quick_hash",
+                func=self._check_quick_hash,
+            ))
+            return checks
+        
+        checks += [
+            ValidationCheck(
+                name="file_hash",
+                cost=CheckCost.CONTENT,
+                provides="file_hash",
+                func=self._check_hash,
+            ),
+            ValidationCheck(
+                name=HASH_UNIQUE_CHECK,
+                cost=CheckCost.DATABASE,
+                requires=frozenset({"file_hash"}),
+                func=self._check_unique,
+            ),
+        ]
+        return checks
+
+    def _check_size(self, probe: FileProbe, values: Dict[str, Any]) -> Union[int, ValidationCheckFailure]:
+        return check_file_size(probe.filepath, self.max_file_size, probe=probe)
+
+    def _check_mime_type(self, probe: FileProbe, values: Dict[str, Any]) -> Union[str, ValidationCheckFailure]:
+        return check_mime_type(probe.filepath, self.supported_mimetypes, probe=probe)
+
+    def _check_pdf_structure(self, probe: FileProbe, values: Dict[str, Any]) -> Union[bool, ValidationCheckFailure]:
+        if values["mime_type"] not in PDF_MIME_TYPES:
+            return True
+        # An unchanged file whose fingerprint recorded a structure verdict is
+        # not opened again; the verdict is rechecked against this validator's
+        # encryption setting
+        if not probe.from_cache or probe.pdf_encrypted is None:
+            return check_pdf_structure(probe.filepath, probe, allow_encrypted=self.allow_encrypted)
+        if probe.pdf_encrypted and not self.allow_encrypted:
+            return encrypted_pdf(probe.filepath)
+        return True
+
+    def _check_hash(self, probe: FileProbe, values: Dict[str, Any]) -> Union[str, ValidationCheckFailure]:
+        return check_file_hash(probe.filepath, probe=probe)
+
+    def _check_quick_hash(self, probe: FileProbe, values: Dict[str, Any]) -> Union[str, ValidationCheckFailure]:
+        return check_quick_hash(probe.filepath, probe=probe)
+
+    def _check_unique(self, probe: FileProbe, values: Dict[str, Any]) -> Union[bool, ValidationCheckFailure]:
+        return check_hash_unique(probe.filepath, values["file_hash"], self.db_client)
+
+    def _validate_single_file(self, filepath: Path, check_unique: bool = True) -> ValidationResult:
+        """Validate a single file against all registered validation checks.
         
-        Checks are performed in order of severity and cost:
+        The file is probed once and the probe feeds every check. With the
+        default checks the order is:
         1. File existence (fail fast if not found)
-        2. File hash (needed for deduplication, fail if corrupted)
-        3. Mime type (fail if unsupported type)
-        4. File size (fail if too large)
-        5. Hash uniqueness (fail if duplicate)
+        2. File size (stat only, fail if too large)
+        3. Mime type (first block only, fail if unsupported type)
+        4. PDF structure (header and trailer pages only, fail if truncated,
+           malformed or encrypted)
+        5. File hash (full read, fail if corrupted), or the head/tail quick hash
+           when ``defer_full_hash`` is set
+        6. Hash uniqueness (fail if duplicate), skipped when ``check_unique`` is
+           False so batch callers can resolve duplicates with one lookup
         """
-        # Check file exists
-        exists_result = check_file_exists(filepath)
-        if isinstance(exists_result, ValidationCheckFailure):
-            return ValidationResult(
-                filepath=filepath,
-                is_valid=False,
-                check_failures=[exists_result]
-            )
+        skip = frozenset() if check_unique else frozenset({HASH_UNIQUE_CHECK})
+        result = self.pipeline.run(
+            filepath, skip=skip, cache=self.fingerprint_cache, io_policy=self.io_policy
+        )
+        if self.defer_full_hash and check_unique:
+            [(_, result)] = self._resolve_duplicates([(0, result)], {}, {})
+        return result
+    
+    def _iter_checked_files(
+        self,
+        filepaths: Iterable[Path],
+        report_idle: bool = False
+    ) -> Iterator[Optional[Tuple[int, ValidationResult]]]:
+        """Run the per-file checks and yield (input index, result) pairs in completion order.
+        
+        Hash uniqueness is not checked here, see :meth:`_resolve_duplicates`.
+        With ``report_idle`` a None is yielded whenever the next result is not
+        ready yet, so callers can do pending work instead of waiting.
+        """
+        try:
+            yield from self._run_checks(self._preloaded(filepaths), report_idle)
+        finally:
+            if self.fingerprint_cache is not None:
+                self.fingerprint_cache.flush()
 
-        # Check file can be hashed
-        hash_result = check_file_hash(filepath)
-        if isinstance(hash_result, ValidationCheckFailure):
-            return ValidationResult(
-                filepath=filepath,
-                is_valid=False,
-                check_failures=[hash_result]
-            )
-        file_hash = hash_result
+    def _path_batches(self, filepaths: Iterable[Path]) -> Iterator[List[Path]]:
+        """Split the input into lists of up to ``dedup_batch_size`` paths."""
+        iterator = iter(filepaths)
+        while batch := list(islice(iterator, self.dedup_batch_size)):
+            yield batch
+
+    def _preloaded(self, filepaths: Iterable[Path]) -> Iterator[Path]:
+        """Yield the input paths, preloading cached fingerprints one batch ahead of the checks.
+        
+        One batched query per ``dedup_batch_size`` files replaces a query per file.
+        Without a cache the input is passed through without reading ahead.
+        """
+        if self.fingerprint_cache is None:
+            yield from filepaths
+            return
+        for batch in self._path_batches(filepaths):
+            self.fingerprint_cache.preload(batch)
+            yield from batch
+
+    def _run_checks(
+        self,
+        filepaths: Iterable[Path],
+        report_idle: bool = False
+    ) -> Iterator[Optional[Tuple[int, ValidationResult]]]:
+        """Dispatch per-file checks sequentially or to the bounded thread pool.
+        
+        At most ``2 * max_workers`` files are in flight at once so arbitrarily
+        large (or lazy) inputs never get materialized as futures up front.
+        """
+        if self.max_workers == 1:
+            for index, filepath in enumerate(filepaths):
+                yield index, self._validate_single_file(filepath, check_unique=False)
+            return
+
+        max_in_flight = 2 * self.max_workers
+        pending: Dict[Future, int] = {}
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="ragnostic-validate",
+        ) as executor:
+            for index, filepath in enumerate(filepaths):
+                if len(pending) >= max_in_flight:
+                    yield from self._collect_completed(pending, report_idle)
+                pending[executor.submit(self._validate_single_file, filepath, False)] = index
+
+            while pending:
+                yield from self._collect_completed(pending, report_idle)
+
+    @staticmethod
+    def _collect_completed(
+        pending: Dict[Future, int],
+        report_idle: bool
+    ) -> Iterator[Optional[Tuple[int, ValidationResult]]]:
+        """Wait for at least one future and yield the (input index, result) pairs that are done."""
+        done, _ = wait(pending, timeout=0)
+        if not done:
+            if report_idle:
+                yield None
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield pending.pop(future), future.result()
+
+    def _hash_prefilter_collisions(
+        self,
+        checked: List[Tuple[int, ValidationResult]],
+        seen_hashes: Dict[str, Path],
+        seen_quick_hashes: Dict[str, Tuple[int, Path, Optional[str]]]
+    ) -> List[Tuple[int, ValidationResult]]:
+        """Compute full hashes only for files whose quick hash may be a duplicate.
+        
+        A file needs its full SHA-256 when its quick hash collides with an
+        existing document or with an earlier file of this run. In the latter
+        case the earlier file is hashed too, so the full-hash comparison can
+        tell true duplicates from prefilter collisions. ``seen_quick_hashes``
+        maps each quick hash to the first file of the run that had it, with
+        its full hash once known, so that file is hashed at most once.
+        """
+        prefiltered = [
+            result for _, result in checked
+            if result.is_valid and result.quick_hash and not result.file_hash
+        ]
+        if not prefiltered:
+            return checked
+        
+        start = time.perf_counter()
+        collisions = self.db_client.get_prefilter_collisions(
+            [(result.quick_hash, result.file_size_bytes) for result in prefiltered]
+        )
+        lookup_per_file = (time.perf_counter() - start) / len(prefiltered)
+        
+        resolved: List[Tuple[int, ValidationResult]] = []
+        for index, result in checked:
+            if not (result.is_valid and result.quick_hash and not result.file_hash):
+                resolved.append((index, result))
+                continue
             
-        # Check mime type
-        mime_result = check_mime_type(filepath, self.supported_mimetypes)
-        if isinstance(mime_result, ValidationCheckFailure):
-            return ValidationResult(
-                filepath=filepath,
-                is_valid=False,
-                check_failures=[mime_result]
+            timings = {**result.check_timings, HASH_UNIQUE_CHECK: lookup_per_file}
+            earlier_index, earlier_path, earlier_hash = seen_quick_hashes.setdefault(
+                result.quick_hash, (index, result.filepath, None)
             )
-        mime_type = mime_result
+            seen_earlier = earlier_index != index
+            if seen_earlier and earlier_hash is None:
+                # The earlier file passed on its quick hash alone, so hash it
+                # now, once per run however many later files collide with it
+                earlier_hash = compute_file_hash(
+                    earlier_path, cache=self.fingerprint_cache, io_policy=self.io_policy
+                )
+                if earlier_hash:
+                    seen_hashes.setdefault(earlier_hash, earlier_path)
+                    seen_quick_hashes[result.quick_hash] = (earlier_index, earlier_path, earlier_hash)
             
-        # Check file size
-        size_result = check_file_size(filepath, self.max_file_size)
-        if isinstance(size_result, ValidationCheckFailure):
-            return ValidationResult(
-                filepath=filepath,
-                is_valid=False, 
-                check_failures=[size_result]
-            )
-        file_size = size_result
+            if seen_earlier or result.quick_hash in collisions:
+                start = time.perf_counter()
+                file_hash = compute_file_hash(
+                    result.filepath, cache=self.fingerprint_cache, io_policy=self.io_policy
+                )
+                timings["file_hash"] = time.perf_counter() - start
+                if file_hash is None:
+                    result = ValidationResult(
+                        filepath=result.filepath,
+                        is_valid=False,
+                        check_failures=[ValidationCheckFailure(
+                            filepath=result.filepath,
+                            check_type=ValidationCheckType.CORRUPTED_FILE,
+                            message="Unable to compute file hash"
+                        )],
+                        check_timings=timings,
+                    )
+                    resolved.append((index, result))
+                    continue
+                result = result.model_copy(update={"file_hash": file_hash})
+                if not seen_earlier:
+                    seen_quick_hashes[result.quick_hash] = (index, result.filepath, file_hash)
             
-        # Check hash uniqueness
-        unique_result = check_hash_unique(filepath, file_hash, self.db_client)
-        if isinstance(unique_result, ValidationCheckFailure):
-            return ValidationResult(
-                filepath=filepath,
-                is_valid=False,
-                check_failures=[unique_result]
-            )
-                
-        # All checks passed, return successful validation
-        return ValidationResult(
-            filepath=filepath,
-            is_valid=True,
-            file_hash=file_hash,
-            mime_type=mime_type,
-            file_size_bytes=file_size,
-            check_failures=[],
-        )
-    
+            resolved.append((index, result.model_copy(update={"check_timings": timings})))
+        return resolved
+
+    def _resolve_duplicates(
+        self,
+        checked: List[Tuple[int, ValidationResult]],
+        seen_hashes: Dict[str, Path],
+        seen_quick_hashes: Dict[str, Tuple[int, Path, Optional[str]]]
+    ) -> List[Tuple[int, ValidationResult]]:
+        """Apply the hash uniqueness check to checked results with one batched lookup.
+        
+        Results are processed in input order so that, among files sharing a hash,
+        the earliest one is kept and the rest are rejected as duplicates. With
+        ``defer_full_hash`` only files that collide on the quick hash prefilter
+        are fully hashed and compared.
+        """
+        checked = sorted(checked, key=lambda item: item[0])
+        if self.defer_full_hash:
+            checked = self._hash_prefilter_collisions(checked, seen_hashes, seen_quick_hashes)
+        hashed = [
+            (result.filepath, result.file_hash)
+            for _, result in checked
+            if result.is_valid and result.file_hash
+        ]
+        if not hashed:
+            return checked
+        
+        start = time.perf_counter()
+        unique_results = iter(check_hashes_unique(hashed, self.db_client, seen_hashes))
+        # The lookup is shared by the batch, so each file is charged an equal share
+        elapsed_per_file = (time.perf_counter() - start) / len(hashed)
+        
+        resolved: List[Tuple[int, ValidationResult]] = []
+        for index, result in checked:
+            if result.is_valid and result.file_hash:
+                timings = {
+                    **result.check_timings,
+                    HASH_UNIQUE_CHECK: result.check_timings.get(HASH_UNIQUE_CHECK, 0.0) + elapsed_per_file,
+                }
+                unique_result = next(unique_results)
+                if isinstance(unique_result, ValidationCheckFailure):
+                    result = ValidationResult(
+                        filepath=result.filepath,
+                        is_valid=False,
+                        check_failures=[unique_result],
+                        check_timings=timings,
+                    )
+                else:
+                    result = result.model_copy(update={"check_timings": timings})
+            resolved.append((index, result))
+        return resolved
+
+    def _iter_indexed_results(self, filepaths: Iterable[Path]) -> Iterator[Tuple[int, ValidationResult]]:
+        """Yield fully validated (input index, result) pairs as they become available.
+        
+        Failed files are yielded immediately. Files that pass the per-file checks
+        wait until every earlier input has been checked, so that among files
+        sharing a hash the earliest in input order is kept whatever order the
+        workers finish in. Ready files are then resolved against the database
+        in one batched lookup once ``dedup_batch_size`` of them accumulate, the
+        oldest has waited ``dedup_max_delay`` seconds, or no further check has
+        completed yet.
+        """
+        seen_hashes: Dict[str, Path] = {}
+        seen_quick_hashes: Dict[str, Tuple[int, Path, Optional[str]]] = {}
+        pending = _PendingResolution(self.dedup_batch_size, self.dedup_max_delay)
+        for item in self._iter_checked_files(filepaths, report_idle=True):
+            now = time.monotonic()
+            if item is not None:
+                index, result = item
+                pending.add(index, result, now)
+                if not result.is_valid:
+                    yield index, result
+            for batch in pending.take(idle=item is None, now=now):
+                yield from self._resolve_duplicates(batch, seen_hashes, seen_quick_hashes)
+        
+        for batch in pending.take_all():
+            yield from self._resolve_duplicates(batch, seen_hashes, seen_quick_hashes)
+
+    def iter_validate_files(self, filepaths: Iterable[Path]) -> Iterator[ValidationResult]:
+        """Validate files and yield each result as soon as it can be decided.
+        
+        With ``max_workers > 1`` results arrive in completion order, which lets
+        callers start on the first valid files while the rest are still being
+        hashed. A valid file is held back only until every earlier input has
+        been checked, so duplicates resolve in input order, and for at most
+        ``dedup_max_delay`` seconds while workers keep completing files, so
+        its duplicate lookup can be batched with theirs. Use
+        :meth:`validate_files` for input-ordered batch results.
+        """
+        for _, result in self._iter_indexed_results(filepaths):
+            yield result
+
+    async def validate_files_async(
+        self,
+        filepaths: Iterable[Path],
+        max_concurrency: Optional[int] = None
+    ) -> AsyncIterator[ValidationResult]:
+        """Validate files without blocking the event loop, yielding results as they complete.
+        
+        Per-file checks run on a dedicated thread pool with at most
+        ``max_concurrency`` files in flight. Valid files are released and
+        resolved against the database as in :meth:`iter_validate_files`: in
+        input order, in batches of up to ``dedup_batch_size`` that are taken
+        as soon as no check has a result waiting or the oldest valid file has
+        waited ``dedup_max_delay`` seconds. The lookups run one batch at a time
+        in the loop's default executor. At most ``max_concurrency`` results
+        wait for the consumer; beyond that no new files are checked until it
+        catches up.
+        
+        Args:
+            filepaths: Files to validate
+            max_concurrency: Maximum number of files checked at once, defaults
+                             to ``max_workers``
+        
+        Raises:
+            ValueError: If max_concurrency < 1
+        
+        Example:
+            async for result in validator.validate_files_async(paths):
+                if result.is_valid:
+                    ...
+        """
+        limit = max_concurrency if max_concurrency is not None else self.max_workers
+        if limit < 1:
+            raise ValueError(f"max_concurrency must be >= 1, got {limit}")
+        
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=limit, thread_name_prefix="ragnostic-validate")
+        slots = asyncio.Semaphore(limit)
+        # Both queues are bounded so a slow consumer stalls the checks instead
+        # of buffering results: ``checked`` feeds the resolver, ``queue`` the caller
+        checked: asyncio.Queue = asyncio.Queue(maxsize=limit)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=limit)
+        finished = object()
+        tasks: Set[asyncio.Task] = set()
+        
+        def spawn(coro) -> None:
+            task = asyncio.ensure_future(coro)
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        
+        async def check(index: int, filepath: Path) -> None:
+            # The slot is held until the result is queued, so the queue bound
+            # holds back new checks
+            try:
+                try:
+                    result = await loop.run_in_executor(executor, self._validate_single_file, filepath, False)
+                except Exception as error:
+                    await checked.put(error)
+                    return
+                await checked.put((index, result))
+            finally:
+                slots.release()
+        
+        async def produce() -> None:
+            try:
+                batches = [filepaths] if self.fingerprint_cache is None else self._path_batches(filepaths)
+                index = 0
+                for batch in batches:
+                    if self.fingerprint_cache is not None:
+                        await loop.run_in_executor(None, self.fingerprint_cache.preload, batch)
+                    for filepath in batch:
+                        await slots.acquire()
+                        spawn(check(index, filepath))
+                        index += 1
+                while tasks:
+                    await asyncio.wait(set(tasks))
+            except Exception as error:
+                await checked.put(error)
+                return
+            await checked.put(finished)
+        
+        async def resolve() -> None:
+            # Batches are resolved one at a time, in input order, so the
+            # earliest of several duplicates is kept
+            seen_hashes: Dict[str, Path] = {}
+            seen_quick_hashes: Dict[str, Tuple[int, Path, Optional[str]]] = {}
+            pending = _PendingResolution(self.dedup_batch_size, self.dedup_max_delay)
+            
+            async def emit(batches: List[List[Tuple[int, ValidationResult]]]) -> None:
+                for batch in batches:
+                    resolved = await loop.run_in_executor(
+                        None, self._resolve_duplicates, batch, seen_hashes, seen_quick_hashes
+                    )
+                    for _, result in resolved:
+                        await queue.put(result)
+            
+            try:
+                while True:
+                    if checked.empty():
+                        # No check has finished, so resolve what is ready rather than wait
+                        await emit(pending.take(idle=True, now=time.monotonic()))
+                    item = await checked.get()
+                    if item is finished:
+                        break
+                    if isinstance(item, Exception):
+                        await queue.put(item)
+                        return
+                    index, result = item
+                    now = time.monotonic()
+                    pending.add(index, result, now)
+                    if not result.is_valid:
+                        await queue.put(result)
+                    await emit(pending.take(idle=False, now=now))
+                await emit(pending.take_all())
+                if self.fingerprint_cache is not None:
+                    await loop.run_in_executor(None, self.fingerprint_cache.flush)
+            except Exception as error:
+                await queue.put(error)
+                return
+            await queue.put(finished)
+        
+        producer = asyncio.ensure_future(produce())
+        resolver = asyncio.ensure_future(resolve())
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            producer.cancel()
+            resolver.cancel()
+            for task in list(tasks):
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def validate_files(self, filepaths: List[Path]) -> BatchValidationResult:
-        """Validate multiple files and return batch results."""
-        results = BatchValidationResult()
+        """Validate multiple files and return batch results.
+        
+        Files are validated concurrently when ``max_workers > 1``, but the
+        valid and invalid lists always preserve the input order. Duplicate
+        hashes are resolved in batches after hashing, both against the
+        database and between files of the same batch.
+        """
+        checked = sorted(self._iter_checked_files(filepaths), key=lambda item: item[0])
         
-        for filepath in filepaths:
-            result = self._validate_single_file(filepath)
+        seen_hashes: Dict[str, Path] = {}
+        seen_quick_hashes: Dict[str, Tuple[int, Path, Optional[str]]] = {}
+        ordered: Dict[int, ValidationResult] = {}
+        for start in range(0, len(checked), self.dedup_batch_size):
+            chunk = checked[start:start + self.dedup_batch_size]
+            ordered.update(self._resolve_duplicates(chunk, seen_hashes, seen_quick_hashes))
+        
+        results = BatchValidationResult()
+        for index in sorted(ordered):
+            result = ordered[index]
             if result.is_valid:
                 results.valid_files.append(result)
             else:
                 results.invalid_files.append(result)
         
-        return results
\ No newline at end of file
+        return results
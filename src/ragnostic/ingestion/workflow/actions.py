@@ -1,28 +1,35 @@
 """Action definitions for document ingestion workflow."""
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from burr.core import State, action
 
 from ragnostic.db.client import DatabaseClient
-from ragnostic.ingestion.monitor import DirectoryMonitor, MonitorStatus
-from ragnostic.ingestion.validation import DocumentValidator
-from ragnostic.ingestion.processor import DocumentProcessor
+from ragnostic.ingestion.iopolicy import IOPolicy
+from ragnostic.ingestion.monitor import DirectoryMonitor, MonitorStatus, ScanManifest, ScanOutcome
+from ragnostic.ingestion.validation import DocumentValidator, FingerprintCache, ValidationCheckType
+from ragnostic.ingestion.processor import DocumentProcessor, StorageBackend, StorageLayout, StorageStrategy
 from ragnostic.ingestion.indexing import DocumentIndexer
 
 
 @action(reads=[], writes=["monitor_result","error"])
-def monitor_action(state: State, ingest_dir: str) -> State:
+def monitor_action(
+    state: State,
+    ingest_dir: str,
+    scan_manifest: Optional[ScanManifest] = None,
+) -> State:
     """Monitor directory for new files to process.
     
     Args:
         state: Current workflow state
         ingest_dir: Directory path to monitor
+        scan_manifest: Optional manifest limiting results to files changed
+                       since the previous run
         
     Returns:
         Updated state with monitor_result
     """
-    monitor = DirectoryMonitor()
+    monitor = DirectoryMonitor(manifest=scan_manifest)
     result = monitor.get_ingestible_files(ingest_dir)
     
     if result.status == MonitorStatus.ERROR:
@@ -41,7 +48,12 @@ def monitor_action(state: State, ingest_dir: str) -> State:
 def validation_action(
     state: State,
     db_client: DatabaseClient,
-    max_file_size: int = 100 * 1024 * 1024  # 100MB default
+    max_file_size: int = 100 * 1024 * 1024,  # 100MB default
+    max_workers: int = 1,
+    fingerprint_cache: Optional[FingerprintCache] = None,
+    defer_full_hash: bool = False,
+    scan_manifest: Optional[ScanManifest] = None,
+    io_policy: IOPolicy = IOPolicy.DEFAULT,
 ) -> State:
     """Validate monitored files.
     
@@ -49,6 +61,11 @@ def validation_action(
         state: Current workflow state
         db_client: Database client for duplicate checks
         max_file_size: Maximum allowed file size in bytes
+        max_workers: Number of concurrent validation threads
+        fingerprint_cache: Optional cache used to skip hashing unchanged files
+        defer_full_hash: Screen duplicates with the quick hash prefilter first
+        scan_manifest: Optional manifest in which rejected files are recorded
+        io_policy: Page-cache policy for hashing
         
     Returns:
         Updated state with validation results
@@ -62,10 +79,23 @@ def validation_action(
         
     validator = DocumentValidator(
         db_client=db_client,
-        max_file_size=max_file_size
+        max_file_size=max_file_size,
+        max_workers=max_workers,
+        fingerprint_cache=fingerprint_cache,
+        defer_full_hash=defer_full_hash,
+        io_policy=io_policy,
     )
     
     validation_result = validator.validate_files(monitor_result.files)
+    if scan_manifest is not None:
+        scan_manifest.record_outcomes({
+            result.filepath: (
+                ScanOutcome.FAILED
+                if any(f.check_type == ValidationCheckType.PERMISSION_ERROR for f in result.check_failures)
+                else ScanOutcome.REJECTED
+            )
+            for result in validation_result.invalid_files
+        })
     return state.update(validation_result=validation_result, error=None)
 
 
@@ -73,12 +103,31 @@ def validation_action(
     reads=["validation_result"],
     writes=["processing_result","error"]
 )
-def processing_action(state: State, storage_dir: str) -> State:
+def processing_action(
+    state: State,
+    storage_dir: str,
+    scan_manifest: Optional[ScanManifest] = None,
+    storage_strategy: StorageStrategy = StorageStrategy.COPY,
+    storage_layout: StorageLayout = StorageLayout.FLAT,
+    max_workers: int = 1,
+    max_bytes_per_second: Optional[float] = None,
+    durable: bool = False,
+    io_policy: IOPolicy = IOPolicy.DEFAULT,
+    backend: Optional[StorageBackend] = None,
+) -> State:
     """Process validated documents.
     
     Args:
         state: Current workflow state
         storage_dir: Directory for processed document storage
+        storage_strategy: How documents are placed in storage
+        storage_layout: Flat or content-addressed storage layout
+        max_workers: Number of documents stored concurrently
+        max_bytes_per_second: Optional cap on the combined copy rate
+        durable: Group-commit fsync stored documents before reporting them
+        io_policy: Page-cache policy for copies
+        backend: Optional storage backend used instead of ``storage_dir``
+        scan_manifest: Optional manifest in which failed files are recorded
         
     Returns:
         Updated state with processing results
@@ -92,12 +141,31 @@ def processing_action(state: State, storage_dir: str) -> State:
     
     # Get valid file paths
     valid_files = [result.filepath for result in validation_result.valid_files]
+    file_hashes = {
+        result.filepath: result.file_hash
+        for result in validation_result.valid_files
+        if result.file_hash
+    }
     
-    processor = DocumentProcessor()
+    processor = DocumentProcessor(
+        storage_strategy=storage_strategy,
+        storage_layout=storage_layout,
+        max_workers=max_workers,
+        max_bytes_per_second=max_bytes_per_second,
+        durable=durable,
+        io_policy=io_policy,
+        backend=backend,
+    )
     processing_result = processor.process_documents(
         file_paths=valid_files,
-        storage_dir=Path(storage_dir)
+        storage_dir=Path(storage_dir),
+        file_hashes=file_hashes,
     )
+    if scan_manifest is not None:
+        scan_manifest.record_outcomes({
+            result.original_path: ScanOutcome.FAILED
+            for result in processing_result.failed_docs
+        })
     
     return state.update(processing_result=processing_result, error=None)
 
@@ -109,7 +177,9 @@ def processing_action(state: State, storage_dir: str) -> State:
 def indexing_action(
     state: State,
     db_client: DatabaseClient,
-    text_preview_chars: int = 1000
+    text_preview_chars: int = 1000,
+    fingerprint_cache: Optional[FingerprintCache] = None,
+    scan_manifest: Optional[ScanManifest] = None,
 ) -> State:
     """Index processed documents.
     
@@ -117,6 +187,8 @@ def indexing_action(
         state: Current workflow state
         db_client: Database client for document indexing
         text_preview_chars: Number of characters for text preview
+        fingerprint_cache: Optional cache used to skip hashing unchanged files
+        scan_manifest: Optional manifest in which indexing outcomes are recorded
         
     Returns:
         Updated state with indexing results
@@ -127,16 +199,43 @@ def indexing_action(
             indexing_result=None,
             error="No successfully processed documents to index"
         )
-    # Get successful document paths
+    # Get successful document paths and their IDs. Documents stored in a
+    # remote backend are indexed from their local source.
     successful_paths = [
-        Path(result.storage_path)
+        Path(result.storage_path or result.original_path)
+        for result in processing_result.successful_docs
+    ]
+    raw_file_paths = [
+        result.storage_uri if result.storage_path is None else None
         for result in processing_result.successful_docs
     ]
+    doc_ids = [result.doc_id for result in processing_result.successful_docs]
+    # Hashes recorded while copying, so the indexer need not re-read the files
+    file_hashes = [result.file_hash for result in processing_result.successful_docs]
     
     indexer = DocumentIndexer(
         db_client=db_client,
-        text_preview_chars=text_preview_chars
+        text_preview_chars=text_preview_chars,
+        fingerprint_cache=fingerprint_cache,
     )
     
-    indexing_result = indexer.index_batch(successful_paths)
+    indexing_result = indexer.index_batch(
+        successful_paths, doc_ids=doc_ids, file_hashes=file_hashes, raw_file_paths=raw_file_paths
+    )
+    if scan_manifest is not None:
+        original_paths = {
+            path: result.original_path
+            for path, result in zip(successful_paths, processing_result.successful_docs)
+        }
+        outcomes = {
+            original_paths[result.filepath]: ScanOutcome.INGESTED
+            for result in indexing_result.successful_docs
+            if result.filepath in original_paths
+        }
+        outcomes.update({
+            original_paths[result.filepath]: ScanOutcome.FAILED
+            for result in indexing_result.failed_docs
+            if result.filepath in original_paths
+        })
+        scan_manifest.record_outcomes(outcomes)
     return state.update(indexing_result=indexing_result, error=None)
\ No newline at end of file
@@ -7,7 +7,19 @@ def build_ingestion_workflow(
     storage_dir: str = "./document_storage",
     db_path: str | None = None,
     max_file_size: int = 100 * 1024 * 1024,  # 100MB
-    text_preview_chars: int = 1000
+    text_preview_chars: int = 1000,
+    validation_workers: int = 1,
+    use_fingerprint_cache: bool = False,
+    defer_full_hash: bool = False,
+    use_scan_manifest: bool = False,
+    storage_strategy: str = "copy",
+    storage_layout: str = "flat",
+    storage_workers: int = 1,
+    max_storage_bytes_per_second: float | None = None,
+    durable_storage: bool = False,
+    io_policy: str = "default",
+    storage_backend: "ingestion.StorageBackend | None" = None,
+    db_profile: str | None = None,
 ):
     """Build the document ingestion workflow application.
     
@@ -17,6 +29,33 @@ def build_ingestion_workflow(
         db_path: Optional path to SQLite database. If None creates a new one
         max_file_size: Maximum allowed file size in bytes
         text_preview_chars: Number of characters for text preview
+        validation_workers: Number of threads used to validate files concurrently
+        use_fingerprint_cache: Persist file hashes in the database so unchanged
+                               files are not re-hashed on later runs. Off by
+                               default since it writes a row per new file
+        defer_full_hash: Only fully hash files whose size + head/tail quick hash
+                         collides with a stored document during validation
+        use_scan_manifest: Track scanned files in the database and only ingest
+                           files that are new, modified or previously failed
+        storage_strategy: How documents are placed in storage: "copy", "move",
+                          "hardlink", "reflink" or "auto"
+        storage_layout: "flat" stores files as <doc_id><suffix>; "content_addressed"
+                        stores each distinct file once at ab/cd/<sha256><suffix>
+        storage_workers: Number of documents copied into storage concurrently
+        max_storage_bytes_per_second: Optional cap on the combined copy rate
+        durable_storage: Sync stored documents to disk, in groups, before
+                         they are indexed
+        io_policy: Page-cache use of bulk hashing and copying: "default",
+                   "streaming" (drop each file's pages once read) or "direct"
+                   (O_DIRECT reads). The non-default policies keep ingestion
+                   from evicting pages other services on the host rely on.
+        storage_backend: Optional backend, e.g. an S3Backend, that documents
+                         are stored in instead of ``storage_dir``
+        db_profile: Optional SQLite tuning profile: "ingest" (WAL, relaxed sync,
+                    large cache), "serve" or "safe" (every commit synced).
+                    None keeps SQLite's defaults. The WAL profiles switch the
+                    database file to WAL mode, which persists and adds
+                    ``-wal``/``-shm`` files next to it.
         
     Returns:
         Configured workflow application
@@ -25,18 +64,43 @@ def build_ingestion_workflow(
     pathlib.Path(storage_dir).mkdir(parents=True, exist_ok=True)
     
     # Create database client
-    db_url = db.create_sqlite_url(db_path)
+    db_url = db.create_sqlite_url(db_path, profile=db_profile)
     db_client = db.DatabaseClient(db_url)
+    fingerprint_cache = ingestion.FingerprintCache(db_client) if use_fingerprint_cache else None
+    scan_manifest = ingestion.ScanManifest(db_client) if use_scan_manifest else None
     
     # Build workflow
     app = ApplicationBuilder()
     
     # Add monitor action
     app = app.with_actions(
-        monitor=ingestion.monitor_action, 
-        validation=ingestion.validation_action.bind(db_client=db_client,max_file_size=max_file_size),
-        processing=ingestion.processing_action.bind(storage_dir=storage_dir), 
-        indexing=ingestion.indexing_action.bind(db_client=db_client, text_preview_chars=text_preview_chars),
+        monitor=ingestion.monitor_action.bind(scan_manifest=scan_manifest),
+        validation=ingestion.validation_action.bind(
+            db_client=db_client,
+            max_file_size=max_file_size,
+            max_workers=validation_workers,
+            fingerprint_cache=fingerprint_cache,
+            defer_full_hash=defer_full_hash,
+            scan_manifest=scan_manifest,
+            io_policy=ingestion.IOPolicy(io_policy),
+        ),
+        processing=ingestion.processing_action.bind(
+            storage_dir=storage_dir,
+            scan_manifest=scan_manifest,
+            storage_strategy=ingestion.StorageStrategy(storage_strategy),
+            storage_layout=ingestion.StorageLayout(storage_layout),
+            max_workers=storage_workers,
+            max_bytes_per_second=max_storage_bytes_per_second,
+            durable=durable_storage,
+            io_policy=ingestion.IOPolicy(io_policy),
+            backend=storage_backend,
+        ),
+        indexing=ingestion.indexing_action.bind(
+            db_client=db_client,
+            text_preview_chars=text_preview_chars,
+            fingerprint_cache=fingerprint_cache,
+            scan_manifest=scan_manifest,
+        ),
     )
     
     app = app.with_transitions(
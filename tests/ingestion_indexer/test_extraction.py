@@ -130,4 +130,23 @@ def test_page_chunks_text_concatenation(chunks, expected_preview):
     """Test text concatenation from multiple page chunks."""
     extractor = PDFExtractor()
     metadata = extractor._parse_page_chunks(chunks)
-    assert metadata.text_preview.strip() == expected_preview.strip()
\ No newline at end of file
+    assert metadata.text_preview.strip() == expected_preview.strip()
+
+def test_metadata_extraction_from_cold_storage(tmp_path):
+    """Test a document moved to the compressed tier is extracted via its original path."""
+    pytest.importorskip("zstandard")
+    pymupdf = pytest.importorskip("pymupdf")
+    from ragnostic.ingestion.processor.compression import compress_document
+    
+    pdf_path = tmp_path / "DOC_1.pdf"
+    with pymupdf.open() as doc:
+        for _ in range(3):
+            doc.new_page().insert_text((72, 72), "Cold storage " * 5)
+        doc.save(str(pdf_path))
+    assert compress_document(pdf_path, min_savings=0) is not None
+    
+    metadata, error = PDFExtractor().extract_metadata(pdf_path)
+    
+    assert error is None
+    assert metadata.page_count == 3
+    assert "Cold storage" in metadata.text_preview
@@ -1,10 +1,11 @@
 """Tests for document indexer functionality."""
 from pathlib import Path
-from unittest.mock import patch, Mock, ANY
+from unittest.mock import patch, Mock, ANY, PropertyMock
 import pytest
 
 from ragnostic.ingestion.indexing import DocumentIndexer, IndexingStatus
 from ragnostic.ingestion.indexing.schema import DocumentMetadataExtracted
+from ragnostic.ingestion.validation.checks import FileProbe
 from ragnostic.db.schema import DocumentCreate, DocumentMetadataCreate
 
 def test_indexer_initialization(mock_db_client):
@@ -160,11 +161,46 @@ def test_file_type_validation(mock_db_client, sample_pdf_path, mock_mime_type, e
     """Test handling of different file types."""
     indexer = DocumentIndexer(mock_db_client)
     
-    with patch('magic.from_file', return_value=mock_mime_type):
+    with patch.object(FileProbe, 'mime_type', new_callable=PropertyMock, return_value=mock_mime_type):
         result = indexer.index_document(sample_pdf_path)
     
     assert result.status == expected_status
     if expected_status == IndexingStatus.SUCCESS:
         mock_db_client.create_document.assert_called_once()
     else:
-        mock_db_client.create_document.assert_not_called()
\ No newline at end of file
+        mock_db_client.create_document.assert_not_called()
+def test_indexing_with_explicit_doc_id(mock_db_client, sample_pdf_path):
+    """Test documents stored under another name are indexed with the given ID."""
+    indexer = DocumentIndexer(mock_db_client)
+    
+    with patch('pymupdf4llm.to_markdown', side_effect=Exception("Extraction failed")):
+        indexer.index_batch([sample_pdf_path], doc_ids=["DOC_EXPLICIT"])
+    
+    doc_create = mock_db_client.create_document.call_args[0][0]
+    assert doc_create.id == "DOC_EXPLICIT"
+
+
+def test_indexing_with_known_hash(mock_db_client, sample_pdf_path):
+    """Test a hash recorded during storage is used without re-reading the file."""
+    indexer = DocumentIndexer(mock_db_client)
+    
+    with patch.object(FileProbe, 'file_hash', new_callable=PropertyMock) as file_hash, \
+         patch('pymupdf4llm.to_markdown', side_effect=Exception("Extraction failed")):
+        indexer.index_batch([sample_pdf_path], doc_ids=["DOC1"], file_hashes=["ab" * 32])
+    
+    file_hash.assert_not_called()
+    doc_create = mock_db_client.create_document.call_args[0][0]
+    assert doc_create.file_hash == "ab" * 32
+
+
+def test_indexing_with_remote_location(mock_db_client, sample_pdf_path):
+    """Test documents stored in a remote backend record its URI, not the local source."""
+    indexer = DocumentIndexer(mock_db_client)
+    
+    with patch('pymupdf4llm.to_markdown', side_effect=Exception("Extraction failed")):
+        indexer.index_batch(
+            [sample_pdf_path], doc_ids=["DOC1"], raw_file_paths=["s3://bucket/DOC1.pdf"]
+        )
+    
+    doc_create = mock_db_client.create_document.call_args[0][0]
+    assert doc_create.raw_file_path == "s3://bucket/DOC1.pdf"
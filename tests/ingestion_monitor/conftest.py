@@ -11,3 +11,19 @@ def temp_dir_with_files(tmp_path):
     (tmp_path / "test3.txt").touch()  # Should be ignored
     
     return tmp_path
+
+
+@pytest.fixture
+def nested_dir_with_files(tmp_path):
+    """Create a nested directory tree with test files."""
+    (tmp_path / "top.pdf").touch()
+    (tmp_path / "notes.txt").touch()  # Should be ignored
+    reports = tmp_path / "reports"
+    (reports / "2024").mkdir(parents=True)
+    (reports / "a.pdf").touch()
+    (reports / "2024" / "b.pdf").touch()
+    archive = tmp_path / "archive"
+    archive.mkdir()
+    (archive / "old.pdf").touch()
+    
+    return tmp_path
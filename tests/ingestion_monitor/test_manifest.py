@@ -0,0 +1,88 @@
+"""Tests for incremental scans with a scan manifest."""
+import os
+
+import pytest
+
+from ragnostic.db.client import DatabaseClient
+from ragnostic.ingestion.monitor import DirectoryMonitor, MonitorStatus, ScanManifest, ScanOutcome
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    """Create a scan manifest backed by a temporary database."""
+    return ScanManifest(DatabaseClient(f"sqlite:///{tmp_path / 'manifest.db'}"))
+
+
+@pytest.fixture
+def ingest_dir(tmp_path):
+    """Create an ingest directory with two PDFs."""
+    directory = tmp_path / "ingest"
+    directory.mkdir()
+    (directory / "a.pdf").write_bytes(b"a")
+    (directory / "b.pdf").write_bytes(b"b")
+    return directory.resolve()
+
+
+def test_first_scan_returns_all_files_as_new(manifest, ingest_dir):
+    """Test a scan without a previous manifest reports every file as new."""
+    result = DirectoryMonitor(manifest=manifest).get_ingestible_files(ingest_dir)
+    
+    assert result.status == MonitorStatus.MONITORING
+    assert sorted(result.files) == [ingest_dir / "a.pdf", ingest_dir / "b.pdf"]
+    assert sorted(result.delta.new_files) == sorted(result.files)
+
+
+def test_unprocessed_files_are_returned_until_an_outcome_is_recorded(manifest, ingest_dir):
+    """Test files stay pending until ingested or rejected, and failures are retried."""
+    monitor = DirectoryMonitor(manifest=manifest)
+    monitor.get_ingestible_files(ingest_dir)
+    
+    result = monitor.get_ingestible_files(ingest_dir)
+    assert sorted(result.delta.pending_files) == [ingest_dir / "a.pdf", ingest_dir / "b.pdf"]
+    
+    manifest.record_outcomes({
+        ingest_dir / "a.pdf": ScanOutcome.INGESTED,
+        ingest_dir / "b.pdf": ScanOutcome.FAILED,
+    })
+    result = monitor.get_ingestible_files(ingest_dir)
+    assert result.files == [ingest_dir / "b.pdf"]
+    assert result.delta.unchanged_count == 1
+
+
+def test_scan_reports_modified_and_deleted_files(manifest, ingest_dir):
+    """Test changed files are returned again and removed files are reported."""
+    monitor = DirectoryMonitor(manifest=manifest)
+    monitor.get_ingestible_files(ingest_dir)
+    manifest.record_outcomes({
+        ingest_dir / "a.pdf": ScanOutcome.INGESTED,
+        ingest_dir / "b.pdf": ScanOutcome.REJECTED,
+    })
+    
+    (ingest_dir / "a.pdf").write_bytes(b"changed")
+    os.remove(ingest_dir / "b.pdf")
+    (ingest_dir / "c.pdf").write_bytes(b"c")
+    result = monitor.get_ingestible_files(ingest_dir)
+    
+    assert result.delta.new_files == [ingest_dir / "c.pdf"]
+    assert result.delta.modified_files == [ingest_dir / "a.pdf"]
+    assert result.delta.deleted_files == [ingest_dir / "b.pdf"]
+    assert sorted(result.files) == [ingest_dir / "a.pdf", ingest_dir / "c.pdf"]
+    
+    # The deletion is only reported once
+    assert monitor.get_ingestible_files(ingest_dir).delta.deleted_files == []
+
+
+def test_manifest_tracks_each_root(manifest, ingest_dir, tmp_path):
+    """Test a multi-root scan records and diffs every root separately."""
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "c.pdf").write_bytes(b"c")
+    monitor = DirectoryMonitor(manifest=manifest, scan_workers=2)
+    
+    result = monitor.get_ingestible_files([ingest_dir, other])
+    assert len(result.delta.new_files) == 3
+    
+    os.remove(other / "c.pdf")
+    result = monitor.get_ingestible_files([ingest_dir, other])
+    assert result.delta.deleted_files == [other.resolve() / "c.pdf"]
+    assert len(result.delta.pending_files) == 2
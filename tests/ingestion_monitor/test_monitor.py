@@ -1,8 +1,12 @@
 """Tests for directory monitor functionality."""
+import os
+import threading
+import time
 from pathlib import Path
 import pytest
 
 from ragnostic.ingestion.monitor import DirectoryMonitor, MonitorStatus
+from ragnostic.ingestion.monitor import monitor as monitor_module
 
 def test_monitor_initialization():
     """Test DirectoryMonitor initialization."""
@@ -47,10 +51,10 @@ def test_get_ingestible_files_permission_error(tmp_path, monkeypatch):
     """Test handling of permission errors."""
     monitor = DirectoryMonitor()
     
-    def mock_iterdir(*args):
+    def mock_scandir(*args):
         raise PermissionError("Access denied")
     
-    monkeypatch.setattr(Path, "iterdir", mock_iterdir)
+    monkeypatch.setattr(os, "scandir", mock_scandir)
     result = monitor.get_ingestible_files(tmp_path)
     
     assert result.status == MonitorStatus.ERROR
@@ -63,4 +67,166 @@ def test_get_ingestible_files_custom_extensions(temp_dir_with_files):
     
     assert result.status == MonitorStatus.MONITORING
     assert len(result.files) == 1
-    assert all(f.suffix == '.txt' for f in result.files)
\ No newline at end of file
+    assert all(f.suffix == '.txt' for f in result.files)
+
+def test_get_ingestible_files_top_level_only(nested_dir_with_files):
+    """Test subdirectories are ignored unless recursive is set."""
+    monitor = DirectoryMonitor()
+    result = monitor.get_ingestible_files(nested_dir_with_files)
+    
+    assert {f.name for f in result.files} == {"top.pdf"}
+
+def test_get_ingestible_files_recursive(nested_dir_with_files):
+    """Test recursive scanning returns absolute paths from all levels."""
+    monitor = DirectoryMonitor(recursive=True)
+    result = monitor.get_ingestible_files(nested_dir_with_files)
+    
+    assert result.status == MonitorStatus.MONITORING
+    assert {f.name for f in result.files} == {"top.pdf", "a.pdf", "b.pdf", "old.pdf"}
+    assert all(f.is_absolute() for f in result.files)
+
+def test_get_ingestible_files_max_depth(nested_dir_with_files):
+    """Test max_depth limits how far the scan descends."""
+    monitor = DirectoryMonitor(recursive=True, max_depth=1)
+    result = monitor.get_ingestible_files(nested_dir_with_files)
+    
+    assert {f.name for f in result.files} == {"top.pdf", "a.pdf", "old.pdf"}
+
+def test_get_ingestible_files_include_exclude(nested_dir_with_files):
+    """Test include globs filter files and exclude globs prune directories."""
+    monitor = DirectoryMonitor(recursive=True, exclude=["archive"])
+    result = monitor.get_ingestible_files(nested_dir_with_files)
+    assert {f.name for f in result.files} == {"top.pdf", "a.pdf", "b.pdf"}
+    
+    monitor = DirectoryMonitor(recursive=True, include=["reports/*"])
+    result = monitor.get_ingestible_files(nested_dir_with_files)
+    assert {f.name for f in result.files} == {"a.pdf", "b.pdf"}
+
+def test_iter_ingestible_files_batches(nested_dir_with_files):
+    """Test the generator API yields bounded batches covering every file."""
+    monitor = DirectoryMonitor(recursive=True)
+    batches = list(monitor.iter_ingestible_files(nested_dir_with_files, batch_size=3))
+    
+    assert [len(batch) for batch in batches] == [3, 1]
+    assert len({f for batch in batches for f in batch}) == 4
+
+def test_iter_ingestible_files_skips_unreadable_subdirectory(nested_dir_with_files, monkeypatch):
+    """Test an unreadable subdirectory is skipped without failing the scan."""
+    real_scandir = os.scandir
+    
+    def mock_scandir(path):
+        if str(path).endswith("archive"):
+            raise PermissionError("Access denied")
+        return real_scandir(path)
+    
+    monkeypatch.setattr(os, "scandir", mock_scandir)
+    monitor = DirectoryMonitor(recursive=True)
+    result = monitor.get_ingestible_files(nested_dir_with_files)
+    
+    assert result.status == MonitorStatus.MONITORING
+    assert {f.name for f in result.files} == {"top.pdf", "a.pdf", "b.pdf"}
+
+def test_get_ingestible_files_multiple_roots(tmp_path, nested_dir_with_files):
+    """Test several roots merge into one deduplicated stream."""
+    other = tmp_path.parent / f"{tmp_path.name}_other"
+    other.mkdir()
+    (other / "z.pdf").touch()
+    reports = nested_dir_with_files / "reports"
+    
+    monitor = DirectoryMonitor(recursive=True)
+    result = monitor.get_ingestible_files([nested_dir_with_files, reports, other, nested_dir_with_files])
+    
+    assert result.status == MonitorStatus.MONITORING
+    names = [f.name for f in result.files]
+    assert sorted(names) == ["a.pdf", "b.pdf", "old.pdf", "top.pdf", "z.pdf"]
+
+@pytest.mark.parametrize("scan_workers", [2, 8])
+def test_parallel_scan_matches_sequential_order(nested_dir_with_files, scan_workers):
+    """Test parallel listing yields the same deterministic order as a sequential scan."""
+    for i in range(5):
+        subdir = nested_dir_with_files / f"dir_{i}" / "sub"
+        subdir.mkdir(parents=True)
+        (subdir / f"file_{i}.pdf").touch()
+        (subdir.parent / f"file_{i}.pdf").touch()
+    
+    sequential = DirectoryMonitor(recursive=True).get_ingestible_files(nested_dir_with_files)
+    parallel = DirectoryMonitor(recursive=True, scan_workers=scan_workers).get_ingestible_files(nested_dir_with_files)
+    
+    assert len(sequential.files) == 14
+    assert parallel.files == sequential.files
+    # Breadth first: the top-level file comes before any nested one
+    assert sequential.files[0].name == "top.pdf"
+
+
+@pytest.mark.parametrize("scan_workers", [1, 3])
+def test_large_directory_listed_in_chunks(tmp_path, monkeypatch, scan_workers):
+    """Test a flat directory is handed over in bounded chunks rather than as one listing."""
+    monkeypatch.setattr(monitor_module, "LISTING_CHUNK_SIZE", 3)
+    for i in range(10):
+        (tmp_path / f"file_{i}.pdf").touch()
+    (tmp_path / "b_dir").mkdir()
+    (tmp_path / "a_dir").mkdir()
+    monitor = DirectoryMonitor(recursive=True, scan_workers=scan_workers)
+    
+    events = list(monitor._list_directory(str(tmp_path), "", 0))
+    result = monitor.get_ingestible_files(tmp_path)
+    
+    assert [len(payload) for kind, payload in events if kind == "files"] == [3, 3, 3, 1]
+    assert events[-1] == ("subdirectories", [
+        (str(tmp_path / "a_dir"), "a_dir/", 1),
+        (str(tmp_path / "b_dir"), "b_dir/", 1),
+    ])
+    assert sorted(path.name for path in result.files) == sorted(f"file_{i}.pdf" for i in range(10))
+
+def test_parallel_scan_bounds_in_flight_listings(nested_dir_with_files, monkeypatch):
+    """Test no more than max_in_flight directory listings are outstanding at once."""
+    for i in range(10):
+        (nested_dir_with_files / f"dir_{i}").mkdir()
+    monitor = DirectoryMonitor(recursive=True, scan_workers=4, max_in_flight=2)
+    active = []
+    peak = []
+    lock = threading.Lock()
+    real_list_directory = monitor._list_directory
+    
+    def tracking_list_directory(*args, **kwargs):
+        with lock:
+            active.append(None)
+            peak.append(len(active))
+        time.sleep(0.01)
+        try:
+            yield from real_list_directory(*args, **kwargs)
+        finally:
+            with lock:
+                active.pop()
+    
+    monkeypatch.setattr(monitor, "_list_directory", tracking_list_directory)
+    result = monitor.get_ingestible_files(nested_dir_with_files)
+    
+    assert len(result.files) == 4
+    assert max(peak) <= 2
+
+def test_abandoned_parallel_scan_releases_workers(tmp_path, monkeypatch):
+    """Test listing threads waiting to hand over a chunk exit once the scan is closed."""
+    monkeypatch.setattr(monitor_module, "LISTING_CHUNK_SIZE", 1)
+    for i in range(4):
+        subdir = tmp_path / f"dir_{i}"
+        subdir.mkdir()
+        for j in range(5):
+            (subdir / f"file_{j}.pdf").touch()
+    monitor = DirectoryMonitor(recursive=True, scan_workers=4)
+    
+    batches = monitor.iter_ingestible_files(tmp_path, batch_size=1)
+    next(batches)
+    batches.close()
+    
+    deadline = time.monotonic() + 5
+    while any(t.name.startswith("ragnostic-scan") for t in threading.enumerate()) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not any(t.name.startswith("ragnostic-scan") for t in threading.enumerate())
+
+def test_monitor_rejects_invalid_scan_workers():
+    """Test scan concurrency settings are validated."""
+    with pytest.raises(ValueError):
+        DirectoryMonitor(scan_workers=0)
+    with pytest.raises(ValueError):
+        DirectoryMonitor(max_in_flight=0)
@@ -0,0 +1,157 @@
+"""Tests for inotify watch mode."""
+import os
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from ragnostic.ingestion.monitor import DirectoryMonitor
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+
+SETTLE_TIME = 0.2
+
+
+@pytest.fixture
+def start_watch():
+    """Run a watch in a background thread and collect its batches."""
+    watches = []
+    
+    def start(monitor, directory):
+        batches: queue.Queue = queue.Queue()
+        stop = threading.Event()
+        
+        def run():
+            for batch in monitor.watch(directory, settle_time=SETTLE_TIME, poll_interval=0.05, stop_event=stop):
+                batches.put(batch)
+        
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        watches.append((stop, thread))
+        return batches
+    
+    yield start
+    for stop, thread in watches:
+        stop.set()
+        thread.join(timeout=5)
+
+
+def _collect(batches: queue.Queue, timeout: float = 3.0, expected: int = 1):
+    """Collect files from batches until ``expected`` files arrived or timeout."""
+    files = []
+    deadline = time.monotonic() + timeout
+    while len(files) < expected and time.monotonic() < deadline:
+        try:
+            files.extend(batches.get(timeout=0.05))
+        except queue.Empty:
+            pass
+    return files
+
+
+def _write_old(path: Path, data: bytes = b"%PDF-1.4") -> None:
+    path.write_bytes(data)
+    past = time.time() - 60
+    os.utime(path, (past, past))
+
+
+def test_watch_reconciles_existing_files(tmp_path, start_watch):
+    """Test files present before the watch starts are emitted once."""
+    _write_old(tmp_path / "existing.pdf")
+    (tmp_path / "notes.txt").touch()
+    
+    batches = start_watch(DirectoryMonitor(), tmp_path)
+    
+    assert _collect(batches) == [tmp_path / "existing.pdf"]
+    assert _collect(batches, timeout=0.5) == []
+
+
+def test_watch_emits_new_and_moved_files(tmp_path, start_watch):
+    """Test written and moved-in files are picked up without rescans."""
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    batches = start_watch(DirectoryMonitor(), inbox)
+    time.sleep(0.1)
+    
+    (inbox / "new.pdf").write_bytes(b"%PDF-1.4")
+    _write_old(outside / "moved.pdf")
+    os.rename(outside / "moved.pdf", inbox / "moved.pdf")
+    (inbox / "ignored.txt").write_bytes(b"text")
+    
+    files = _collect(batches, expected=2)
+    assert sorted(files) == [inbox / "moved.pdf", inbox / "new.pdf"]
+
+
+def test_watch_debounces_files_being_written(tmp_path, start_watch):
+    """Test a file is not emitted while it is still being written."""
+    batches = start_watch(DirectoryMonitor(), tmp_path)
+    time.sleep(0.1)
+    
+    with open(tmp_path / "slow.pdf", "wb") as f:
+        for _ in range(4):
+            f.write(b"%PDF-1.4 chunk")
+            f.flush()
+            time.sleep(SETTLE_TIME / 2)
+        assert _collect(batches, timeout=0.01) == []
+    
+    assert _collect(batches) == [tmp_path / "slow.pdf"]
+
+
+def test_watch_recursive_picks_up_new_subdirectories(tmp_path, start_watch):
+    """Test recursive watches follow subdirectories created after startup."""
+    batches = start_watch(DirectoryMonitor(recursive=True), tmp_path)
+    time.sleep(0.1)
+    
+    nested = tmp_path / "a" / "b"
+    nested.mkdir(parents=True)
+    (nested / "deep.pdf").write_bytes(b"%PDF-1.4")
+    
+    assert _collect(batches) == [nested / "deep.pdf"]
+
+
+def test_watch_forgets_files_of_moved_directories(tmp_path, start_watch):
+    """Test files under a directory moved away are emitted again when it comes back."""
+    inbox = tmp_path / "inbox"
+    nested = inbox / "nested"
+    nested.mkdir(parents=True)
+    _write_old(nested / "doc.pdf")
+    batches = start_watch(DirectoryMonitor(recursive=True), inbox)
+    assert _collect(batches) == [nested / "doc.pdf"]
+    
+    os.rename(nested, tmp_path / "parked")
+    time.sleep(0.2)
+    os.rename(tmp_path / "parked", nested)
+    
+    assert _collect(batches) == [nested / "doc.pdf"]
+
+
+def test_settled_files_bounds_emitted_files(tmp_path):
+    """Test only the most recently emitted files are remembered."""
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"doc{i}.pdf"
+        _write_old(path)
+        paths.append(str(path))
+    pending = {path: 0.0 for path in paths}
+    emitted = {}
+    
+    ready = DirectoryMonitor._settled_files(pending, emitted, SETTLE_TIME, max_tracked=2)
+    
+    assert ready == [Path(path) for path in paths]
+    assert list(emitted) == paths[1:]
+
+
+def test_watch_rejects_invalid_max_tracked(tmp_path):
+    """Test the emitted-file bound must be positive."""
+    with pytest.raises(ValueError):
+        next(DirectoryMonitor().watch(tmp_path, max_tracked=0))
+
+
+def test_watch_missing_directory(tmp_path):
+    """Test watching a missing directory raises."""
+    with pytest.raises(FileNotFoundError):
+        next(DirectoryMonitor().watch(tmp_path / "missing"))
@@ -0,0 +1,212 @@
+"""Tests for pluggable storage backends."""
+import hashlib
+import os
+from unittest.mock import patch
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from ragnostic.ingestion.processor import DocumentProcessor, LocalBackend, S3Backend
+from ragnostic.ingestion.processor.backends import MIN_PART_SIZE
+from ragnostic.ingestion.processor.schema import ProcessingStatus, StorageStrategy
+from ragnostic.ingestion.processor.storage import ContentMismatchError
+
+BUCKET = "documents"
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    """S3 client against an in-memory moto stand-in with one bucket."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+@pytest.fixture
+def s3_backend(s3_client):
+    """S3 backend with the smallest allowed part size."""
+    with S3Backend(BUCKET, prefix="raw/", client=s3_client, part_size=MIN_PART_SIZE, max_concurrency=3) as backend:
+        yield backend
+
+
+@pytest.fixture
+def large_pdf(tmp_path):
+    """Document spanning three multipart parts."""
+    path = tmp_path / "large.pdf"
+    path.write_bytes(b"%PDF-1.4\n" + os.urandom(2 * MIN_PART_SIZE + 1024))
+    return path
+
+
+def _sha256(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def test_s3_put_small_document(s3_backend, s3_client, create_pdf_file, sample_pdf_content):
+    """Test small documents are uploaded in one request with their hash as metadata."""
+    source = create_pdf_file("small.pdf")
+    
+    stored = s3_backend.put(source, "DOC_1.pdf", expected_hash=_sha256(source))
+    
+    assert stored.uri == f"s3://{BUCKET}/raw/DOC_1.pdf"
+    assert stored.size_bytes == len(sample_pdf_content)
+    assert stored.file_hash == _sha256(source)
+    assert stored.storage_path is None
+    response = s3_client.get_object(Bucket=BUCKET, Key="raw/DOC_1.pdf")
+    assert response["Body"].read() == sample_pdf_content
+    assert response["Metadata"]["sha256"] == stored.file_hash
+
+
+def test_s3_put_multipart(s3_backend, s3_client, large_pdf):
+    """Test large documents are uploaded in parts and reassembled intact."""
+    with patch.object(s3_client, "upload_part", wraps=s3_client.upload_part) as upload_part:
+        stored = s3_backend.put(large_pdf, "DOC_2.pdf")
+    
+    assert stored.file_hash == _sha256(large_pdf)
+    assert stored.size_bytes == large_pdf.stat().st_size
+    response = s3_client.get_object(Bucket=BUCKET, Key="raw/DOC_2.pdf")
+    assert response["Body"].read() == large_pdf.read_bytes()
+    assert upload_part.call_count == 3
+
+
+def test_s3_multipart_records_known_hash_metadata(s3_backend, s3_client, large_pdf):
+    """Test a multipart upload given its hash carries it as metadata without a copy."""
+    file_hash = _sha256(large_pdf)
+    
+    with patch.object(s3_client, "copy", wraps=s3_client.copy) as copy:
+        s3_backend.put(large_pdf, "DOC_9.pdf", expected_hash=file_hash)
+    
+    response = s3_client.head_object(Bucket=BUCKET, Key="raw/DOC_9.pdf")
+    assert response["Metadata"]["sha256"] == file_hash
+    assert not copy.called
+
+
+@pytest.mark.parametrize("record_hash_metadata", [True, False])
+def test_s3_multipart_unknown_hash_metadata_is_opt_in(s3_client, large_pdf, record_hash_metadata):
+    """Test a multipart upload without a hash is only copied to add metadata when asked to."""
+    file_hash = _sha256(large_pdf)
+    
+    with S3Backend(
+        BUCKET, client=s3_client, part_size=MIN_PART_SIZE, record_hash_metadata=record_hash_metadata
+    ) as backend, patch.object(s3_client, "copy", wraps=s3_client.copy) as copy:
+        stored = backend.put(large_pdf, "DOC_9.pdf")
+    
+    assert stored.file_hash == file_hash
+    response = s3_client.head_object(Bucket=BUCKET, Key="DOC_9.pdf")
+    assert response["ContentLength"] == large_pdf.stat().st_size
+    assert response["Metadata"].get("sha256") == (file_hash if record_hash_metadata else None)
+    assert copy.called == record_hash_metadata
+
+
+def test_s3_multipart_mismatch_aborts(s3_backend, s3_client, large_pdf):
+    """Test a hash mismatch aborts the upload without leaving an object or parts."""
+    with pytest.raises(ContentMismatchError):
+        s3_backend.put(large_pdf, "DOC_3.pdf", expected_hash="0" * 64)
+    
+    assert not s3_backend.exists("DOC_3.pdf")
+    assert not s3_client.list_multipart_uploads(Bucket=BUCKET).get("Uploads")
+
+
+def test_s3_small_mismatch_not_uploaded(s3_backend, create_pdf_file):
+    """Test a small document is verified before it is uploaded."""
+    source = create_pdf_file("small.pdf")
+    
+    with pytest.raises(ContentMismatchError):
+        s3_backend.put(source, "DOC_4.pdf", expected_hash="0" * 64)
+    
+    assert not s3_backend.exists("DOC_4.pdf")
+
+
+def test_s3_read_range(s3_backend, large_pdf):
+    """Test ranged reads return the requested bytes, including across parts."""
+    content = large_pdf.read_bytes()
+    s3_backend.put(large_pdf, "DOC_5.pdf")
+    
+    assert s3_backend.read_range("DOC_5.pdf", 0, 8) == content[:8]
+    offset = MIN_PART_SIZE - 10
+    assert s3_backend.read_range("DOC_5.pdf", offset, 20) == content[offset:offset + 20]
+    with s3_backend.open("DOC_5.pdf") as reader:
+        assert reader.read() == content
+
+
+def test_s3_exists_and_delete(s3_backend, create_pdf_file):
+    """Test existence checks and deletion."""
+    s3_backend.put(create_pdf_file("small.pdf"), "DOC_6.pdf")
+    
+    assert s3_backend.exists("DOC_6.pdf")
+    s3_backend.delete("DOC_6.pdf")
+    assert not s3_backend.exists("DOC_6.pdf")
+    # Deleting a missing key is not an error
+    s3_backend.delete("DOC_6.pdf")
+
+
+def test_s3_invalid_part_size(s3_client):
+    """Test parts below the S3 minimum are rejected."""
+    with pytest.raises(ValueError):
+        S3Backend(BUCKET, client=s3_client, part_size=1024)
+
+
+def test_local_backend(tmp_path, create_pdf_file, sample_pdf_content):
+    """Test the local backend stores, reads and deletes documents."""
+    backend = LocalBackend(tmp_path / "storage")
+    source = create_pdf_file("local.pdf")
+    
+    stored = backend.put(source, "DOC_7.pdf", expected_hash=_sha256(source))
+    
+    assert stored.storage_path == tmp_path / "storage" / "DOC_7.pdf"
+    assert stored.storage_strategy == StorageStrategy.COPY
+    assert stored.storage_path.read_bytes() == sample_pdf_content
+    assert backend.read_range("DOC_7.pdf", 5, 3) == sample_pdf_content[5:8]
+    backend.delete("DOC_7.pdf")
+    assert not backend.exists("DOC_7.pdf")
+
+
+def test_local_backend_mismatch(tmp_path, create_pdf_file):
+    """Test the local backend leaves nothing behind on a hash mismatch."""
+    backend = LocalBackend(tmp_path / "storage")
+    
+    with pytest.raises(ContentMismatchError):
+        backend.put(create_pdf_file("local.pdf"), "DOC_8.pdf", expected_hash="0" * 64)
+    
+    assert list((tmp_path / "storage").iterdir()) == []
+
+
+def test_processor_with_s3_backend(s3_backend, s3_client, tmp_path, large_pdf):
+    """Test the processor stores documents in the backend and keeps input order."""
+    small = tmp_path / "small.pdf"
+    small.write_bytes(b"%PDF-1.4\nsmall")
+    missing = tmp_path / "missing.pdf"
+    processor = DocumentProcessor(max_workers=2, backend=s3_backend)
+    
+    result = processor.process_documents([large_pdf, missing, small], storage_dir=None)
+    
+    assert [r.original_path for r in result.successful_docs] == [large_pdf, small]
+    assert [r.original_path for r in result.failed_docs] == [missing]
+    assert all(r.status == ProcessingStatus.SUCCESS for r in result.successful_docs)
+    stored = result.successful_docs[0]
+    assert stored.storage_path is None
+    assert stored.storage_uri == f"s3://{BUCKET}/raw/{stored.doc_id}.pdf"
+    assert stored.file_hash == _sha256(large_pdf)
+    body = s3_client.get_object(Bucket=BUCKET, Key=f"raw/{stored.doc_id}.pdf")["Body"].read()
+    assert body == large_pdf.read_bytes()
+
+
+def test_processor_backend_mismatch(s3_backend, create_pdf_file):
+    """Test a hash mismatch in the backend is reported as a failed document."""
+    source = create_pdf_file("small.pdf")
+    processor = DocumentProcessor(backend=s3_backend)
+    
+    result = processor.process_documents([source], storage_dir=None, file_hashes={source: "0" * 64})
+    
+    assert result.failed_docs[0].error_code == "HASH_MISMATCH"
+
+
+def test_processor_backend_invalid_configuration(tmp_path):
+    """Test backends cannot be combined with durable group commits."""
+    with pytest.raises(ValueError):
+        DocumentProcessor(backend=LocalBackend(tmp_path), durable=True)
@@ -0,0 +1,175 @@
+"""Tests for content-addressed document storage."""
+import hashlib
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from ragnostic.db.client import DatabaseClient
+from ragnostic.db.schema import DocumentCreate
+from ragnostic.ingestion.processor import ContentAddressedStore, DocumentProcessor, StorageLayout, StorageStrategy
+from ragnostic.ingestion.processor.schema import ProcessingStatus
+
+
+@pytest.fixture
+def storage_dir(tmp_path):
+    """Create an empty storage directory."""
+    directory = tmp_path / "storage"
+    directory.mkdir()
+    return directory
+
+
+@pytest.fixture
+def db_client(tmp_path):
+    """Create a database client backed by a temporary database."""
+    return DatabaseClient(f"sqlite:///{tmp_path / 'test.db'}")
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_store_shards_blobs_by_hash(storage_dir, create_pdf_file, sample_pdf_content):
+    """Test blobs are stored at ab/cd/<sha256>.pdf."""
+    source = create_pdf_file("Report.PDF")
+    file_hash = _sha256(sample_pdf_content)
+    
+    result = ContentAddressedStore(storage_dir).store(source, "DOC1")
+    
+    assert result.status == ProcessingStatus.SUCCESS
+    assert result.storage_path == storage_dir / file_hash[:2] / file_hash[2:4] / f"{file_hash}.pdf"
+    assert result.storage_path.read_bytes() == sample_pdf_content
+    assert source.exists()
+    assert not any(p.name.endswith(".tmp") for p in result.storage_path.parent.iterdir())
+
+
+def test_store_deduplicates_identical_content(storage_dir, create_pdf_file):
+    """Test identical content is stored once."""
+    store = ContentAddressedStore(storage_dir)
+    first = store.store(create_pdf_file("a.pdf"), "DOC1")
+    second = store.store(create_pdf_file("b.pdf"), "DOC2")
+    
+    assert first.storage_path == second.storage_path
+    assert second.storage_strategy is None
+    assert list(store.iter_blobs()) == [first.storage_path]
+
+
+def test_store_uses_known_hash(storage_dir, create_pdf_file, sample_pdf_content):
+    """Test a hash from validation is used instead of re-reading the file."""
+    file_hash = _sha256(sample_pdf_content)
+    
+    with patch("ragnostic.ingestion.processor.cas.compute_file_hash",
+               side_effect=AssertionError("source re-read")):
+        result = ContentAddressedStore(storage_dir).store(create_pdf_file("a.pdf"), "DOC1", file_hash=file_hash)
+    
+    assert result.storage_path.name == f"{file_hash}.pdf"
+    assert result.file_hash == file_hash
+
+
+def test_store_hashes_while_copying(storage_dir, create_pdf_file, sample_pdf_content):
+    """Test an unknown hash is computed from the copy, without a separate pass."""
+    with patch("ragnostic.ingestion.processor.cas.compute_file_hash",
+               side_effect=AssertionError("separate hashing pass")):
+        result = ContentAddressedStore(storage_dir).store(create_pdf_file("a.pdf"), "DOC1")
+    
+    assert result.file_hash == _sha256(sample_pdf_content)
+    assert [p for p in storage_dir.iterdir() if p.name.startswith(".")] == []
+
+
+def test_store_rejects_hash_mismatch(storage_dir, create_pdf_file):
+    """Test a copy that does not match the validated hash is not stored."""
+    store = ContentAddressedStore(storage_dir)
+    
+    result = store.store(create_pdf_file("a.pdf"), "DOC1", file_hash="ab" * 32)
+    
+    assert result.status == ProcessingStatus.STORAGE_ERROR
+    assert result.error_code == "HASH_MISMATCH"
+    assert list(store.iter_blobs()) == []
+    assert not any(p.suffix == ".tmp" for p in storage_dir.rglob("*"))
+
+
+def test_store_move_strategy(storage_dir, create_pdf_file):
+    """Test the move strategy renames the source into the store."""
+    source = create_pdf_file("a.pdf")
+    
+    result = ContentAddressedStore(storage_dir, strategy=StorageStrategy.MOVE).store(source, "DOC1")
+    
+    assert result.status == ProcessingStatus.SUCCESS
+    assert not source.exists()
+    assert result.storage_path.exists()
+
+
+def test_store_missing_source(storage_dir):
+    """Test a missing source file is reported."""
+    result = ContentAddressedStore(storage_dir).store(Path("/nonexistent/a.pdf"), "DOC1")
+    
+    assert result.status == ProcessingStatus.STORAGE_ERROR
+    assert result.error_code == "SOURCE_NOT_FOUND"
+
+
+def test_documents_map_to_blobs(storage_dir, create_pdf_file, db_client):
+    """Test document IDs resolve to blobs and deleting a document removes its blob."""
+    store = ContentAddressedStore(storage_dir, db_client=db_client)
+    result = store.store(create_pdf_file("a.pdf"), "DOC1")
+    db_client.create_document(DocumentCreate(
+        id="DOC1",
+        raw_file_path=str(result.storage_path),
+        file_hash=result.storage_path.stem,
+        file_size_bytes=result.storage_path.stat().st_size,
+        mime_type="application/pdf",
+    ))
+    
+    assert store.get_blob_path("DOC1") == result.storage_path
+    assert store.get_blob_path("MISSING") is None
+    
+    assert store.delete_document("DOC1")
+    assert not result.storage_path.exists()
+    assert list(storage_dir.iterdir()) == []
+    assert db_client.get_document_by_id("DOC1") is None
+
+
+def test_remove_orphans(storage_dir, create_pdf_file, tmp_path, db_client):
+    """Test unreferenced blobs are removed and referenced ones kept."""
+    store = ContentAddressedStore(storage_dir, db_client=db_client)
+    kept = store.store(create_pdf_file("a.pdf"), "DOC1").storage_path
+    orphan_source = tmp_path / "orphan.pdf"
+    orphan_source.write_bytes(b"%PDF-1.4 orphan")
+    orphan = store.store(orphan_source, "DOC2").storage_path
+    db_client.create_document(DocumentCreate(
+        id="DOC1",
+        raw_file_path=str(kept),
+        file_hash=kept.stem,
+        file_size_bytes=kept.stat().st_size,
+        mime_type="application/pdf",
+    ))
+    
+    assert store.remove_orphans() == []  # Too recent
+    assert store.remove_orphans(min_age=0) == [orphan]
+    assert kept.exists()
+    assert not orphan.exists()
+
+
+def test_processor_content_addressed_layout(storage_dir, create_pdf_file):
+    """Test the processor stores documents through the content-addressed layout."""
+    processor = DocumentProcessor(storage_layout=StorageLayout.CONTENT_ADDRESSED)
+    files = [create_pdf_file("a.pdf"), create_pdf_file("b.pdf")]
+    
+    results = processor.process_documents(files, storage_dir)
+    
+    assert results.success_count == 2
+    doc_ids = {result.doc_id for result in results.successful_docs}
+    assert len(doc_ids) == 2
+    assert len({result.storage_path for result in results.successful_docs}) == 1
+
+
+def test_processor_durable_content_addressed_layout(storage_dir, create_pdf_file):
+    """Test durable processing publishes blobs through the group committer."""
+    processor = DocumentProcessor(storage_layout=StorageLayout.CONTENT_ADDRESSED, durable=True)
+    
+    results = processor.process_documents([create_pdf_file("a.pdf")], storage_dir)
+    
+    assert results.success_count == 1
+    result = results.successful_docs[0]
+    assert result.durable
+    assert list(ContentAddressedStore(storage_dir).iter_blobs()) == [result.storage_path]
+    assert [p for p in storage_dir.iterdir() if p.name.startswith(".")] == []
@@ -0,0 +1,112 @@
+"""Tests for the compressed cold storage tier."""
+import os
+import threading
+
+import pytest
+
+zstandard = pytest.importorskip("zstandard")
+
+from ragnostic.db.client import DatabaseClient
+from ragnostic.db.schema import DocumentCreate
+from ragnostic.ingestion.processor import ColdStorageMigrator, ContentAddressedStore, open_document
+from ragnostic.ingestion.processor.compression import compress_document, compressed_path, stored_path
+
+
+@pytest.fixture
+def compressible_pdf(tmp_path):
+    """Create a stored document that compresses well."""
+    path = tmp_path / "DOC_1.pdf"
+    path.write_bytes(b"%PDF-1.4\n" + b"stream of repetitive scanned content\n" * 2000)
+    return path
+
+
+def _age(path, seconds):
+    """Make a file look stored ``seconds`` ago (ctime follows any metadata change)."""
+    return os.stat(path).st_ctime - seconds
+
+
+def test_compress_document(compressible_pdf):
+    """Test a document is replaced by a smaller .zst blob that reads back identically."""
+    content = compressible_pdf.read_bytes()
+    
+    blob_path = compress_document(compressible_pdf)
+    
+    assert blob_path == compressed_path(compressible_pdf)
+    assert blob_path.name == "DOC_1.pdf.zst"
+    assert not compressible_pdf.exists()
+    assert blob_path.stat().st_size < len(content)
+    assert stored_path(compressible_pdf) == blob_path
+    with open_document(compressible_pdf) as reader:
+        assert reader.read() == content
+
+
+def test_incompressible_document_is_kept(tmp_path):
+    """Test a document that does not compress stays in the hot tier."""
+    path = tmp_path / "DOC_2.pdf"
+    path.write_bytes(os.urandom(64 * 1024))
+    
+    assert compress_document(path) is None
+    assert path.exists()
+    assert not compressed_path(path).exists()
+    assert [p.name for p in tmp_path.iterdir()] == ["DOC_2.pdf"]
+
+
+def test_open_document_uncompressed(compressible_pdf):
+    """Test hot documents are opened directly."""
+    with open_document(compressible_pdf) as reader:
+        assert reader.read() == compressible_pdf.read_bytes()
+
+
+def test_migrator_only_moves_cold_documents(compressible_pdf):
+    """Test only documents older than the threshold are migrated."""
+    storage_dir = compressible_pdf.parent
+    
+    assert ColdStorageMigrator(storage_dir, min_age=3600).migrate() == []
+    migrated = ColdStorageMigrator(storage_dir, min_age=0).migrate()
+    
+    assert migrated == [compressed_path(compressible_pdf)]
+    # Compressed blobs are not migrated again
+    assert ColdStorageMigrator(storage_dir, min_age=0).migrate() == []
+
+
+def test_migrator_run_stops(compressible_pdf):
+    """Test the background loop migrates and exits once stopped."""
+    stop_event = threading.Event()
+    migrator = ColdStorageMigrator(compressible_pdf.parent, min_age=0)
+    thread = threading.Thread(target=migrator.run, kwargs={"interval": 0.01, "stop_event": stop_event})
+    thread.start()
+    
+    try:
+        for _ in range(500):
+            if compressed_path(compressible_pdf).exists():
+                break
+            threading.Event().wait(0.01)
+    finally:
+        stop_event.set()
+        thread.join(timeout=5)
+    
+    assert not thread.is_alive()
+    assert compressed_path(compressible_pdf).exists()
+
+
+def test_content_addressed_blobs_in_cold_tier(tmp_path, compressible_pdf):
+    """Test content-addressed blobs resolve, dedupe and delete across tiers."""
+    storage_dir = tmp_path / "storage"
+    storage_dir.mkdir()
+    db_client = DatabaseClient(f"sqlite:///{tmp_path / 'test.db'}")
+    store = ContentAddressedStore(storage_dir, db_client=db_client)
+    result = store.store(compressible_pdf, "DOC1")
+    db_client.create_document(DocumentCreate(
+        id="DOC1",
+        raw_file_path=str(result.storage_path),
+        file_hash=result.file_hash,
+        file_size_bytes=result.storage_path.stat().st_size,
+        mime_type="application/pdf",
+    ))
+    
+    [blob_path] = ColdStorageMigrator(storage_dir, min_age=0).migrate()
+    
+    assert store.get_blob_path("DOC1") == blob_path
+    assert store.remove_orphans(min_age=0) == []
+    assert store.delete_document("DOC1")
+    assert list(storage_dir.iterdir()) == []
@@ -0,0 +1,129 @@
+"""Tests for crash-safe publishing with group-commit fsync."""
+import errno
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from ragnostic.ingestion.processor import durability
+from ragnostic.ingestion.processor.durability import DirectorySyncError, GroupCommitter, publish
+
+
+def _stage(directory, name, content=b"content"):
+    temp_path = directory / f".{name}.tmp"
+    temp_path.write_bytes(content)
+    return temp_path, directory / name
+
+
+def test_publish(tmp_path):
+    """Test publish renames the synced file into place."""
+    temp_path, dest_path = _stage(tmp_path, "a.pdf")
+    
+    publish(temp_path, dest_path)
+    
+    assert dest_path.read_bytes() == b"content"
+    assert not temp_path.exists()
+
+
+def test_group_shares_directory_sync(tmp_path):
+    """Test files are synced when submitted and their directory once per group."""
+    staged = [_stage(tmp_path, f"{i}.pdf") for i in range(5)]
+    
+    with patch.object(durability, "fdatasync_file", wraps=durability.fdatasync_file) as fdatasync_file, \
+         patch.object(durability, "fsync_directory", wraps=durability.fsync_directory) as fsync_directory:
+        with GroupCommitter(max_batch=100, max_delay_ms=60_000) as committer:
+            futures = [committer.submit(temp_path, dest_path) for temp_path, dest_path in staged]
+            # Each file is synced by its submitter, nothing is published before the flush
+            assert fdatasync_file.call_count == 5
+            assert not any(future.done() for future in futures)
+            assert not staged[0][1].exists()
+    
+    assert [future.result() for future in futures] == [dest_path for _, dest_path in staged]
+    assert fdatasync_file.call_count == 5
+    fsync_directory.assert_called_once_with(tmp_path)
+
+
+def test_files_synced_on_submitting_threads(tmp_path):
+    """Test each file is synced by the thread that submits it, not by the flushing thread."""
+    sync_threads = {}
+    real_sync = durability.fdatasync_file
+    
+    def fdatasync_file(path):
+        sync_threads[path] = threading.current_thread().name
+        real_sync(path)
+    
+    with patch.object(durability, "fdatasync_file", side_effect=fdatasync_file):
+        with GroupCommitter(max_batch=100, max_delay_ms=60_000) as committer:
+            with ThreadPoolExecutor(max_workers=3, thread_name_prefix="stager") as executor:
+                futures = list(executor.map(
+                    lambda name: committer.submit(*_stage(tmp_path, name)), ["a.pdf", "b.pdf", "c.pdf"]
+                ))
+    
+    assert all(future.result().exists() for future in futures)
+    assert all(name.startswith("stager") for name in sync_threads.values())
+
+
+def test_full_group_flushes(tmp_path):
+    """Test the submit that fills a group publishes it."""
+    committer = GroupCommitter(max_batch=2, max_delay_ms=60_000)
+    first = committer.submit(*_stage(tmp_path, "a.pdf"))
+    second = committer.submit(*_stage(tmp_path, "b.pdf"))
+    
+    assert first.done() and second.done()
+    assert (tmp_path / "a.pdf").exists()
+
+
+def test_timed_flush(tmp_path):
+    """Test a partial group is published after the delay."""
+    committer = GroupCommitter(max_batch=100, max_delay_ms=10)
+    
+    future = committer.submit(*_stage(tmp_path, "a.pdf"))
+    
+    assert future.result(timeout=5) == tmp_path / "a.pdf"
+
+
+def test_sync_failure_leaves_temp_file(tmp_path):
+    """Test a file that cannot be synced fails alone and keeps its temporary name."""
+    bad_temp, bad_dest = _stage(tmp_path, "bad.pdf")
+    good_temp, good_dest = _stage(tmp_path, "good.pdf")
+    real_fsync = durability.fdatasync_file
+    
+    def fsync_file(path):
+        if path == bad_temp:
+            raise OSError(errno.EIO, "I/O error")
+        real_fsync(path)
+    
+    with patch.object(durability, "fdatasync_file", side_effect=fsync_file):
+        with GroupCommitter() as committer:
+            bad = committer.submit(bad_temp, bad_dest)
+            good = committer.submit(good_temp, good_dest)
+    
+    with pytest.raises(OSError):
+        bad.result()
+    assert good.result() == good_dest
+    assert bad_temp.exists() and not bad_dest.exists()
+
+
+def test_directory_sync_failure_keeps_published_file(tmp_path):
+    """Test a failed directory sync is reported apart from failures that leave the temporary file."""
+    temp_path, dest_path = _stage(tmp_path, "a.pdf")
+    
+    with patch.object(durability, "fsync_directory", side_effect=OSError(errno.EIO, "I/O error")):
+        with GroupCommitter() as committer:
+            future = committer.submit(temp_path, dest_path)
+        with pytest.raises(DirectorySyncError):
+            publish(*_stage(tmp_path, "b.pdf"))
+    
+    with pytest.raises(DirectorySyncError):
+        future.result()
+    assert dest_path.exists() and not temp_path.exists()
+    assert (tmp_path / "b.pdf").exists()
+
+
+def test_invalid_configuration():
+    """Test invalid group settings are rejected."""
+    with pytest.raises(ValueError):
+        GroupCommitter(max_batch=0)
+    with pytest.raises(ValueError):
+        GroupCommitter(max_delay_ms=-1)
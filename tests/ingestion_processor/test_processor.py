@@ -1,10 +1,11 @@
 """Tests for document processor functionality."""
+import errno
 from pathlib import Path
 import pytest
 from unittest.mock import patch, Mock
 
 from ragnostic.ingestion.processor.processor import DocumentProcessor
-from ragnostic.ingestion.processor.schema import ProcessingStatus
+from ragnostic.ingestion.processor.schema import ProcessingStatus, StorageStrategy
 
 
 @pytest.fixture
@@ -113,4 +114,89 @@ def test_process_documents_unexpected_error(mock_store, processor, tmp_path, moc
     for result in results.failed_docs:
         assert result.status == ProcessingStatus.UNKNOWN_ERROR
         assert "Unexpected error" in result.error_message
-        assert result.error_code == "UNEXPECTED_ERROR"
\ No newline at end of file
+        assert result.error_code == "UNEXPECTED_ERROR"
+
+def test_process_documents_parallel_keeps_input_order(tmp_path, mock_files):
+    """Test concurrent storage returns results in input order."""
+    storage_dir = tmp_path / "storage"
+    storage_dir.mkdir()
+    files = mock_files + [tmp_path / "missing.pdf"] + [tmp_path / f"extra{i}.pdf" for i in range(8)]
+    for file_path in files[4:]:
+        file_path.write_text(file_path.name)
+    processor = DocumentProcessor(doc_id_prefix="TEST", max_workers=4)
+    
+    results = processor.process_documents(files, storage_dir)
+    
+    assert [r.original_path for r in results.successful_docs] == files[:3] + files[4:]
+    assert [r.original_path for r in results.failed_docs] == [files[3]]
+    for result in results.successful_docs:
+        assert result.storage_path.read_text() == result.original_path.read_text()
+
+
+def test_process_documents_rate_limited(tmp_path, mock_files):
+    """Test each copied document books its size with the rate limiter."""
+    storage_dir = tmp_path / "storage"
+    storage_dir.mkdir()
+    processor = DocumentProcessor(max_workers=2, max_bytes_per_second=1e9)
+    
+    with patch.object(processor.rate_limiter, "acquire") as acquire:
+        results = processor.process_documents(mock_files, storage_dir)
+    
+    assert results.success_count == len(mock_files)
+    assert sorted(call.args[0] for call in acquire.call_args_list) == sorted(
+        file_path.stat().st_size for file_path in mock_files
+    )
+
+
+def test_processor_invalid_configuration():
+    """Test invalid concurrency settings are rejected."""
+    with pytest.raises(ValueError):
+        DocumentProcessor(max_workers=0)
+    with pytest.raises(ValueError):
+        DocumentProcessor(max_bytes_per_second=0)
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_process_documents_durable(tmp_path, mock_files, max_workers):
+    """Test durable processing reports documents once their group is synced."""
+    storage_dir = tmp_path / "storage"
+    storage_dir.mkdir()
+    processor = DocumentProcessor(max_workers=max_workers, durable=True, sync_batch_size=2)
+    
+    results = processor.process_documents(mock_files, storage_dir)
+    
+    assert results.success_count == len(mock_files)
+    assert all(result.durable for result in results.successful_docs)
+    assert sorted(p.name for p in storage_dir.iterdir()) == sorted(
+        result.storage_path.name for result in results.successful_docs
+    )
+
+
+def test_process_documents_sync_failure(tmp_path, mock_files):
+    """Test a document whose sync fails is reported failed and not left in storage."""
+    storage_dir = tmp_path / "storage"
+    storage_dir.mkdir()
+    processor = DocumentProcessor(durable=True)
+    
+    with patch("ragnostic.ingestion.processor.durability.fdatasync_file",
+               side_effect=OSError(errno.EIO, "I/O error")):
+        results = processor.process_documents(mock_files, storage_dir)
+    
+    assert results.failure_count == len(mock_files)
+    assert all(result.error_code == "STORAGE_FAILED" for result in results.failed_docs)
+    assert list(storage_dir.iterdir()) == []
+
+
+def test_process_documents_directory_sync_failure(tmp_path, mock_files):
+    """Test a document published before its directory sync failed is reported stored but not durable."""
+    storage_dir = tmp_path / "storage"
+    storage_dir.mkdir()
+    processor = DocumentProcessor(durable=True, storage_strategy=StorageStrategy.MOVE)
+    
+    with patch("ragnostic.ingestion.processor.durability.fsync_directory",
+               side_effect=OSError(errno.EIO, "I/O error")):
+        results = processor.process_documents(mock_files, storage_dir)
+    
+    assert results.success_count == len(mock_files)
+    assert not any(result.durable for result in results.successful_docs)
+    assert all(result.storage_path.exists() for result in results.successful_docs)
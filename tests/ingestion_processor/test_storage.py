@@ -1,11 +1,14 @@
 """Tests for document storage operations."""
+import hashlib
+import errno
 import os
 from pathlib import Path
 import pytest
-from unittest.mock import patch, mock_open
+from unittest.mock import Mock, patch, mock_open
 
+from ragnostic.ingestion.processor import storage
 from ragnostic.ingestion.processor.storage import store_document
-from ragnostic.ingestion.processor.schema import ProcessingStatus
+from ragnostic.ingestion.processor.schema import ProcessingStatus, StorageStrategy
 
 
 @pytest.fixture
@@ -74,7 +77,7 @@ def test_store_document_errors(temp_dir, mock_source_file, error, expected_code)
     storage_dir = temp_dir / "storage"
     storage_dir.mkdir()
     
-    with patch("ragnostic.ingestion.processor.storage.copy2", side_effect=error):
+    with patch("ragnostic.ingestion.processor.storage.copy_with_hash", side_effect=error):
         result = store_document(
             source_path=mock_source_file,
             storage_dir=storage_dir,
@@ -83,4 +86,154 @@ def test_store_document_errors(temp_dir, mock_source_file, error, expected_code)
         
         assert result.status == ProcessingStatus.STORAGE_ERROR
         assert result.error_code == expected_code
-        assert str(error) in result.error_message
\ No newline at end of file
+        assert str(error) in result.error_message
+
+@pytest.mark.parametrize("strategy", [StorageStrategy.COPY, StorageStrategy.MOVE, StorageStrategy.HARDLINK])
+def test_store_document_strategies(temp_dir, mock_source_file, strategy):
+    """Test each same-filesystem storage strategy places the document."""
+    storage_dir = temp_dir / "storage"
+    storage_dir.mkdir()
+    source_inode = mock_source_file.stat().st_ino
+    
+    result = store_document(mock_source_file, storage_dir, "DOC123", strategy=strategy)
+    
+    assert result.status == ProcessingStatus.SUCCESS
+    assert result.storage_strategy == strategy
+    assert result.storage_path.read_text() == "test content"
+    assert mock_source_file.exists() == (strategy != StorageStrategy.MOVE)
+    shares_inode = result.storage_path.stat().st_ino == source_inode
+    assert shares_inode == (strategy in (StorageStrategy.MOVE, StorageStrategy.HARDLINK))
+
+
+def test_store_document_reflink(temp_dir, mock_source_file):
+    """Test reflink either clones the file or reports the filesystem cannot."""
+    storage_dir = temp_dir / "storage"
+    storage_dir.mkdir()
+    
+    result = store_document(mock_source_file, storage_dir, "DOC123", strategy=StorageStrategy.REFLINK)
+    
+    if result.status == ProcessingStatus.SUCCESS:
+        assert result.storage_path.read_text() == "test content"
+    else:
+        assert result.error_code in ("UNSUPPORTED_STRATEGY", "CROSS_DEVICE", "STORAGE_FAILED")
+        assert not (storage_dir / "DOC123.pdf").exists()
+
+
+def test_store_document_auto_keeps_source(temp_dir, mock_source_file):
+    """Test auto mode with a known hash copies in the kernel and leaves the source in place."""
+    storage_dir = temp_dir / "storage"
+    storage_dir.mkdir()
+    file_hash = hashlib.sha256(b"test content").hexdigest()
+    
+    with patch("ragnostic.ingestion.processor.storage.copy_with_hash",
+               side_effect=AssertionError("hashing copy used")):
+        result = store_document(mock_source_file, storage_dir, "DOC123",
+                                strategy=StorageStrategy.AUTO, expected_hash=file_hash)
+    
+    assert result.status == ProcessingStatus.SUCCESS
+    assert result.file_hash == file_hash
+    assert result.storage_strategy in (StorageStrategy.REFLINK, StorageStrategy.COPY)
+    assert result.storage_path.read_text() == "test content"
+    assert mock_source_file.exists()
+    assert result.storage_path.stat().st_ino != mock_source_file.stat().st_ino
+
+
+def test_store_document_auto_falls_back_to_hashing_copy(temp_dir, mock_source_file):
+    """Test auto mode falls back to the hashing copy when the kernel cannot copy."""
+    storage_dir = temp_dir / "storage"
+    storage_dir.mkdir()
+    unsupported = OSError(errno.EXDEV, "Invalid cross-device link")
+    file_hash = hashlib.sha256(b"test content").hexdigest()
+    
+    reflink = Mock(side_effect=unsupported)
+    
+    with patch.dict(storage._STRATEGIES, {StorageStrategy.REFLINK: reflink}), \
+         patch.object(storage, "_unsupported", set()), \
+         patch("os.copy_file_range", side_effect=unsupported, create=True):
+        result = store_document(mock_source_file, storage_dir, "DOC123",
+                                strategy=StorageStrategy.AUTO, expected_hash=file_hash)
+    
+    assert result.status == ProcessingStatus.SUCCESS
+    assert result.storage_strategy == StorageStrategy.COPY
+    assert result.storage_path.read_text() == "test content"
+    assert result.file_hash == file_hash
+    reflink.assert_called_once()
+
+
+def test_copy_file_range_without_progress_falls_back(temp_dir, mock_source_file):
+    """Test a copy_file_range that stops early is redone with the hashing copy."""
+    dest = temp_dir / "copy.pdf"
+    
+    with patch("os.copy_file_range", return_value=0, create=True):
+        file_hash = storage._copy_file_range(mock_source_file, dest)
+    
+    assert dest.read_text() == "test content"
+    assert file_hash == hashlib.sha256(b"test content").hexdigest()
+
+
+def test_store_document_records_written_hash(temp_dir, mock_source_file):
+    """Test the copy records the SHA-256 of the bytes it wrote."""
+    storage_dir = temp_dir / "storage"
+    storage_dir.mkdir()
+    
+    result = store_document(mock_source_file, storage_dir, "DOC123")
+    
+    assert result.status == ProcessingStatus.SUCCESS
+    assert result.file_hash == hashlib.sha256(b"test content").hexdigest()
+
+
+def test_store_document_hash_mismatch(temp_dir, mock_source_file):
+    """Test a copy that does not match the validated hash is rejected and removed."""
+    storage_dir = temp_dir / "storage"
+    storage_dir.mkdir()
+    
+    result = store_document(mock_source_file, storage_dir, "DOC123", expected_hash="0" * 64)
+    
+    assert result.status == ProcessingStatus.STORAGE_ERROR
+    assert result.error_code == "HASH_MISMATCH"
+    assert not (storage_dir / "DOC123.pdf").exists()
+    assert mock_source_file.exists()
+
+
+def test_store_document_cross_device_move(temp_dir, mock_source_file):
+    """Test a move across filesystems reports a cross-device error."""
+    storage_dir = temp_dir / "storage"
+    storage_dir.mkdir()
+    
+    with patch("ragnostic.ingestion.processor.storage.os.rename",
+               side_effect=OSError(errno.EXDEV, "Invalid cross-device link")):
+        result = store_document(mock_source_file, storage_dir, "DOC123", strategy=StorageStrategy.MOVE)
+    
+    assert result.status == ProcessingStatus.STORAGE_ERROR
+    assert result.error_code == "CROSS_DEVICE"
+    assert mock_source_file.exists()
+
+
+def test_store_document_is_atomic(temp_dir, mock_source_file):
+    """Test a failed copy leaves neither the final file nor a temporary file."""
+    storage_dir = temp_dir / "storage"
+    storage_dir.mkdir()
+    
+    def partial_copy(source_path, dest_path, **kwargs):
+        dest_path.write_text("test")
+        raise OSError(errno.ENOSPC, "No space left on device")
+    
+    with patch("ragnostic.ingestion.processor.storage.copy_with_hash", side_effect=partial_copy):
+        result = store_document(mock_source_file, storage_dir, "DOC123")
+    
+    assert result.status == ProcessingStatus.STORAGE_ERROR
+    assert list(storage_dir.iterdir()) == []
+
+
+def test_store_document_durable(temp_dir, mock_source_file):
+    """Test a durable store syncs the file before reporting it."""
+    storage_dir = temp_dir / "storage"
+    storage_dir.mkdir()
+    
+    with patch("ragnostic.ingestion.processor.storage.publish", wraps=storage.publish) as publish:
+        result = store_document(mock_source_file, storage_dir, "DOC123", durable=True)
+    
+    assert result.status == ProcessingStatus.SUCCESS
+    assert result.durable
+    assert result.storage_path.read_text() == "test content"
+    publish.assert_called_once()
@@ -0,0 +1,39 @@
+"""Tests for aggregate bandwidth limiting."""
+import threading
+import time
+
+import pytest
+
+from ragnostic.ingestion.processor.throttle import ByteRateLimiter
+
+
+def test_acquire_spaces_transfers():
+    """Test consecutive transfers are spaced to the configured rate."""
+    limiter = ByteRateLimiter(bytes_per_second=1000)
+    
+    start = time.monotonic()
+    assert limiter.acquire(100) == 0
+    limiter.acquire(100)
+    
+    assert time.monotonic() - start >= 0.09
+
+
+def test_acquire_shares_rate_across_threads():
+    """Test concurrent workers share one aggregate rate."""
+    limiter = ByteRateLimiter(bytes_per_second=2000)
+    
+    start = time.monotonic()
+    threads = [threading.Thread(target=limiter.acquire, args=(100,)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    # The last of five 100-byte slots starts 0.2s in
+    assert time.monotonic() - start >= 0.19
+
+
+def test_invalid_rate():
+    """Test a non-positive rate is rejected."""
+    with pytest.raises(ValueError):
+        ByteRateLimiter(0)
@@ -50,6 +50,42 @@ def large_pdf(tmp_path) -> Path:
     return output_path
 
 
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+
+
+@pytest.fixture
+def data_pdf():
+    """Factory fixture returning a real PDF from the repository's data/ set."""
+    def _data_pdf(relative_path: str) -> Path:
+        path = DATA_DIR / relative_path
+        if not path.exists():
+            pytest.skip(f"{relative_path} is not in the data set")
+        return path
+    return _data_pdf
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """Factory fixture for minimal well-formed PDFs with a correct startxref."""
+    def _make_pdf(filename: str, body: bytes = b"", trailer_extra: bytes = b"") -> Path:
+        content = (
+            b"%PDF-1.4\n"
+            b"1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n"
+            b"2 0 obj\n<< /Type /Pages /Kids [] /Count 0 >>\nendobj\n"
+            + body
+        )
+        xref_offset = len(content)
+        content += (
+            b"xref\n0 3\n0000000000 65535 f\n0000000009 00000 n\n0000000058 00000 n\n"
+            b"trailer\n<< /Root 1 0 R /Size 3 " + trailer_extra + b">>\n"
+            b"startxref\n" + str(xref_offset).encode() + b"\n%%EOF\n"
+        )
+        output_path = tmp_path / filename
+        output_path.write_bytes(content)
+        return output_path
+    return _make_pdf
+
+
 @pytest.fixture
 def corrupt_pdf(tmp_path) -> Path:
     """Create a corrupted PDF file for testing."""
@@ -70,4 +106,6 @@ def mock_db_client() -> DatabaseClient:
     """Create mock database client."""
     client = Mock(spec=DatabaseClient)
     client.get_document_by_hash.return_value = None
+    client.get_documents_by_hashes.return_value = {}
+    client.get_prefilter_collisions.return_value = set()
     return client
\ No newline at end of file
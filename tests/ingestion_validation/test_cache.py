@@ -0,0 +1,123 @@
+"""Tests for the persistent file fingerprint cache."""
+import os
+from pathlib import Path
+import pytest
+from unittest.mock import patch
+
+from ragnostic.db.client import DatabaseClient
+from ragnostic.ingestion.validation.cache import FingerprintCache, fingerprint_key
+from ragnostic.ingestion.validation.checks import FileProbe, compute_file_hash
+from ragnostic.ingestion.validation.schema import ValidationCheckType
+from ragnostic.ingestion.validation.validator import DocumentValidator
+
+
+@pytest.fixture
+def db_client(tmp_path) -> DatabaseClient:
+    """Create a real database client backed by a temporary SQLite file."""
+    return DatabaseClient(f"sqlite:///{tmp_path / 'cache.db'}")
+
+
+def test_fingerprint_key_fits_sqlite_integers(sample_pdf):
+    """Test cache keys map unsigned stat fields into signed 64-bit range."""
+    st = os.stat(sample_pdf)
+    key = fingerprint_key(st)
+    assert key == (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+    
+    fake = os.stat_result((st.st_mode, 2**64 - 1, 2**63, 1, 0, 0, st.st_size, 0, 0, 0))
+    device, inode, *_ = fingerprint_key(fake)
+    assert device == -(2**63)
+    assert inode == -1
+
+
+def test_cache_persists_across_instances(db_client, sample_pdf):
+    """Test fingerprints survive a flush and are served to a fresh cache."""
+    cache = FingerprintCache(db_client)
+    expected_hash = compute_file_hash(sample_pdf, cache=cache)
+    assert cache.lookup(os.stat(sample_pdf)) is not None
+    cache.flush()
+    
+    fresh_cache = FingerprintCache(db_client)
+    with patch("builtins.open", side_effect=AssertionError("file should not be opened")):
+        with FileProbe(sample_pdf, cache=fresh_cache) as probe:
+            assert probe.from_cache
+            assert probe.file_hash == expected_hash
+            assert probe.mime_type == "application/pdf"
+
+
+def test_cache_misses_after_file_changes(db_client, sample_pdf):
+    """Test a modified file produces a new key and is re-hashed."""
+    cache = FingerprintCache(db_client)
+    original_hash = compute_file_hash(sample_pdf, cache=cache)
+    
+    with open(sample_pdf, "ab") as f:
+        f.write(b"% appended\n")
+    
+    with FileProbe(sample_pdf, cache=cache) as probe:
+        assert not probe.from_cache
+        assert probe.file_hash != original_hash
+
+
+def test_validator_populates_cache(db_client, sample_pdf):
+    """Test batch validation flushes computed fingerprints to the database."""
+    validator = DocumentValidator(db_client, fingerprint_cache=FingerprintCache(db_client))
+    result = validator.validate_files([sample_pdf])
+    
+    st = os.stat(sample_pdf)
+    cached = db_client.get_fingerprint(*fingerprint_key(st))
+    assert cached is not None
+    assert cached.file_hash == result.valid_files[0].file_hash
+    assert cached.mime_type == "application/pdf"
+
+
+def test_validator_skips_unchanged_files(db_client, sample_pdf):
+    """Test a cached, unchanged file is validated without being opened or mapped."""
+    cache = FingerprintCache(db_client)
+    validator = DocumentValidator(db_client, fingerprint_cache=cache)
+    first = validator.validate_files([sample_pdf])
+    
+    with patch("builtins.open", side_effect=AssertionError("file should not be opened")), \
+         patch.object(FileProbe, "memory_map", side_effect=AssertionError("file should not be mapped")):
+        second = validator.validate_files([sample_pdf])
+    
+    assert second.valid_files[0].file_hash == first.valid_files[0].file_hash
+
+
+def test_cached_encrypted_pdf_rechecked_against_setting(db_client, make_pdf):
+    """Test a file cached by a validator allowing encryption is rejected by one that does not."""
+    pdf_path = make_pdf("encrypted.pdf", trailer_extra=b"/Encrypt 5 0 R ")
+    cache = FingerprintCache(db_client)
+    assert DocumentValidator(db_client, fingerprint_cache=cache, allow_encrypted=True).validate_files([pdf_path]).valid_files
+    
+    with patch.object(FileProbe, "memory_map", side_effect=AssertionError("file should not be mapped")):
+        result = DocumentValidator(db_client, fingerprint_cache=cache).validate_files([pdf_path])
+    
+    assert result.invalid_files[0].check_failures[0].check_type == ValidationCheckType.ENCRYPTED_FILE
+
+
+def test_fingerprint_without_structure_check_is_not_trusted(db_client, make_pdf):
+    """Test a file hashed outside validation still gets its structure checked."""
+    pdf_path = make_pdf("truncated.pdf")
+    pdf_path.write_bytes(pdf_path.read_bytes()[:-30])
+    cache = FingerprintCache(db_client)
+    compute_file_hash(pdf_path, cache=cache)
+    
+    result = DocumentValidator(db_client, fingerprint_cache=cache).validate_files([pdf_path])
+    
+    assert result.invalid_files[0].check_failures[0].check_type == ValidationCheckType.CORRUPTED_FILE
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_validator_preloads_fingerprints_in_batches(db_client, make_pdf, max_workers):
+    """Test cached fingerprints are fetched per batch rather than with a query per file."""
+    pdf_paths = [make_pdf(f"doc{i}.pdf", body=f"% {i}\n".encode()) for i in range(10)]
+    DocumentValidator(db_client, fingerprint_cache=FingerprintCache(db_client)).validate_files(pdf_paths[:8])
+    
+    validator = DocumentValidator(
+        db_client, fingerprint_cache=FingerprintCache(db_client), max_workers=max_workers, dedup_batch_size=5
+    )
+    with patch.object(db_client, "get_fingerprint", side_effect=AssertionError("per-file lookup")), \
+         patch.object(db_client, "get_fingerprints", wraps=db_client.get_fingerprints) as get_fingerprints:
+        result = validator.validate_files(pdf_paths)
+    
+    assert len(result.valid_files) == 10
+    assert get_fingerprints.call_count == 2
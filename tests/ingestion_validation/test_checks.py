@@ -1,15 +1,22 @@
 """Tests for validation check functions."""
+import hashlib
 from pathlib import Path
 import pytest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from ragnostic.ingestion.validation.checks import (
+    FileProbe,
+    probe_file,
     compute_file_hash,
     check_file_exists,
     check_file_hash,
     check_file_size,
     check_mime_type,
     check_hash_unique,
+    check_hashes_unique,
+    check_quick_hash,
+    check_pdf_structure,
+    HEAD_BLOCK_SIZE,
 )
 from ragnostic.ingestion.validation.schema import ValidationCheckType, ValidationCheckFailure
 
@@ -124,3 +131,224 @@ def test_check_hash_unique(sample_pdf, large_pdf, mock_db_client):
         assert isinstance(result, ValidationCheckFailure)
         assert result.check_type == ValidationCheckType.DUPLICATE_HASH
         assert 'existing_doc_id' in result.details
+
+
+def test_file_probe_matches_individual_checks(sample_pdf, large_pdf, corrupt_pdf):
+    """Test a probe yields the same size, mime type and hash as the standalone checks."""
+    for pdf_file in [sample_pdf, large_pdf, corrupt_pdf]:
+        with FileProbe(pdf_file, block_size=4096) as probe:
+            assert probe.is_regular_file
+            assert probe.size == pdf_file.stat().st_size
+            assert probe.file_hash == hashlib.sha256(pdf_file.read_bytes()).hexdigest()
+            assert probe.mime_type == check_mime_type(pdf_file, [probe.mime_type])
+
+
+def test_file_probe_pdf_fast_path_skips_libmagic(sample_pdf, corrupt_pdf):
+    """Test the %PDF- magic fast path avoids libmagic and other files fall back to it."""
+    with patch("ragnostic.ingestion.validation.checks.magic.from_buffer") as mock_magic:
+        mock_magic.return_value = "text/plain"
+        with FileProbe(sample_pdf) as probe:
+            assert probe.mime_type == "application/pdf"
+        mock_magic.assert_not_called()
+        
+        with FileProbe(corrupt_pdf) as probe:
+            assert probe.mime_type == "text/plain"
+        mock_magic.assert_called_once()
+
+
+def test_probe_file_failures(non_existent_pdf, tmp_path):
+    """Test probe_file reports missing files and directories as check failures."""
+    for path in [non_existent_pdf, tmp_path]:
+        result = probe_file(path)
+        assert isinstance(result, ValidationCheckFailure)
+        assert result.check_type == ValidationCheckType.OTHER
+
+
+def test_checks_reuse_probe(sample_pdf):
+    """Test checks read from a supplied probe instead of the filesystem."""
+    with FileProbe(sample_pdf) as probe:
+        with patch("ragnostic.ingestion.validation.checks.magic.from_file") as mock_magic:
+            assert check_mime_type(sample_pdf, ["application/pdf"], probe=probe) == "application/pdf"
+            mock_magic.assert_not_called()
+        assert check_file_size(sample_pdf, max_size=1024 * 1024, probe=probe) == probe.size
+        assert check_file_hash(sample_pdf, probe=probe) == compute_file_hash(sample_pdf)
+
+
+def test_check_hashes_unique(mock_db_client):
+    """Test batched uniqueness check against the database and within the batch."""
+    mock_db_client.get_documents_by_hashes.return_value = {"h1": Mock(id="existing_doc_id")}
+    seen_hashes = {"h3": Path("/earlier.pdf")}
+    
+    results = check_hashes_unique(
+        [
+            (Path("/a.pdf"), "h1"),
+            (Path("/b.pdf"), "h2"),
+            (Path("/c.pdf"), "h2"),
+            (Path("/d.pdf"), "h3"),
+        ],
+        mock_db_client,
+        seen_hashes,
+    )
+    
+    mock_db_client.get_documents_by_hashes.assert_called_once_with(["h1", "h2", "h2", "h3"])
+    assert results[0].check_type == ValidationCheckType.DUPLICATE_HASH
+    assert results[0].details == {"existing_doc_id": "existing_doc_id"}
+    assert results[1] is True
+    assert results[2].check_type == ValidationCheckType.DUPLICATE_HASH
+    assert results[2].details == {"duplicate_of": str(Path("/b.pdf"))}
+    assert results[3].details == {"duplicate_of": str(Path("/earlier.pdf"))}
+    assert seen_hashes["h2"] == Path("/b.pdf")
+
+
+def test_quick_hash_samples_head_and_tail(tmp_path):
+    """Test the quick hash covers size, head and tail but not the middle of a file."""
+    size = 4 * HEAD_BLOCK_SIZE
+    original = bytearray(b"%PDF-1.4\n" + b"0" * (size - 9))
+    
+    def write(name, content):
+        path = tmp_path / name
+        path.write_bytes(bytes(content))
+        return path
+    
+    def quick_hash(path):
+        with FileProbe(path) as probe:
+            return check_quick_hash(path, probe)
+    
+    base = quick_hash(write("base.pdf", original))
+    assert len(base) == 32
+    
+    middle = bytearray(original)
+    middle[size // 2] = ord("1")
+    assert quick_hash(write("middle.pdf", middle)) == base
+    
+    tail = bytearray(original)
+    tail[-1] = ord("1")
+    assert quick_hash(write("tail.pdf", tail)) != base
+    assert quick_hash(write("longer.pdf", original + b"0")) != base
+
+
+def test_quick_hash_small_files(sample_pdf, corrupt_pdf):
+    """Test files smaller than one block are fully covered by the quick hash."""
+    with FileProbe(sample_pdf) as sample, FileProbe(corrupt_pdf) as corrupt:
+        assert sample.quick_hash != corrupt.quick_hash
+
+
+def _pdf_structure(path, **kwargs):
+    with FileProbe(path) as probe:
+        return check_pdf_structure(path, probe, **kwargs)
+
+
+def test_check_pdf_structure_valid(make_pdf, sample_pdf, large_pdf):
+    """Test well-formed PDFs pass, including ones with an inexact startxref offset."""
+    assert _pdf_structure(make_pdf("valid.pdf")) is True
+    # The shared fixtures point startxref slightly off, which readers tolerate
+    assert _pdf_structure(sample_pdf) is True
+    assert _pdf_structure(large_pdf) is True
+
+
+def test_check_pdf_structure_xref_stream(tmp_path):
+    """Test PDF 1.5 cross-reference streams are accepted."""
+    prefix = b"%PDF-1.5\n1 0 obj\n<< /Type /Catalog >>\nendobj\n"
+    xref_stream = b"2 0 obj\n<< /Type /XRef /Root 1 0 R /Size 3 /Length 0 >>\nstream\n\nendstream\nendobj\n"
+    pdf_path = tmp_path / "xref_stream.pdf"
+    pdf_path.write_bytes(prefix + xref_stream + b"startxref\n" + str(len(prefix)).encode() + b"\n%%EOF\n")
+    
+    assert _pdf_structure(pdf_path) is True
+
+
+@pytest.mark.parametrize("mutate,reason", [
+    (lambda content: content[:-20], "%%EOF"),
+    (lambda content: content.replace(b"%PDF-1.4", b"%XYZ-1.4"), "header"),
+    (lambda content: content.replace(b"startxref\n", b"startxref\n9999"), "out of range"),
+    (lambda content: content.replace(b"/Root 1 0 R ", b""), "/Root"),
+    (lambda content: b"", "empty"),
+])
+def test_check_pdf_structure_malformed(make_pdf, mutate, reason):
+    """Test truncated and malformed PDFs are rejected as corrupted."""
+    pdf_path = make_pdf("broken.pdf")
+    pdf_path.write_bytes(mutate(pdf_path.read_bytes()))
+    
+    result = _pdf_structure(pdf_path)
+    assert isinstance(result, ValidationCheckFailure)
+    assert result.check_type == ValidationCheckType.CORRUPTED_FILE
+    assert reason in result.message
+
+
+def test_check_pdf_structure_encrypted(make_pdf):
+    """Test encrypted PDFs are flagged unless explicitly allowed."""
+    pdf_path = make_pdf("encrypted.pdf", trailer_extra=b"/Encrypt 5 0 R ")
+    
+    result = _pdf_structure(pdf_path)
+    assert isinstance(result, ValidationCheckFailure)
+    assert result.check_type == ValidationCheckType.ENCRYPTED_FILE
+    assert _pdf_structure(pdf_path, allow_encrypted=True) is True
+
+
+@pytest.mark.parametrize("relative_path", [
+    "article/BROCHURE_ContinuousCellCultureat2000L.pdf",
+    "textbook/Crystallization_Ch11_StephenGlasgow_Fermentation_and_biochemical_engineering_handbook.pdf",
+    "textbook/TEXT_DairyProcessingHandbook_WheyProcessingChapter15.pdf",
+    "journal/JOURNAL_2017_AerationCostsInStirredTankAndBubbleColumnBioreactors.pdf",
+    "textbook/Ch51_Industrial_Crystallization.pdf",
+])
+def test_check_pdf_structure_real_files(data_pdf, relative_path):
+    """Test real PDFs pass, including linearized ones whose /Root is in the first-page trailer."""
+    assert _pdf_structure(data_pdf(relative_path)) is True
+
+
+def test_check_pdf_structure_real_encrypted_linearized(data_pdf):
+    """Test an encrypted linearized PDF is reported as encrypted, not corrupted."""
+    pdf_path = data_pdf("article/REPORT_2003_OptimizePowerConsumptionInAerobicFermenters.pdf")
+    
+    result = _pdf_structure(pdf_path)
+    assert isinstance(result, ValidationCheckFailure)
+    assert result.check_type == ValidationCheckType.ENCRYPTED_FILE
+    assert _pdf_structure(pdf_path, allow_encrypted=True) is True
+
+
+def test_check_pdf_structure_real_incremental_update(data_pdf, tmp_path):
+    """Test a real PDF saved with an incremental update passes."""
+    pymupdf = pytest.importorskip("pymupdf")
+    pdf_path = tmp_path / "updated.pdf"
+    pdf_path.write_bytes(data_pdf("journal/JOURNAL_2017_AerationCostsInStirredTankAndBubbleColumnBioreactors.pdf").read_bytes())
+    with pymupdf.open(pdf_path) as document:
+        document.set_metadata({"title": "Updated"})
+        document.saveIncr()
+    
+    assert pdf_path.read_bytes().count(b"startxref") > 1
+    assert _pdf_structure(pdf_path) is True
+
+
+def _append_update(pdf_path, trailer: bytes):
+    """Append an incremental update section whose trailer is ``trailer``."""
+    content = pdf_path.read_bytes()
+    update = b"3 0 obj\n<< /Title (Updated) >>\nendobj\n"
+    xref_offset = len(content) + len(update)
+    content += update + (
+        b"xref\n3 1\n" + str(len(content)).zfill(10).encode() + b" 00000 n\n"
+        b"trailer\n" + trailer + b"\nstartxref\n" + str(xref_offset).encode() + b"\n%%EOF\n"
+    )
+    pdf_path.write_bytes(content)
+
+
+def test_check_pdf_structure_follows_prev(make_pdf):
+    """Test /Root is found through the /Prev chain of an incremental update."""
+    pdf_path = make_pdf("updated.pdf")
+    first_xref = pdf_path.read_bytes().index(b"xref")
+    _append_update(pdf_path, b"<< /Size 4 /Prev " + str(first_xref).encode() + b" >>")
+    assert _pdf_structure(pdf_path) is True
+    
+    pdf_path = make_pdf("broken_chain.pdf")
+    _append_update(pdf_path, b"<< /Size 4 >>")
+    result = _pdf_structure(pdf_path)
+    assert isinstance(result, ValidationCheckFailure)
+    assert "/Root" in result.message
+
+
+def test_check_pdf_structure_encrypted_before_root(make_pdf):
+    """Test an encrypted file is reported as encrypted even without a visible /Root."""
+    pdf_path = make_pdf("encrypted.pdf", trailer_extra=b"/Encrypt 5 0 R ")
+    pdf_path.write_bytes(pdf_path.read_bytes().replace(b"/Root 1 0 R ", b""))
+    
+    result = _pdf_structure(pdf_path)
+    assert result.check_type == ValidationCheckType.ENCRYPTED_FILE
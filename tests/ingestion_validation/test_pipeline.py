@@ -0,0 +1,105 @@
+"""Tests for the validation check pipeline."""
+from pathlib import Path
+import pytest
+
+from ragnostic.ingestion.validation.pipeline import ValidationCheck, ValidationPipeline
+from ragnostic.ingestion.validation.schema import CheckCost, ValidationCheckFailure, ValidationCheckType
+from ragnostic.ingestion.validation.validator import DocumentValidator
+
+
+def _passing_check(name, cost, provides=None, requires=frozenset()):
+    return ValidationCheck(
+        name=name,
+        cost=cost,
+        provides=provides,
+        requires=requires,
+        func=lambda probe, values: name,
+    )
+
+
+def test_pipeline_orders_by_cost_and_dependencies():
+    """Test cheap checks run first unless a dependency forces a later position."""
+    pipeline = ValidationPipeline([
+        _passing_check("db", CheckCost.DATABASE, requires=frozenset({"digest"})),
+        _passing_check("digest", CheckCost.CONTENT, provides="digest"),
+        _passing_check("header", CheckCost.HEADER, requires=frozenset({"stat"})),
+        _passing_check("stat", CheckCost.METADATA, provides="stat"),
+    ])
+    
+    assert [check.name for check in pipeline.checks] == ["stat", "header", "digest", "db"]
+
+
+def test_pipeline_registration_errors():
+    """Test duplicate names and unsatisfiable dependencies are rejected."""
+    pipeline = ValidationPipeline([_passing_check("stat", CheckCost.METADATA)])
+    with pytest.raises(ValueError):
+        pipeline.register(_passing_check("stat", CheckCost.HEADER))
+    
+    pipeline.register(_passing_check("needs_digest", CheckCost.HEADER, requires=frozenset({"digest"})))
+    with pytest.raises(ValueError):
+        pipeline.checks
+    
+    pipeline.unregister("needs_digest")
+    assert [check.name for check in pipeline.checks] == ["stat"]
+
+
+def test_pipeline_rejects_skipping_required_checks(sample_pdf):
+    """Test a check cannot be skipped while a remaining check needs its value."""
+    pipeline = ValidationPipeline([
+        _passing_check("digest", CheckCost.CONTENT, provides="digest"),
+        _passing_check("db", CheckCost.DATABASE, requires=frozenset({"digest"})),
+    ])
+    
+    with pytest.raises(ValueError):
+        pipeline.run(sample_pdf, skip=frozenset({"digest"}))
+    assert pipeline.run(sample_pdf, skip=frozenset({"digest", "db"})).is_valid
+    assert pipeline.run(sample_pdf, skip=frozenset({"db"})).is_valid
+
+
+def test_size_check_short_circuits_hashing(mock_db_client, large_pdf):
+    """Test an oversized file is rejected before it is hashed."""
+    validator = DocumentValidator(mock_db_client, max_file_size=1024)
+    result = validator._validate_single_file(large_pdf)
+    
+    assert not result.is_valid
+    assert result.check_failures[0].check_type == ValidationCheckType.FILE_TOO_LARGE
+    assert set(result.check_timings) == {"file_exists", "file_size"}
+
+
+def test_validation_records_check_timings(mock_db_client, sample_pdf):
+    """Test every executed check reports its wall time."""
+    validator = DocumentValidator(mock_db_client)
+    
+    single = validator._validate_single_file(sample_pdf)
+    assert list(single.check_timings) == [
+        "file_exists", "file_size", "mime_type", "pdf_structure", "file_hash", "hash_unique"
+    ]
+    assert all(elapsed >= 0 for elapsed in single.check_timings.values())
+    
+    batch = validator.validate_files([sample_pdf])
+    assert "hash_unique" in batch.valid_files[0].check_timings
+
+
+def test_validator_runs_custom_checks(mock_db_client, sample_pdf):
+    """Test checks registered on the validator pipeline take part in validation."""
+    def reject_small_files(probe, values):
+        if values["file_size"] < 1024:
+            return ValidationCheckFailure(
+                filepath=probe.filepath,
+                check_type=ValidationCheckType.OTHER,
+                message="File too small",
+            )
+        return True
+    
+    validator = DocumentValidator(mock_db_client)
+    validator.pipeline.register(ValidationCheck(
+        name="min_size",
+        cost=CheckCost.METADATA,
+        requires=frozenset({"file_size"}),
+        func=reject_small_files,
+    ))
+    
+    result = validator._validate_single_file(sample_pdf)
+    assert not result.is_valid
+    assert result.check_failures[0].message == "File too small"
+    assert "file_hash" not in result.check_timings
@@ -1,9 +1,12 @@
 """Tests for document validator."""
+import asyncio
+import threading
 import pytest
 from pathlib import Path
-from unittest.mock import Mock
+from unittest.mock import Mock, PropertyMock, patch
 
-from ragnostic.ingestion.validation.validator import DocumentValidator
+from ragnostic.ingestion.validation.checks import FileProbe, compute_file_hash
+from ragnostic.ingestion.validation.validator import DocumentValidator, HASH_UNIQUE_CHECK
 from ragnostic.ingestion.validation.schema import ValidationCheckType
 
 
@@ -119,3 +122,353 @@ def test_batch_validation(mock_db_client, sample_pdf, corrupt_pdf, non_existent_
     invalid_paths = [r.filepath for r in batch_result.invalid_files]
     assert corrupt_pdf in invalid_paths
     assert non_existent_pdf in invalid_paths
+
+
+def test_validator_rejects_invalid_worker_count(mock_db_client):
+    """Test validator requires at least one worker."""
+    with pytest.raises(ValueError):
+        DocumentValidator(mock_db_client, max_workers=0)
+
+
+def test_parallel_batch_validation_preserves_order(mock_db_client, make_pdf, corrupt_pdf, non_existent_pdf):
+    """Test concurrent validation returns results in input order."""
+    mock_db_client.get_document_by_hash.return_value = None
+    
+    pdf_files = [make_pdf(f"doc{i}.pdf", body=b"%" + str(i).encode() + b"\n") for i in range(8)]
+    filepaths = pdf_files[:4] + [corrupt_pdf] + pdf_files[4:] + [non_existent_pdf]
+    
+    sequential = DocumentValidator(mock_db_client).validate_files(filepaths)
+    parallel = DocumentValidator(mock_db_client, max_workers=4).validate_files(filepaths)
+    
+    assert [r.filepath for r in parallel.valid_files] == pdf_files
+    assert [r.filepath for r in parallel.invalid_files] == [corrupt_pdf, non_existent_pdf]
+    assert parallel.model_dump(exclude={"__all__": {"__all__": {"check_timings"}}}) == \
+        sequential.model_dump(exclude={"__all__": {"__all__": {"check_timings"}}})
+
+
+def test_iter_validate_files_streams_all_results(mock_db_client, sample_pdf, corrupt_pdf):
+    """Test streaming validation yields one result per input file."""
+    mock_db_client.get_document_by_hash.return_value = None
+    validator = DocumentValidator(mock_db_client, max_workers=2)
+    
+    results = list(validator.iter_validate_files(iter([sample_pdf, corrupt_pdf])))
+    
+    assert len(results) == 2
+    assert {r.filepath for r in results} == {sample_pdf, corrupt_pdf}
+    assert sum(r.is_valid for r in results) == 1
+
+
+def _gate_file(validator, gated_path, gate):
+    """Make the validator's per-file checks on ``gated_path`` wait for ``gate``."""
+    validate = validator._validate_single_file
+    
+    def gated(filepath, check_unique=True):
+        if filepath == gated_path:
+            assert gate.wait(timeout=10)
+        return validate(filepath, check_unique)
+    
+    validator._validate_single_file = gated
+
+
+def test_iter_validate_files_yields_valid_file_before_slow_ones(mock_db_client, make_pdf):
+    """Test the first valid result is not held back for a batch while later files are still checked."""
+    pdfs = [make_pdf(f"doc{i}.pdf", body=f"doc {i}".encode()) for i in range(3)]
+    validator = DocumentValidator(mock_db_client, max_workers=2)
+    gate = threading.Event()
+    _gate_file(validator, pdfs[2], gate)
+    
+    results = validator.iter_validate_files(pdfs)
+    first = next(results)
+    
+    assert not gate.is_set()
+    assert first.is_valid and first.filepath in pdfs[:2]
+    gate.set()
+    assert sorted(r.filepath for r in [first, *results]) == sorted(pdfs)
+
+
+def test_iter_validate_files_sequential_respects_max_delay(mock_db_client, make_pdf):
+    """Test sequential validation releases a valid file once it has waited ``dedup_max_delay``."""
+    pdfs = [make_pdf(f"doc{i}.pdf", body=f"doc {i}".encode()) for i in range(3)]
+    consumed = []
+    
+    def lazy_paths():
+        for path in pdfs:
+            consumed.append(path)
+            yield path
+    
+    validator = DocumentValidator(mock_db_client, dedup_max_delay=0)
+    first = next(validator.iter_validate_files(lazy_paths()))
+    
+    assert first.filepath == pdfs[0]
+    assert consumed == pdfs[:1]
+
+
+def test_iter_validate_files_keeps_earliest_duplicate_across_batches(mock_db_client, tmp_path, sample_pdf):
+    """Test the earliest input wins even when a later duplicate finishes first in another batch."""
+    copy_pdf = tmp_path / "copy.pdf"
+    copy_pdf.write_bytes(sample_pdf.read_bytes())
+    validator = DocumentValidator(mock_db_client, max_workers=2, dedup_batch_size=1)
+    gate = threading.Event()
+    _gate_file(validator, sample_pdf, gate)
+    
+    results = validator.iter_validate_files([sample_pdf, copy_pdf])
+    threading.Timer(0.2, gate.set).start()
+    results = {r.filepath: r for r in results}
+    
+    assert results[sample_pdf].is_valid
+    assert not results[copy_pdf].is_valid
+    assert results[copy_pdf].check_failures[0].details == {"duplicate_of": str(sample_pdf)}
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_batch_validation_rejects_in_batch_duplicates(mock_db_client, tmp_path, sample_pdf, max_workers):
+    """Test identical files in one batch are caught with batched lookups."""
+    copy_pdf = tmp_path / "copy.pdf"
+    copy_pdf.write_bytes(sample_pdf.read_bytes())
+    
+    validator = DocumentValidator(mock_db_client, max_workers=max_workers, dedup_batch_size=1)
+    batch_result = validator.validate_files([sample_pdf, copy_pdf])
+    
+    assert [r.filepath for r in batch_result.valid_files] == [sample_pdf]
+    assert [r.filepath for r in batch_result.invalid_files] == [copy_pdf]
+    failure = batch_result.invalid_files[0].check_failures[0]
+    assert failure.check_type == ValidationCheckType.DUPLICATE_HASH
+    assert failure.details == {"duplicate_of": str(sample_pdf)}
+    mock_db_client.get_document_by_hash.assert_not_called()
+
+
+def test_batch_validation_rejects_database_duplicates(mock_db_client, sample_pdf):
+    """Test batch validation rejects files already in the database."""
+    file_hash = DocumentValidator(mock_db_client)._validate_single_file(sample_pdf).file_hash
+    mock_db_client.get_documents_by_hashes.return_value = {file_hash: Mock(id="existing_doc")}
+    
+    batch_result = DocumentValidator(mock_db_client).validate_files([sample_pdf])
+    
+    assert not batch_result.has_valid_files
+    assert batch_result.invalid_files[0].check_failures[0].details == {"existing_doc_id": "existing_doc"}
+
+
+def test_deferred_hash_skips_full_hash_for_unique_files(mock_db_client, sample_pdf):
+    """Test files that pass the quick hash prefilter are not fully hashed."""
+    validator = DocumentValidator(mock_db_client, defer_full_hash=True)
+    
+    with patch.object(FileProbe, "file_hash", new_callable=PropertyMock) as mock_hash:
+        batch_result = validator.validate_files([sample_pdf])
+        mock_hash.assert_not_called()
+    
+    result = batch_result.valid_files[0]
+    assert result.quick_hash is not None
+    assert result.file_hash is None
+    mock_db_client.get_prefilter_collisions.assert_called_once()
+    mock_db_client.get_documents_by_hashes.assert_not_called()
+
+
+def test_deferred_hash_confirms_prefilter_collisions(mock_db_client, sample_pdf):
+    """Test a prefilter collision triggers a full hash comparison."""
+    quick_hash = DocumentValidator(mock_db_client, defer_full_hash=True)._validate_single_file(sample_pdf).quick_hash
+    full_hash = DocumentValidator(mock_db_client)._validate_single_file(sample_pdf).file_hash
+    mock_db_client.get_prefilter_collisions.return_value = {quick_hash}
+    validator = DocumentValidator(mock_db_client, defer_full_hash=True)
+    
+    # Prefilter collision that is not a real duplicate
+    result = validator._validate_single_file(sample_pdf)
+    assert result.is_valid
+    assert result.file_hash == full_hash
+    
+    # Prefilter collision confirmed by the full hash
+    mock_db_client.get_documents_by_hashes.return_value = {full_hash: Mock(id="existing_doc")}
+    result = validator._validate_single_file(sample_pdf)
+    assert not result.is_valid
+    assert result.check_failures[0].details == {"existing_doc_id": "existing_doc"}
+
+
+def test_deferred_hash_rejects_in_batch_duplicates(mock_db_client, tmp_path, sample_pdf, corrupt_pdf):
+    """Test identical files in one batch are caught by the quick hash prefilter."""
+    copy_pdf = tmp_path / "copy.pdf"
+    copy_pdf.write_bytes(sample_pdf.read_bytes())
+    
+    validator = DocumentValidator(mock_db_client, defer_full_hash=True, dedup_batch_size=1)
+    batch_result = validator.validate_files([sample_pdf, corrupt_pdf, copy_pdf])
+    
+    assert [r.filepath for r in batch_result.valid_files] == [sample_pdf]
+    duplicate = batch_result.invalid_files[-1]
+    assert duplicate.filepath == copy_pdf
+    assert duplicate.check_failures[0].details == {"duplicate_of": str(sample_pdf)}
+
+
+def test_deferred_hash_hashes_earlier_file_once(mock_db_client, tmp_path, sample_pdf):
+    """Test the first file of a quick hash collision is fully hashed once, not once per later copy."""
+    copies = []
+    for i in range(3):
+        copy_pdf = tmp_path / f"copy{i}.pdf"
+        copy_pdf.write_bytes(sample_pdf.read_bytes())
+        copies.append(copy_pdf)
+    validator = DocumentValidator(mock_db_client, defer_full_hash=True, dedup_batch_size=1)
+    
+    with patch("ragnostic.ingestion.validation.validator.compute_file_hash",
+               wraps=compute_file_hash) as hash_file:
+        batch_result = validator.validate_files([sample_pdf, *copies])
+    
+    assert [r.filepath for r in batch_result.valid_files] == [sample_pdf]
+    assert [r.filepath for r in batch_result.invalid_files] == copies
+    hashed = [call.args[0] for call in hash_file.call_args_list]
+    assert sorted(hashed) == sorted([sample_pdf, *copies])
+
+
+def test_validate_truncated_pdf(mock_db_client, make_pdf):
+    """Test a truncated PDF is rejected before it is hashed."""
+    pdf_path = make_pdf("truncated.pdf")
+    pdf_path.write_bytes(pdf_path.read_bytes()[:-30])
+    
+    result = DocumentValidator(mock_db_client)._validate_single_file(pdf_path)
+    
+    assert not result.is_valid
+    assert result.check_failures[0].check_type == ValidationCheckType.CORRUPTED_FILE
+    assert "file_hash" not in result.check_timings
+
+
+def test_validate_encrypted_pdf(mock_db_client, make_pdf):
+    """Test encrypted PDFs are rejected by default and accepted when allowed."""
+    pdf_path = make_pdf("encrypted.pdf", trailer_extra=b"/Encrypt 5 0 R ")
+    
+    result = DocumentValidator(mock_db_client)._validate_single_file(pdf_path)
+    assert result.check_failures[0].check_type == ValidationCheckType.ENCRYPTED_FILE
+    
+    result = DocumentValidator(mock_db_client, allow_encrypted=True)._validate_single_file(pdf_path)
+    assert result.is_valid
+
+
+async def _collect(async_results):
+    return [result async for result in async_results]
+
+
+def test_validate_files_async_streams_all_results(mock_db_client, make_pdf, corrupt_pdf, non_existent_pdf):
+    """Test the async API yields one result per input file."""
+    pdfs = [make_pdf(f"doc_{i}.pdf", body=f"doc {i}".encode()) for i in range(5)]
+    validator = DocumentValidator(mock_db_client, dedup_batch_size=2)
+    
+    results = asyncio.run(_collect(
+        validator.validate_files_async(pdfs + [corrupt_pdf, non_existent_pdf], max_concurrency=3)
+    ))
+    
+    assert len(results) == 7
+    assert {r.filepath for r in results if r.is_valid} == set(pdfs)
+    assert {r.filepath for r in results if not r.is_valid} == {corrupt_pdf, non_existent_pdf}
+    assert all(HASH_UNIQUE_CHECK in r.check_timings for r in results if r.is_valid)
+
+
+def test_validate_files_async_rejects_duplicates(mock_db_client, tmp_path, sample_pdf, make_pdf):
+    """Test the async API rejects duplicates within the run and against the database."""
+    copy_pdf = tmp_path / "copy.pdf"
+    copy_pdf.write_bytes(sample_pdf.read_bytes())
+    existing_pdf = make_pdf("existing.pdf", body=b"already indexed")
+    existing_hash = DocumentValidator(mock_db_client)._validate_single_file(existing_pdf).file_hash
+    mock_db_client.get_documents_by_hashes.side_effect = lambda hashes: {
+        h: Mock(id="existing_doc") for h in hashes if h == existing_hash
+    }
+    mock_db_client.get_document_by_hash.reset_mock()
+    validator = DocumentValidator(mock_db_client, dedup_batch_size=1)
+    
+    results = asyncio.run(_collect(
+        validator.validate_files_async([sample_pdf, copy_pdf, existing_pdf], max_concurrency=3)
+    ))
+    
+    valid = [r for r in results if r.is_valid]
+    assert len(valid) == 1 and valid[0].filepath in {sample_pdf, copy_pdf}
+    details = sorted(str(r.check_failures[0].details) for r in results if not r.is_valid)
+    assert len(details) == 2
+    assert "{'existing_doc_id': 'existing_doc'}" in details
+    mock_db_client.get_document_by_hash.assert_not_called()
+
+
+def test_validate_files_async_does_not_block_event_loop(mock_db_client, make_pdf):
+    """Test other coroutines keep running while files are validated."""
+    pdfs = [make_pdf(f"doc_{i}.pdf", body=f"doc {i}".encode()) for i in range(3)]
+    validator = DocumentValidator(mock_db_client)
+    ticks = []
+    
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+    
+    async def run():
+        ticking = asyncio.ensure_future(ticker())
+        results = await _collect(validator.validate_files_async(pdfs))
+        ticking.cancel()
+        return results
+    
+    results = asyncio.run(run())
+    
+    assert all(r.is_valid for r in results)
+    assert ticks
+
+
+def test_validate_files_async_yields_valid_file_before_slow_ones(mock_db_client, make_pdf):
+    """Test the first valid result arrives before the last file has finished validating."""
+    pdfs = [make_pdf(f"doc{i}.pdf", body=f"doc {i}".encode()) for i in range(3)]
+    validator = DocumentValidator(mock_db_client)
+    gate = threading.Event()
+    _gate_file(validator, pdfs[2], gate)
+    
+    async def run():
+        results = validator.validate_files_async(pdfs, max_concurrency=2)
+        first = await results.__anext__()
+        gate_was_set = gate.is_set()
+        gate.set()
+        return first, gate_was_set, [first] + [result async for result in results]
+    
+    first, gate_was_set, results = asyncio.run(run())
+    
+    assert not gate_was_set
+    assert first.is_valid and first.filepath in pdfs[:2]
+    assert sorted(r.filepath for r in results) == sorted(pdfs)
+
+
+def test_validate_files_async_keeps_earliest_duplicate_across_batches(mock_db_client, tmp_path, sample_pdf):
+    """Test the earliest input wins even when a later duplicate finishes first in another batch."""
+    copy_pdf = tmp_path / "copy.pdf"
+    copy_pdf.write_bytes(sample_pdf.read_bytes())
+    validator = DocumentValidator(mock_db_client, dedup_batch_size=1)
+    gate = threading.Event()
+    _gate_file(validator, sample_pdf, gate)
+    threading.Timer(0.2, gate.set).start()
+    
+    results = asyncio.run(_collect(validator.validate_files_async([sample_pdf, copy_pdf], max_concurrency=2)))
+    
+    results = {r.filepath: r for r in results}
+    assert results[sample_pdf].is_valid
+    assert results[copy_pdf].check_failures[0].details == {"duplicate_of": str(sample_pdf)}
+
+
+@pytest.mark.parametrize("max_concurrency", [0, -1])
+def test_validate_files_async_rejects_invalid_concurrency(mock_db_client, sample_pdf, max_concurrency):
+    """Test a non-positive concurrency limit is rejected."""
+    validator = DocumentValidator(mock_db_client)
+    with pytest.raises(ValueError):
+        asyncio.run(_collect(validator.validate_files_async([sample_pdf], max_concurrency=max_concurrency)))
+
+
+def test_validate_files_async_applies_backpressure(mock_db_client, corrupt_pdf):
+    """Test checks stop running ahead while the consumer does not read results."""
+    validator = DocumentValidator(mock_db_client)
+    checked = []
+    validate = validator._validate_single_file
+    
+    def counting(filepath, check_unique=True):
+        checked.append(filepath)
+        return validate(filepath, check_unique)
+    
+    validator._validate_single_file = counting
+    
+    async def run():
+        results = validator.validate_files_async([corrupt_pdf] * 50, max_concurrency=2)
+        await results.__anext__()
+        await asyncio.sleep(0.2)
+        in_flight = len(checked)
+        await results.aclose()
+        return in_flight
+    
+    # One result read, one held by the resolver, two in each queue and two
+    # checks waiting to queue theirs
+    assert asyncio.run(run()) <= 8
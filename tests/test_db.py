@@ -1,8 +1,11 @@
 """Tests for database operations."""
+import sqlite3
 import pytest
 from datetime import datetime
 from pathlib import Path
+from sqlalchemy import event, text
 
+from ragnostic.db import PROFILES, create_sqlite_url
 from ragnostic.db.client import DatabaseClient
 from ragnostic.db.schema import (
     DocumentCreate,
@@ -14,6 +17,8 @@ from ragnostic.db.schema import (
     SectionContentCreate,
     DocumentImageCreate,
     DocumentTableCreate,
+    FileFingerprint,
+    ScanManifestEntry,
 )
 
 
@@ -133,6 +138,21 @@ def test_get_document_by_hash(db_client: DatabaseClient, sample_document: Docume
     assert retrieved_doc.file_hash == created_doc.file_hash
 
 
+def test_get_documents_by_hashes(db_client: DatabaseClient, sample_document: DocumentCreate):
+    """Test resolving many hashes in chunked batches."""
+    db_client.create_document(sample_document)
+    db_client.create_document(sample_document.model_copy(update={"id": "doc2", "file_hash": "def456"}))
+    
+    found = db_client.get_documents_by_hashes(
+        ["abc123", "missing", "def456", "abc123"],
+        chunk_size=1
+    )
+    assert set(found) == {"abc123", "def456"}
+    assert found["abc123"].id == "doc1"
+    assert found["def456"].id == "doc2"
+    assert db_client.get_documents_by_hashes([]) == {}
+
+
 def test_create_metadata(
     db_client: DatabaseClient,
     sample_document: DocumentCreate,
@@ -261,3 +281,323 @@ def test_delete_document(db_client: DatabaseClient, sample_document: DocumentCre
 def test_get_nonexistent_document(db_client: DatabaseClient):
     """Test retrieving a nonexistent document."""
     assert db_client.get_document_by_id("nonexistent") is None
+
+
+def test_upsert_fingerprints(db_client: DatabaseClient):
+    """Test caching file fingerprints and replacing them on conflict."""
+    fingerprint = FileFingerprint(
+        device=1, inode=2, size_bytes=3, mtime_ns=4,
+        file_hash="abc123", mime_type="application/pdf"
+    )
+    db_client.upsert_fingerprints([fingerprint])
+    assert db_client.get_fingerprint(1, 2, 3, 4) == fingerprint
+    
+    db_client.upsert_fingerprints([fingerprint.model_copy(update={"file_hash": "def456"})])
+    assert db_client.get_fingerprint(1, 2, 3, 4).file_hash == "def456"
+    assert db_client.get_fingerprint(1, 2, 3, 5) is None
+
+
+def test_get_fingerprints(db_client: DatabaseClient):
+    """Test fetching many fingerprints at once, across query chunks."""
+    fingerprints = [
+        FileFingerprint(
+            device=1, inode=i, size_bytes=3, mtime_ns=4,
+            file_hash=f"hash{i}", mime_type="application/pdf"
+        )
+        for i in range(5)
+    ]
+    db_client.upsert_fingerprints(fingerprints)
+    
+    keys = [(1, i, 3, 4) for i in range(7)]
+    found = db_client.get_fingerprints(keys + keys[:2], chunk_size=2)
+    assert found == {(1, i, 3, 4): fingerprints[i] for i in range(5)}
+    assert db_client.get_fingerprints([]) == {}
+
+
+def test_scan_manifest_entries(db_client: DatabaseClient):
+    """Test storing, updating and deleting scan manifest entries."""
+    entries = [
+        ScanManifestEntry(path="/in/a.pdf", root="/in", size_bytes=1, mtime_ns=10),
+        ScanManifestEntry(path="/in/b.pdf", root="/in", size_bytes=2, mtime_ns=20),
+        ScanManifestEntry(path="/other/c.pdf", root="/other", size_bytes=3, mtime_ns=30),
+    ]
+    db_client.upsert_manifest_entries(entries)
+    assert set(db_client.get_manifest_entries("/in")) == {"/in/a.pdf", "/in/b.pdf"}
+    
+    db_client.update_manifest_outcomes({"/in/a.pdf": "ingested", "/in/missing.pdf": "failed"})
+    db_client.upsert_manifest_entries([entries[1].model_copy(update={"size_bytes": 5})])
+    manifest = db_client.get_manifest_entries("/in")
+    assert manifest["/in/a.pdf"].outcome == "ingested"
+    assert manifest["/in/b.pdf"].size_bytes == 5
+    
+    db_client.delete_manifest_entries(["/in/a.pdf"])
+    assert set(db_client.get_manifest_entries("/in")) == {"/in/b.pdf"}
+    assert set(db_client.get_manifest_entries("/other")) == {"/other/c.pdf"}
+
+
+def test_get_prefilter_collisions(db_client: DatabaseClient, sample_document: DocumentCreate):
+    """Test quick hash collisions, including legacy rows without a quick hash."""
+    db_client.create_document(sample_document.model_copy(update={"quick_hash": "q1"}))
+    db_client.create_document(sample_document.model_copy(update={
+        "id": "legacy", "file_hash": "def456", "file_size_bytes": 2048
+    }))
+    
+    collisions = db_client.get_prefilter_collisions([
+        ("q1", 1),        # matching quick hash
+        ("q2", 2048),     # same size as a row without a quick hash
+        ("q3", 1024),     # no match
+    ])
+    assert collisions == {"q1", "q2"}
+    assert db_client.get_prefilter_collisions([]) == set()
+
+
+def test_schema_upgrade_adds_new_columns(db_path: Path):
+    """Test opening a database created before quick hashes existed."""
+    connection = sqlite3.connect(db_path)
+    connection.execute(
+        "CREATE TABLE documents (id VARCHAR PRIMARY KEY, raw_file_path VARCHAR NOT NULL, "
+        "file_hash VARCHAR NOT NULL UNIQUE, file_size_bytes INTEGER NOT NULL, "
+        "mime_type VARCHAR NOT NULL, ingestion_date DATETIME NOT NULL, "
+        "total_sections INTEGER NOT NULL, total_images INTEGER NOT NULL, "
+        "total_tables INTEGER NOT NULL, total_pages INTEGER NOT NULL)"
+    )
+    connection.commit()
+    connection.close()
+    
+    client = DatabaseClient(f"sqlite:///{db_path}")
+    doc = client.create_document(DocumentCreate(
+        id="doc1", raw_file_path="/a.pdf", file_hash="abc", quick_hash="q1",
+        file_size_bytes=1, mime_type="application/pdf"
+    ))
+    assert doc.quick_hash == "q1"
+
+
+def test_create_documents_bulk(db_client: DatabaseClient):
+    """Test creating many documents in one transaction."""
+    documents = [
+        DocumentCreate(
+            id=f"doc{i}", raw_file_path=f"/path/{i}.pdf", file_hash=f"hash{i}",
+            file_size_bytes=i, mime_type="application/pdf"
+        )
+        for i in range(5)
+    ]
+    created = db_client.create_documents_bulk(documents)
+    assert [d.id for d in created] == [d.id for d in documents]
+    assert all(isinstance(d, Document) and d.total_sections == 0 for d in created)
+    
+    more = [documents[0].model_copy(update={"id": "doc9", "file_hash": "hash9"})]
+    assert db_client.create_documents_bulk(more, return_rows=False) is None
+    assert db_client.get_document_by_id("doc9") is not None
+
+
+def test_create_documents_bulk_is_atomic(db_client: DatabaseClient, sample_document: DocumentCreate):
+    """Test a duplicate rolls back the whole batch."""
+    db_client.create_document(sample_document)
+    new_document = sample_document.model_copy(update={"id": "doc2", "file_hash": "new"})
+    with pytest.raises(ValueError):
+        db_client.create_documents_bulk([new_document, sample_document])
+    assert db_client.get_document_by_id("doc2") is None
+
+
+def test_create_sections_images_tables_bulk(db_client: DatabaseClient, sample_document: DocumentCreate):
+    """Test bulk section, image and table creation updates all counters."""
+    db_client.create_document(sample_document)
+    sections = [
+        DocumentSectionCreate(
+            section_id=f"sec{i}", doc_id="doc1", level=1 if i == 0 else 2,
+            sequence_order=i, parent_section_id=None if i == 0 else "sec0"
+        )
+        for i in range(3)
+    ]
+    contents = [
+        SectionContentCreate(section_id=f"sec{i}", title=f"Section {i}", content="Text")
+        for i in range(3)
+    ]
+    created = db_client.create_sections_bulk(sections, contents)
+    assert [s.section_id for s in created] == ["sec0", "sec1", "sec2"]
+    assert created[2].content.title == "Section 2"
+    assert {c.section_id for c in created[0].child_sections} == {"sec1", "sec2"}
+    
+    images = db_client.create_images_bulk([
+        DocumentImageCreate(doc_id="doc1", section_id=section_id, page_number=1, image_data="data")
+        for section_id in ("sec0", "sec1", "sec1")
+    ])
+    assert len({image.id for image in images}) == 3
+    assert db_client.create_tables_bulk([
+        DocumentTableCreate(doc_id="doc1", section_id="sec2", page_number=1, table_data={"rows": []})
+    ], return_rows=False) is None
+    
+    doc = db_client.get_document_by_id("doc1")
+    assert (doc.total_sections, doc.total_images, doc.total_tables) == (3, 3, 1)
+    counts = {s.section_id: (s.image_count, s.table_count) for s in db_client.get_document_sections("doc1")}
+    assert counts == {"sec0": (1, 0), "sec1": (2, 0), "sec2": (0, 1)}
+
+
+def test_create_images_bulk_rejects_missing_section(
+    db_client: DatabaseClient,
+    sample_document: DocumentCreate,
+    sample_section: DocumentSectionCreate,
+    sample_section_content: SectionContentCreate,
+    sample_image: DocumentImageCreate
+):
+    """Test a foreign key violation rolls back the whole batch as a ValueError."""
+    event.listen(db_client.engine, "connect", lambda connection, record: connection.execute("PRAGMA foreign_keys = ON"))
+    db_client.engine.dispose()
+    db_client.create_document(sample_document)
+    db_client.create_section(sample_section, sample_section_content)
+    
+    orphan = sample_image.model_copy(update={"section_id": "missing"})
+    with pytest.raises(ValueError):
+        db_client.create_images_bulk([sample_image, orphan])
+    
+    assert db_client.get_document_by_id("doc1").total_images == 0
+    with db_client.get_session() as session:
+        assert session.execute(text("SELECT COUNT(*) FROM document_images")).scalar() == 0
+
+
+def test_create_sections_bulk_mismatched_contents(db_client: DatabaseClient, sample_section: DocumentSectionCreate):
+    """Test sections and contents must be aligned."""
+    with pytest.raises(ValueError):
+        db_client.create_sections_bulk([sample_section], [])
+
+
+def test_recompute_counters(
+    db_client: DatabaseClient,
+    sample_document: DocumentCreate,
+    sample_section: DocumentSectionCreate,
+    sample_section_content: SectionContentCreate,
+    sample_image: DocumentImageCreate,
+    sample_table: DocumentTableCreate
+):
+    """Test counters skipped during a deferred load are recomputed in bulk."""
+    other_document = sample_document.model_copy(update={"id": "doc2", "file_hash": "other"})
+    db_client.create_documents_bulk([sample_document, other_document], return_rows=False)
+    db_client.create_section(sample_section, sample_section_content, update_counters=False)
+    db_client.create_images_bulk([sample_image, sample_image], update_counters=False)
+    db_client.create_table(sample_table, update_counters=False)
+    
+    doc = db_client.get_document_by_id("doc1")
+    assert (doc.total_sections, doc.total_images, doc.total_tables) == (0, 0, 0)
+    
+    db_client.recompute_counters(["doc1"])
+    doc = db_client.get_document_by_id("doc1")
+    assert (doc.total_sections, doc.total_images, doc.total_tables) == (1, 2, 1)
+    section = db_client.get_document_sections("doc1")[0]
+    assert (section.image_count, section.table_count) == (2, 1)
+    
+    # Recomputing everything also resets stale counters of documents without rows
+    with db_client.engine.begin() as connection:
+        connection.execute(text("UPDATE documents SET total_sections = 99"))
+    db_client.recompute_counters()
+    assert db_client.get_document_by_id("doc1").total_sections == 1
+    assert db_client.get_document_by_id("doc2").total_sections == 0
+
+
+def test_default_profile_keeps_sqlite_defaults(db_client: DatabaseClient):
+    """Test no pragmas are changed without a profile."""
+    assert db_client.profile is None
+    assert db_client.get_pragmas()["journal_mode"] == "delete"
+
+
+@pytest.mark.parametrize("profile,synchronous", [("ingest", 1), ("serve", 1), ("safe", 2)])
+def test_profile_from_url(tmp_path: Path, profile: str, synchronous: int):
+    """Test a profile selected in the URL is applied to every connection."""
+    client = DatabaseClient(create_sqlite_url(str(tmp_path / "tuned.db"), profile=profile))
+    
+    pragmas = client.get_pragmas()
+    assert client.profile == profile
+    assert pragmas["journal_mode"] == "wal"
+    assert pragmas["synchronous"] == synchronous
+    assert pragmas["cache_size"] == PROFILES[profile]["cache_size"]
+    assert pragmas["busy_timeout"] == PROFILES[profile]["busy_timeout"]
+    assert (tmp_path / "tuned.db").exists()
+
+
+def test_profile_argument_overrides_url(tmp_path: Path):
+    """Test an explicit profile takes precedence over the URL's."""
+    client = DatabaseClient(create_sqlite_url(str(tmp_path / "tuned.db"), profile="ingest"), profile="safe")
+    assert client.get_pragmas()["synchronous"] == 2
+
+
+def test_unknown_profile(tmp_path: Path):
+    """Test unknown profiles are rejected."""
+    with pytest.raises(ValueError):
+        create_sqlite_url(str(tmp_path / "tuned.db"), profile="fast")
+    with pytest.raises(ValueError):
+        DatabaseClient(f"sqlite:///{tmp_path / 'tuned.db'}", profile="fast")
+
+
+@pytest.fixture
+def section_tree(db_client: DatabaseClient, sample_document: DocumentCreate) -> DatabaseClient:
+    """Document with sections sec0 > (sec1 > sec2, sec3) and a second root sec4."""
+    db_client.create_document(sample_document)
+    parents = {"sec0": None, "sec1": "sec0", "sec2": "sec1", "sec3": "sec0", "sec4": None}
+    db_client.create_sections_bulk(
+        [
+            DocumentSectionCreate(
+                section_id=section_id, doc_id="doc1", level=1 if parent is None else 2,
+                sequence_order=order, parent_section_id=parent
+            )
+            for order, (section_id, parent) in enumerate(parents.items())
+        ],
+        [
+            SectionContentCreate(section_id=section_id, title=section_id.upper(), content="Text")
+            for section_id in parents
+        ],
+        return_rows=False,
+    )
+    return db_client
+
+
+def test_get_document_sections_builds_tree(section_tree: DatabaseClient):
+    """Test sections come back in order with nested children and content."""
+    sections = section_tree.get_document_sections("doc1")
+    
+    assert [s.section_id for s in sections] == ["sec0", "sec1", "sec2", "sec3", "sec4"]
+    assert [c.section_id for c in sections[0].child_sections] == ["sec1", "sec3"]
+    assert sections[0].child_sections[0].child_sections[0].content.title == "SEC2"
+    assert sections[4].child_sections == []
+
+
+def test_get_section_tree(section_tree: DatabaseClient):
+    """Test the hierarchy is returned from its roots, or from a subtree root."""
+    roots = section_tree.get_section_tree("doc1")
+    assert [r.section_id for r in roots] == ["sec0", "sec4"]
+    
+    subtree = section_tree.get_section_tree("doc1", section_id="sec1")
+    assert [r.section_id for r in subtree] == ["sec1"]
+    assert [c.section_id for c in subtree[0].child_sections] == ["sec2"]
+    
+    flat = section_tree.get_document_sections("doc1", section_id="sec0")
+    assert [s.section_id for s in flat] == ["sec0", "sec1", "sec2", "sec3"]
+    assert section_tree.get_section_tree("doc1", section_id="missing") == []
+
+
+def test_get_document_sections_query_count(db_client: DatabaseClient, sample_document: DocumentCreate):
+    """Test loading a section tree costs a fixed number of queries."""
+    db_client.create_document(sample_document)
+    count = 200
+    db_client.create_sections_bulk(
+        [
+            DocumentSectionCreate(
+                section_id=f"sec{i}", doc_id="doc1", level=2, sequence_order=i,
+                parent_section_id=None if i == 0 else f"sec{(i - 1) // 3}"
+            )
+            for i in range(count)
+        ],
+        [SectionContentCreate(section_id=f"sec{i}", title="Title", content="Text") for i in range(count)],
+        return_rows=False,
+    )
+    statements = []
+    
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(db_client.engine, "before_cursor_execute", listener)
+    try:
+        sections = db_client.get_document_sections("doc1")
+    finally:
+        event.remove(db_client.engine, "before_cursor_execute", listener)
+    
+    assert len(sections) == count
+    assert len(statements) == 2
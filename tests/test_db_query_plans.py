@@ -0,0 +1,185 @@
+"""Query-plan regression tests: no DatabaseClient query may scan a whole table."""
+import inspect
+import re
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import pytest
+from sqlalchemy import event
+
+from ragnostic.db.client import DatabaseClient
+from ragnostic.db.models import Base
+from ragnostic.db.schema import (
+    DocumentCreate,
+    DocumentImageCreate,
+    DocumentMetadataCreate,
+    DocumentSectionCreate,
+    DocumentTableCreate,
+    FileFingerprint,
+    ScanManifestEntry,
+    SectionContentCreate,
+)
+
+TABLE_NAMES = set(Base.metadata.tables)
+SCAN_PATTERN = re.compile(r"\bSCAN (\w+)")
+
+# Calls that read or rewrite every row by design
+WHOLE_TABLE_CALLS = {"get_documents", "recompute_counters_all"}
+
+# Public methods that issue no SQL of their own
+NOT_QUERIES = {"get_session", "get_pragmas"}
+
+
+@contextmanager
+def capture_statements(client: DatabaseClient) -> Iterator[List[Tuple[str, tuple]]]:
+    """Record every statement and its first parameter set executed by the client."""
+    statements: List[Tuple[str, tuple]] = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if executemany:
+            parameters = parameters[0] if parameters else ()
+        statements.append((statement, tuple(parameters)))
+    
+    event.listen(client.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(client.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def full_scans(client: DatabaseClient, statements: List[Tuple[str, tuple]]) -> List[str]:
+    """Run EXPLAIN QUERY PLAN on each statement and describe those that scan a table."""
+    problems = []
+    with client.engine.connect() as connection:
+        cursor = connection.connection.dbapi_connection.cursor()
+        try:
+            for statement, parameters in statements:
+                if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+                    continue
+                plan = cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+                for row in plan:
+                    match = SCAN_PATTERN.search(row[-1])
+                    if match and match.group(1) in TABLE_NAMES:
+                        problems.append(f"{row[-1]}\n  in: {' '.join(statement.split())}")
+        finally:
+            cursor.close()
+    return problems
+
+
+@pytest.fixture
+def db_client(tmp_path) -> DatabaseClient:
+    """Database with a small document tree, so every query has rows to plan against."""
+    client = DatabaseClient(f"sqlite:///{tmp_path / 'plans.db'}")
+    client.create_documents_bulk([
+        DocumentCreate(
+            id=f"doc{i}", raw_file_path=f"/docs/{i}.pdf", file_hash=f"hash{i}",
+            quick_hash=f"quick{i}", file_size_bytes=100 + i, mime_type="application/pdf"
+        )
+        for i in range(3)
+    ], return_rows=False)
+    client.create_metadata(DocumentMetadataCreate(doc_id="doc0", title="Doc", creation_date=datetime(2024, 1, 1)))
+    client.create_sections_bulk(
+        [
+            DocumentSectionCreate(
+                section_id=f"sec{i}", doc_id="doc0", level=1 if i == 0 else 2,
+                sequence_order=i, parent_section_id=None if i == 0 else "sec0"
+            )
+            for i in range(4)
+        ],
+        [SectionContentCreate(section_id=f"sec{i}", title=f"Section {i}", content="Text") for i in range(4)],
+        return_rows=False,
+    )
+    client.create_images_bulk(
+        [DocumentImageCreate(doc_id="doc0", section_id="sec1", page_number=1, image_data="data")],
+        return_rows=False,
+    )
+    client.upsert_manifest_entries([
+        ScanManifestEntry(path="/docs/0.pdf", root="/docs", size_bytes=100, mtime_ns=1)
+    ])
+    # Without ANALYZE statistics SQLite plans as if tables were large, which
+    # is the case the index set has to cover
+    return client
+
+
+def _section(section_id: str, parent: str) -> Tuple[DocumentSectionCreate, SectionContentCreate]:
+    return (
+        DocumentSectionCreate(section_id=section_id, doc_id="doc1", level=2, sequence_order=9, parent_section_id=parent),
+        SectionContentCreate(section_id=section_id, title="New", content="Text"),
+    )
+
+
+# One representative call per query the client issues
+CALLS: Dict[str, Callable[[DatabaseClient], object]] = {
+    "create_document": lambda c: c.create_document(DocumentCreate(
+        id="new", raw_file_path="/new.pdf", file_hash="new", file_size_bytes=1, mime_type="application/pdf"
+    )),
+    "create_documents_bulk": lambda c: c.create_documents_bulk([DocumentCreate(
+        id="bulk", raw_file_path="/bulk.pdf", file_hash="bulk", file_size_bytes=1, mime_type="application/pdf"
+    )]),
+    "get_documents": lambda c: c.get_documents(limit=2),
+    "get_document_by_id": lambda c: c.get_document_by_id("doc0"),
+    "get_document_by_hash": lambda c: c.get_document_by_hash("hash0"),
+    "get_documents_by_hashes": lambda c: c.get_documents_by_hashes(["hash0", "hash1"]),
+    "get_prefilter_collisions": lambda c: c.get_prefilter_collisions([("quick0", 100), ("other", 5)]),
+    "create_metadata": lambda c: c.create_metadata(DocumentMetadataCreate(doc_id="doc1")),
+    "get_metadata": lambda c: c.get_metadata("doc0"),
+    "create_section": lambda c: c.create_section(*_section("new", "sec0")),
+    "create_sections_bulk": lambda c: c.create_sections_bulk(*map(list, zip(_section("bulk", "sec0")))),
+    "get_document_sections": lambda c: c.get_document_sections("doc0"),
+    "get_section_tree": lambda c: c.get_section_tree("doc0", section_id="sec0"),
+    "create_image": lambda c: c.create_image(
+        DocumentImageCreate(doc_id="doc0", section_id="sec2", page_number=1, image_data="data")
+    ),
+    "create_table": lambda c: c.create_table(
+        DocumentTableCreate(doc_id="doc0", section_id="sec2", page_number=1, table_data={"rows": []})
+    ),
+    "create_images_bulk": lambda c: c.create_images_bulk(
+        [DocumentImageCreate(doc_id="doc0", section_id="sec3", page_number=1, image_data="data")]
+    ),
+    "create_tables_bulk": lambda c: c.create_tables_bulk(
+        [DocumentTableCreate(doc_id="doc0", section_id="sec3", page_number=1, table_data={"rows": []})]
+    ),
+    "recompute_counters": lambda c: c.recompute_counters(["doc0"]),
+    "recompute_counters_all": lambda c: c.recompute_counters(),
+    "get_fingerprint": lambda c: c.get_fingerprint(1, 2, 3, 4),
+    "get_fingerprints": lambda c: c.get_fingerprints([(1, 2, 3, 4), (5, 6, 7, 8)]),
+    "upsert_fingerprints": lambda c: c.upsert_fingerprints([FileFingerprint(
+        device=1, inode=2, size_bytes=3, mtime_ns=4, file_hash="hash0", mime_type="application/pdf"
+    )]),
+    "get_manifest_entries": lambda c: c.get_manifest_entries("/docs"),
+    "upsert_manifest_entries": lambda c: c.upsert_manifest_entries([
+        ScanManifestEntry(path="/docs/1.pdf", root="/docs", size_bytes=1, mtime_ns=1)
+    ]),
+    "update_manifest_outcomes": lambda c: c.update_manifest_outcomes({"/docs/0.pdf": "ingested"}),
+    "delete_manifest_entries": lambda c: c.delete_manifest_entries(["/docs/0.pdf"]),
+    "delete_document": lambda c: c.delete_document("doc2"),
+}
+
+
+def test_every_query_is_covered():
+    """Test each public DatabaseClient method has a call in the harness."""
+    public_methods = {
+        name for name, _ in inspect.getmembers(DatabaseClient, inspect.isfunction)
+        if not name.startswith("_")
+    }
+    assert public_methods - NOT_QUERIES <= set(CALLS)
+
+
+@pytest.mark.parametrize("call_name", sorted(set(CALLS) - WHOLE_TABLE_CALLS))
+def test_query_uses_indexes(db_client: DatabaseClient, call_name: str):
+    """Test the queries behind a client call never fall back to a full table scan."""
+    with capture_statements(db_client) as statements:
+        CALLS[call_name](db_client)
+    
+    assert statements
+    problems = full_scans(db_client, statements)
+    assert not problems, "Full table scans:\n" + "\n".join(problems)
+
+
+@pytest.mark.parametrize("call_name", sorted(WHOLE_TABLE_CALLS))
+def test_whole_table_calls_run(db_client: DatabaseClient, call_name: str):
+    """Test calls exempt from the scan check still execute against the harness data."""
+    with capture_statements(db_client) as statements:
+        CALLS[call_name](db_client)
+    assert statements
@@ -0,0 +1,71 @@
+"""Tests for page-cache I/O policies."""
+import errno
+import hashlib
+import os
+from unittest.mock import patch
+
+import pytest
+
+from ragnostic.ingestion import iopolicy
+from ragnostic.ingestion.iopolicy import IOPolicy, read_blocks
+from ragnostic.ingestion.processor.storage import copy_with_hash
+from ragnostic.ingestion.validation.checks import compute_file_hash
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    """Create a file spanning several blocks that is not block-aligned."""
+    path = tmp_path / "data.bin"
+    path.write_bytes(os.urandom(3 * 1024 * 1024 + 123))
+    return path
+
+
+@pytest.mark.parametrize("policy", list(IOPolicy))
+@pytest.mark.parametrize("offset", [0, 64 * 1024, 1000])
+def test_read_blocks(data_file, policy, offset):
+    """Test every policy reads the same bytes from any offset."""
+    digest = hashlib.sha256()
+    with open(data_file, "rb") as f:
+        for block in read_blocks(f, 1024 * 1024, offset, policy):
+            digest.update(block)
+    
+    assert digest.hexdigest() == hashlib.sha256(data_file.read_bytes()[offset:]).hexdigest()
+
+
+def test_direct_falls_back_when_rejected(data_file):
+    """Test direct reads fall back to buffered reads where O_DIRECT is refused."""
+    with patch.object(iopolicy.os, "preadv", side_effect=OSError(errno.EINVAL, "Invalid argument"), create=True):
+        with open(data_file, "rb") as f:
+            data = b"".join(bytes(block) for block in read_blocks(f, 1024 * 1024, policy=IOPolicy.DIRECT))
+    
+    assert data == data_file.read_bytes()
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="posix_fadvise not available")
+def test_streaming_drops_pages(data_file):
+    """Test a streaming pass advises sequential reads, then drops the file's pages."""
+    with patch.object(iopolicy.os, "posix_fadvise") as fadvise:
+        compute_file_hash(data_file, io_policy=IOPolicy.STREAMING)
+    
+    advice = [call.args[3] for call in fadvise.call_args_list]
+    assert advice[0] == os.POSIX_FADV_SEQUENTIAL
+    assert advice[-1] == os.POSIX_FADV_DONTNEED
+
+
+def test_default_policy_gives_no_advice(data_file):
+    """Test the default policy leaves the page cache alone."""
+    with patch.object(iopolicy, "advise") as advise:
+        compute_file_hash(data_file)
+    
+    advise.assert_not_called()
+
+
+@pytest.mark.parametrize("policy", list(IOPolicy))
+def test_copy_with_hash_policies(data_file, tmp_path, policy):
+    """Test the hashing copy produces identical content under every policy."""
+    dest = tmp_path / "copy.bin"
+    
+    digest = copy_with_hash(data_file, dest, io_policy=policy)
+    
+    assert dest.read_bytes() == data_file.read_bytes()
+    assert digest == hashlib.sha256(data_file.read_bytes()).hexdigest()